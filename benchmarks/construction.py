@@ -0,0 +1,151 @@
+"""
+Measure the cost of turning rows read from the database into entities, then into
+the views of a dataset list.
+
+Runs in memory: ORM instances are built up front, and the dataset repository is
+replaced by one that converts them, so that only CPU work is measured.
+
+Usage:
+    python -m benchmarks.construction [--datasets 1000] [--repeat 10]
+"""
+import asyncio
+import datetime as dt
+import time
+import tracemalloc
+from typing import Any, Callable, List, Optional, Tuple, Union
+
+import click
+
+from server.application.datasets.queries import GetAllDatasets
+from server.config.di import _CONTAINER, bootstrap, resolve
+from server.domain.auth.entities import Account
+from server.domain.common.pagination import Page
+from server.domain.common.types import Skip, id_factory
+from server.domain.datasets.entities import (
+    DataFormat,
+    Dataset,
+    PublicationRestriction,
+    UpdateFrequency,
+)
+from server.domain.datasets.repositories import DatasetGetAllExtras, DatasetRepository
+from server.domain.datasets.specifications import DatasetSpec
+from server.domain.organizations.types import Siret
+from server.infrastructure.catalog_records.models import CatalogRecordModel
+from server.infrastructure.catalogs.models import CatalogModel, ExtraFieldValueModel
+from server.infrastructure.datasets.models import DataFormatModel, DatasetModel
+from server.infrastructure.datasets.transformers import make_entity
+from server.infrastructure.organizations.models import OrganizationModel
+from server.infrastructure.tags.models import TagModel
+from server.seedwork.application.messages import MessageBus
+
+
+def _make_instances(n: int) -> List[DatasetModel]:
+    organization = OrganizationModel(siret=Siret("99999999900018"), name="Benchmark")
+    catalog = CatalogModel(organization_siret=organization.siret)
+    catalog.organization = organization
+    formats = [DataFormatModel(id=i, name=fmt) for i, fmt in enumerate(DataFormat)]
+    tags = [
+        TagModel(id=id_factory(), name=f"Tag {i}", usage_count=i) for i in range(50)
+    ]
+    now = dt.datetime.now(dt.timezone.utc)
+
+    instances = []
+
+    for i in range(n):
+        catalog_record = CatalogRecordModel(
+            id=id_factory(), organization_siret=organization.siret, created_at=now
+        )
+        catalog_record.catalog = catalog
+
+        dataset_id = id_factory()
+        instance = DatasetModel(
+            id=dataset_id,
+            title=f"Jeu de données {i}",
+            description="Description " * 20,
+            service="Service",
+            geographical_coverage="France métropolitaine",
+            technical_source=None,
+            producer_email="producer@mydomain.org",
+            contact_emails=["contact@mydomain.org", "other@mydomain.org"],
+            update_frequency=UpdateFrequency.MONTHLY,
+            publication_restriction=PublicationRestriction.NO_RESTRICTION,
+            last_updated_at=now,
+            url="https://example.org",
+            license="Licence Ouverte",
+        )
+        instance.catalog_record = catalog_record
+        instance.formats = formats[i % 3 : i % 3 + 2]
+        instance.tags = tags[i % 50 : i % 50 + 3]
+        instance.extra_field_values = [
+            ExtraFieldValueModel(
+                dataset_id=dataset_id, extra_field_id=id_factory(), value="Oui"
+            )
+        ]
+        instances.append(instance)
+
+    return instances
+
+
+class _InMemoryDatasetRepository(DatasetRepository):
+    def __init__(self, instances: List[DatasetModel]) -> None:
+        self._instances = instances
+
+    async def get_all(
+        self,
+        *,
+        account: Union[Account, Skip] = Skip(),
+        page: Optional[Page] = Page(),
+        spec: DatasetSpec = DatasetSpec(),
+    ) -> Tuple[List[Tuple[Dataset, DatasetGetAllExtras]], int]:
+        items: List[Tuple[Dataset, DatasetGetAllExtras]] = [
+            (make_entity(instance), {}) for instance in self._instances
+        ]
+        return items, len(items)
+
+
+def _measure(func: Callable[[], Any], repeat: int) -> Tuple[float, float]:
+    cpu = min(_cpu_time(func) for _ in range(repeat))
+
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return cpu, peak
+
+
+def _cpu_time(func: Callable[[], Any]) -> float:
+    start = time.process_time()
+    func()
+    return time.process_time() - start
+
+
+@click.command()
+@click.option("--datasets", default=1000, help="Number of datasets in the list.")
+@click.option("--repeat", default=10, help="Runs of each step (best is kept).")
+def cli(datasets: int, repeat: int) -> None:
+    bootstrap()
+
+    instances = _make_instances(datasets)
+    _CONTAINER.register_instance(
+        DatasetRepository, _InMemoryDatasetRepository(instances)
+    )
+
+    bus = resolve(MessageBus)
+    query = GetAllDatasets(account=Skip(), page=Page(size=datasets))
+    loop = asyncio.new_event_loop()
+
+    steps = [
+        ("entities", lambda: [make_entity(instance) for instance in instances]),
+        ("list", lambda: loop.run_until_complete(bus.execute(query))),
+    ]
+
+    for label, func in steps:
+        cpu, peak = _measure(func, repeat)
+        click.echo(f"{label}: {cpu * 1000:.1f}ms CPU, {peak / 1024:.0f}KiB peak")
+
+
+if __name__ == "__main__":
+    cli()
@@ -0,0 +1,130 @@
+"""
+Measure latency of list requests while logins are in progress.
+
+Password hashing runs in a thread pool, so the latency of other requests should
+stay close to the baseline during a login burst.
+
+Usage:
+    python -m benchmarks.login_latency SIRET [--logins 20] [--requests 50]
+
+Uses the database configured in settings, which should contain some datasets. A
+temporary user is created in the organization with the given SIRET.
+"""
+import asyncio
+import statistics
+import time
+import uuid
+from typing import List
+
+import click
+import httpx
+from pydantic import EmailStr, SecretStr
+
+from server.api.app import create_app
+from server.application.auth.commands import CreatePasswordUser, DeletePasswordUser
+from server.application.auth.queries import LoginPasswordUser
+from server.application.organizations.queries import GetOrganizationBySiret
+from server.config.di import bootstrap, resolve
+from server.domain.organizations.exceptions import OrganizationDoesNotExist
+from server.domain.organizations.types import Siret
+from server.seedwork.application.messages import MessageBus
+
+
+def _percentile(values: List[float], p: float) -> float:
+    values = sorted(values)
+    index = min(len(values) - 1, int(round(p / 100 * (len(values) - 1))))
+    return values[index]
+
+
+async def _measure_list_requests(
+    client: httpx.AsyncClient, api_token: str, n: int
+) -> List[float]:
+    headers = {"Authorization": f"Bearer {api_token}"}
+    durations = []
+
+    for _ in range(n):
+        start = time.perf_counter()
+        response = await client.get("/datasets/", headers=headers)
+        durations.append(time.perf_counter() - start)
+        response.raise_for_status()
+
+    return durations
+
+
+async def _login_burst(
+    client: httpx.AsyncClient, email: str, password: str, n: int
+) -> None:
+    payload = {"email": email, "password": password}
+    responses = await asyncio.gather(
+        *(client.post("/auth/login/", json=payload) for _ in range(n))
+    )
+    statuses = {response.status_code for response in responses}
+    click.echo(f"Login statuses: {sorted(statuses)}")
+
+
+def _report(label: str, durations: List[float]) -> None:
+    p50 = _percentile(durations, 50) * 1000
+    p95 = _percentile(durations, 95) * 1000
+    mean = statistics.mean(durations) * 1000
+    max_ = max(durations) * 1000
+    click.echo(
+        f"{label}: p50={p50:.1f}ms p95={p95:.1f}ms mean={mean:.1f}ms max={max_:.1f}ms"
+    )
+
+
+async def main(siret: Siret, logins: int, requests: int) -> None:
+    bus = resolve(MessageBus)
+
+    try:
+        organization = await bus.execute(GetOrganizationBySiret(siret=siret))
+    except OrganizationDoesNotExist:
+        raise click.ClickException(f"Organization does not exist: {siret}")
+
+    email = EmailStr(f"benchmark-{uuid.uuid4().hex}@mydomain.org")
+    password = "benchmark"
+    account_id = await bus.execute(
+        CreatePasswordUser(
+            organization_siret=organization.siret,
+            email=email,
+            password=SecretStr(password),
+        )
+    )
+
+    try:
+        account = await bus.execute(
+            LoginPasswordUser(email=email, password=SecretStr(password))
+        )
+
+        app = create_app()
+        transport = httpx.ASGITransport(app)
+
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://benchmark"
+        ) as client:
+            # Warm up.
+            await _measure_list_requests(client, account.api_token, 5)
+
+            baseline = await _measure_list_requests(client, account.api_token, requests)
+            _report("Baseline", baseline)
+
+            burst = asyncio.ensure_future(_login_burst(client, email, password, logins))
+            during_logins = await _measure_list_requests(
+                client, account.api_token, requests
+            )
+            await burst
+            _report(f"During {logins} logins", during_logins)
+    finally:
+        await bus.execute(DeletePasswordUser(account_id=account_id))
+
+
+@click.command()
+@click.argument("siret")
+@click.option("--logins", default=20, help="Number of concurrent logins.")
+@click.option("--requests", default=50, help="Number of list requests to measure.")
+def cli(siret: str, logins: int, requests: int) -> None:
+    bootstrap()
+    asyncio.run(main(Siret(siret), logins, requests))
+
+
+if __name__ == "__main__":
+    cli()
@@ -0,0 +1,44 @@
+"""
+Measure the overhead of resolving dependencies, compared to resolving through punq.
+
+Usage:
+    python -m benchmarks.resolve [--number 100000]
+"""
+import timeit
+
+import click
+
+from server.config.di import _CONTAINER, bootstrap, resolve
+from server.config.settings import Settings
+from server.domain.datasets.repositories import DatasetRepository
+from server.seedwork.application.messages import MessageBus
+
+# Roughly what an authenticated request to a list endpoint resolves.
+TYPES_PER_REQUEST = [Settings, MessageBus, DatasetRepository, MessageBus]
+
+
+def _resolve_request() -> None:
+    for type_ in TYPES_PER_REQUEST:
+        resolve(type_)
+
+
+def _resolve_request_punq() -> None:
+    impl = _CONTAINER._impl
+    assert impl is not None
+    for type_ in TYPES_PER_REQUEST:
+        impl.resolve(type_)
+
+
+@click.command()
+@click.option("--number", default=100_000, help="Number of simulated requests.")
+def cli(number: int) -> None:
+    bootstrap()
+
+    for label, func in [("punq", _resolve_request_punq), ("frozen", _resolve_request)]:
+        seconds = min(timeit.repeat(func, number=number, repeat=5))
+        per_request = seconds / number * 1e6
+        click.echo(f"{label}: {per_request:.2f}µs per request")
+
+
+if __name__ == "__main__":
+    cli()
@@ -0,0 +1,88 @@
+"""
+Measure how long entrypoints take to start: the API (as imported by each worker
+process) and CLI tools.
+
+Each target runs in a fresh interpreter, as imports are cached in-process.
+
+Usage:
+    python -m benchmarks.startup [--repeat 5] [--importtime 15]
+"""
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List, Tuple
+
+import click
+
+# Label -> statement, as run by each entrypoint.
+TARGETS = {
+    "api": "import server.main",
+    "bootstrap": "from server.config.di import bootstrap; bootstrap()",
+    "makeid": "import tools.makeid",
+}
+
+_TIMED = """
+import time
+_start = time.perf_counter()
+{statement}
+print(time.perf_counter() - _start)
+"""
+
+
+def _run(statement: str) -> Tuple[float, float]:
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-c", _TIMED.format(statement=statement)],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    wall = time.perf_counter() - start
+    return float(result.stdout.strip().splitlines()[-1]), wall
+
+
+def _slowest_imports(statement: str, n: int) -> List[Tuple[int, str]]:
+    # See: https://docs.python.org/3/using/cmdline.html#cmdoption-X
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    imports: Dict[str, int] = {}
+
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        imports[name.strip()] = int(cumulative)
+
+    return sorted(((us, name) for name, us in imports.items()), reverse=True)[:n]
+
+
+@click.command()
+@click.option("--repeat", default=5, help="Number of runs of each target.")
+@click.option(
+    "--importtime", default=0, help="Show the N slowest imports of each target."
+)
+@click.argument("targets", nargs=-1, type=click.Choice(list(TARGETS)))
+def cli(repeat: int, importtime: int, targets: Tuple[str, ...]) -> None:
+    os.environ.setdefault("APP_SECRET_KEY", "benchmark")
+
+    for label in targets or TARGETS:
+        statement = TARGETS[label]
+        runs = [_run(statement) for _ in range(repeat)]
+
+        startup = statistics.median(startup for startup, _ in runs) * 1000
+        wall = statistics.median(wall for _, wall in runs) * 1000
+        click.echo(f"{label}: {startup:.0f}ms ({wall:.0f}ms with interpreter)")
+
+        for us, name in _slowest_imports(statement, importtime):
+            click.echo(f"  {us / 1000:7.1f}ms  {name}")
+
+
+if __name__ == "__main__":
+    cli()
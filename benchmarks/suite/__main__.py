@@ -0,0 +1,197 @@
+"""
+Measure latency and number of SQL queries of API endpoints on a large catalog.
+
+Usage:
+    python -m benchmarks.suite [--datasets 10000] [--tags 1000] [--iterations 30]
+        [--compare RESULTS.json] [--threshold 0.2]
+
+Data is seeded in a dedicated `<database>-benchmark` database, which is kept between
+runs: seeding is only done again if a larger scale is requested (or with --reset).
+
+Requests go through the ASGI app, without network. In-process caches are cleared
+before each request, unless --warm is passed.
+
+Results are written as JSON to benchmarks/results/. If --compare is given, the run
+fails if any endpoint is slower than in the given results by more than --threshold,
+or issues more SQL queries.
+"""
+import asyncio
+import datetime as dt
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import click
+import httpx
+from sqlalchemy import event
+
+from server.api.app import create_app
+from server.application.datasets.caching import DatasetFiltersCache
+from server.config.di import bootstrap, resolve
+from server.infrastructure.adapters.middleware import QueryCachingMiddleware
+from server.infrastructure.catalogs.caching import ExportCache
+from server.infrastructure.database import Database
+
+from .database import SeedData, seed, setup_database, use_benchmark_database
+from .results import ScenarioResult, find_regressions, load, save
+from .scenarios import SCENARIOS, Scenario
+
+RESULTS_DIR = Path(__file__).parent.parent / "results"
+
+
+class QueryCounter:
+    def __init__(self) -> None:
+        self.count = 0
+
+    def __call__(self, *args: object) -> None:
+        self.count += 1
+
+
+def _clear_caches() -> None:
+    resolve(DatasetFiltersCache).invalidate()
+    resolve(QueryCachingMiddleware).clear()
+    resolve(ExportCache).clear()
+
+
+async def _run_scenario(
+    client: httpx.AsyncClient,
+    scenario: Scenario,
+    data: SeedData,
+    counter: QueryCounter,
+    iterations: int,
+    warm: bool,
+) -> ScenarioResult:
+    durations: List[float] = []
+    queries: List[int] = []
+
+    for i in range(-1, iterations):  # First request is a warm-up.
+        request = scenario.make_request(data, i)
+
+        if not warm:
+            _clear_caches()
+
+        counter.count = 0
+        start = time.perf_counter()
+        response = await client.request(request.method, request.url, json=request.json)
+        elapsed = time.perf_counter() - start
+
+        if response.status_code >= 400:
+            raise click.ClickException(
+                f"{scenario.name}: {request.method} {request.url} returned "
+                f"{response.status_code}: {response.text[:200]}"
+            )
+
+        if i >= 0:
+            durations.append(elapsed)
+            queries.append(counter.count)
+
+        if request.cleanup is not None:
+            await request.cleanup(response)
+
+    return ScenarioResult.from_measurements(durations, queries)
+
+
+def _git_ref() -> str:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):  # pragma: no cover
+        return "unknown"
+
+
+async def main(
+    datasets: int, tags: int, iterations: int, warm: bool, only: List[str]
+) -> Dict[str, ScenarioResult]:
+    data = await seed(datasets=datasets, tags=tags)
+
+    db = resolve(Database)
+    counter = QueryCounter()
+    event.listen(db.engine.sync_engine, "before_cursor_execute", counter)
+
+    app = create_app()
+    transport = httpx.ASGITransport(app)
+    headers = {"Authorization": f"Bearer {data.api_token}"}
+    results = {}
+
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://benchmark", headers=headers
+    ) as client:
+        for scenario in SCENARIOS:
+            if only and scenario.name not in only:
+                continue
+
+            result = await _run_scenario(
+                client, scenario, data, counter, iterations, warm
+            )
+            results[scenario.name] = result
+            click.echo(
+                f"{scenario.name:<15} p50={result.p50_ms:>8.1f}ms "
+                f"p95={result.p95_ms:>8.1f}ms "
+                f"queries={result.queries_per_request:g}"
+            )
+
+    await db.engine.dispose()
+
+    return results
+
+
+@click.command()
+@click.option("--datasets", default=10000, help="Number of datasets to seed.")
+@click.option("--tags", default=1000, help="Number of tags to seed.")
+@click.option("--iterations", default=30, help="Number of requests per endpoint.")
+@click.option("--warm", is_flag=True, help="Keep in-process caches between requests.")
+@click.option("--only", multiple=True, help="Run only the given scenarios.")
+@click.option("--reset", is_flag=True, help="Recreate the benchmark database.")
+@click.option("--output", type=click.Path(path_type=Path), default=None)
+@click.option("--compare", type=click.Path(exists=True, path_type=Path))
+@click.option("--threshold", default=0.2, help="Tolerated p95 increase (0.2 = 20%).")
+def cli(
+    datasets: int,
+    tags: int,
+    iterations: int,
+    warm: bool,
+    only: List[str],
+    reset: bool,
+    output: Optional[Path],
+    compare: Optional[Path],
+    threshold: float,
+) -> None:
+    url = use_benchmark_database()
+    bootstrap()
+    setup_database(url, reset=reset)
+
+    results = asyncio.run(main(datasets, tags, iterations, warm, list(only)))
+
+    git_ref = _git_ref()
+    now = dt.datetime.now()
+
+    if output is None:
+        output = RESULTS_DIR / f"{now:%Y%m%dT%H%M%S}-{git_ref}.json"
+
+    meta = {
+        "created_at": now.isoformat(),
+        "git_ref": git_ref,
+        "scale": {"datasets": datasets, "tags": tags},
+        "iterations": iterations,
+        "warm": warm,
+    }
+    save(output, meta, results)
+    click.echo(f"Results written to {output}")
+
+    if compare is not None:
+        regressions = find_regressions(load(compare), results, threshold)
+
+        for regression in regressions:
+            click.echo(click.style(f"Regression: {regression}", fg="red"))
+
+        if regressions:
+            sys.exit(1)
+
+        click.echo(click.style(f"No regressions compared to {compare}", fg="green"))
+
+
+if __name__ == "__main__":
+    cli()
@@ -0,0 +1,127 @@
+import os
+import random
+from dataclasses import dataclass, field
+from typing import List
+
+import click
+from alembic import command
+from alembic.config import Config
+from faker import Faker
+from pydantic import EmailStr, SecretStr
+from sqlalchemy.engine.url import make_url
+from sqlalchemy_utils import create_database, database_exists, drop_database
+
+from server.application.auth.commands import CreatePasswordUser
+from server.application.auth.queries import LoginPasswordUser
+from server.application.catalogs.commands import CreateCatalog
+from server.application.datasets.queries import GetAllDatasets
+from server.application.organizations.commands import CreateOrganization
+from server.application.organizations.queries import GetOrganizationBySiret
+from server.application.tags.commands import CreateTag
+from server.application.tags.queries import GetAllTags
+from server.config.di import resolve
+from server.config.settings import Settings
+from server.domain.auth.exceptions import LoginFailed
+from server.domain.common.pagination import Page
+from server.domain.common.types import ID, Skip
+from server.domain.organizations.exceptions import OrganizationDoesNotExist
+from server.domain.organizations.types import Siret
+from server.seedwork.application.messages import MessageBus
+from tools import addrandomdatasets
+
+SIRET = Siret("99999999900018")
+EMAIL = EmailStr("benchmark@mydomain.org")
+PASSWORD = SecretStr("benchmark")
+
+fake = Faker()
+
+
+@dataclass
+class SeedData:
+    siret: Siret
+    api_token: str
+    dataset_ids: List[ID] = field(default_factory=list)
+    tag_ids: List[ID] = field(default_factory=list)
+    search_terms: List[str] = field(default_factory=list)
+
+
+def use_benchmark_database() -> str:
+    """
+    Point settings to a dedicated database, so that benchmarks do not touch
+    development data. Must be called before `bootstrap()`.
+    """
+    url = make_url(Settings().database_url)
+    url = url.set(database=f"{url.database}-benchmark")
+    os.environ["APP_DATABASE_URL"] = str(url)
+    return str(url)
+
+
+def setup_database(url: str, reset: bool = False) -> None:
+    sync_url = str(make_url(url).set(drivername="postgresql"))
+
+    if reset and database_exists(sync_url):
+        drop_database(sync_url)
+
+    if not database_exists(sync_url):
+        create_database(sync_url)
+
+    command.upgrade(Config("alembic.ini"), "head")
+
+
+async def _login() -> str:
+    bus = resolve(MessageBus)
+
+    try:
+        account = await bus.execute(LoginPasswordUser(email=EMAIL, password=PASSWORD))
+    except LoginFailed:
+        await bus.execute(
+            CreatePasswordUser(organization_siret=SIRET, email=EMAIL, password=PASSWORD)
+        )
+        account = await bus.execute(LoginPasswordUser(email=EMAIL, password=PASSWORD))
+
+    return account.api_token
+
+
+async def seed(datasets: int, tags: int) -> SeedData:
+    """
+    Add data until the database contains at least the given numbers of datasets
+    and tags, so that seeding is only done once for a given scale.
+    """
+    bus = resolve(MessageBus)
+
+    try:
+        await bus.execute(GetOrganizationBySiret(siret=SIRET))
+    except OrganizationDoesNotExist:
+        await bus.execute(CreateOrganization(name="Benchmark", siret=SIRET))
+        await bus.execute(CreateCatalog(organization_siret=SIRET))
+
+    api_token = await _login()
+
+    existing_tags = await bus.execute(GetAllTags())
+    for i in range(len(existing_tags), tags):
+        await bus.execute(CreateTag(name=f"{fake.word()} {i}"))
+
+    pagination = await bus.execute(GetAllDatasets(account=Skip(), page=Page(size=1)))
+    missing = datasets - pagination.total_items
+    if missing > 0:
+        click.echo(f"Seeding {missing} datasets...")
+        await addrandomdatasets.bulk_main(n=missing, siret=SIRET, organizations=20)
+
+    sample = await bus.execute(GetAllDatasets(account=Skip(), page=Page(size=100)))
+    all_tags = await bus.execute(GetAllTags())
+
+    return SeedData(
+        siret=SIRET,
+        api_token=api_token,
+        dataset_ids=[dataset.id for dataset in sample.items],
+        tag_ids=[tag.id for tag in random.sample(all_tags, min(100, len(all_tags)))],
+        search_terms=sorted(
+            {
+                word.lower()
+                for dataset in sample.items
+                for word in dataset.title.split()[:1]
+                if len(word) > 3
+            }
+        )
+        or ["data"],
+    )
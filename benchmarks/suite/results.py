@@ -0,0 +1,85 @@
+import json
+import statistics
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, List
+
+
+def percentile(values: List[float], p: float) -> float:
+    values = sorted(values)
+    index = min(len(values) - 1, int(round(p / 100 * (len(values) - 1))))
+    return values[index]
+
+
+@dataclass
+class ScenarioResult:
+    iterations: int
+    p50_ms: float
+    p95_ms: float
+    mean_ms: float
+    max_ms: float
+    queries_per_request: float
+
+    @classmethod
+    def from_measurements(
+        cls, durations: List[float], queries: List[int]
+    ) -> "ScenarioResult":
+        return cls(
+            iterations=len(durations),
+            p50_ms=round(percentile(durations, 50) * 1000, 2),
+            p95_ms=round(percentile(durations, 95) * 1000, 2),
+            mean_ms=round(statistics.mean(durations) * 1000, 2),
+            max_ms=round(max(durations) * 1000, 2),
+            queries_per_request=round(statistics.mean(queries), 2),
+        )
+
+
+def save(path: Path, meta: Dict[str, Any], results: Dict[str, ScenarioResult]) -> None:
+    data = {
+        **meta,
+        "results": {name: asdict(result) for name, result in results.items()},
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(data, indent=2))
+
+
+def load(path: Path) -> Dict[str, ScenarioResult]:
+    data = json.loads(path.read_text())
+    return {name: ScenarioResult(**result) for name, result in data["results"].items()}
+
+
+def find_regressions(
+    baseline: Dict[str, ScenarioResult],
+    results: Dict[str, ScenarioResult],
+    threshold: float,
+    min_delta_ms: float = 1.0,
+) -> List[str]:
+    """
+    Return a description of each scenario whose p95 latency grew by more than
+    `threshold` (e.g. 0.2 for 20%), or which issues more queries than the baseline.
+
+    Latency changes smaller than `min_delta_ms` are considered noise.
+    """
+    regressions = []
+
+    for name, result in results.items():
+        before = baseline.get(name)
+
+        if before is None:
+            continue
+
+        delta_ms = result.p95_ms - before.p95_ms
+
+        if delta_ms > min_delta_ms and delta_ms > threshold * before.p95_ms:
+            regressions.append(
+                f"{name}: p95 {before.p95_ms:.1f}ms -> {result.p95_ms:.1f}ms "
+                f"(+{delta_ms / before.p95_ms:.0%})"
+            )
+
+        if result.queries_per_request > before.queries_per_request:
+            regressions.append(
+                f"{name}: queries per request {before.queries_per_request:g} -> "
+                f"{result.queries_per_request:g}"
+            )
+
+    return regressions
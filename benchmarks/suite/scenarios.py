@@ -0,0 +1,81 @@
+import json
+from dataclasses import dataclass
+from typing import Awaitable, Callable, List, Optional
+
+import httpx
+
+from server.application.datasets.commands import DeleteDataset
+from server.config.di import resolve
+from server.domain.common.types import ID
+from server.seedwork.application.messages import MessageBus
+from tests.factories import CreateDatasetPayloadFactory
+
+from .database import SeedData
+
+Cleanup = Callable[[httpx.Response], Awaitable[None]]
+
+
+@dataclass
+class Request:
+    method: str
+    url: str
+    json: Optional[dict] = None
+    cleanup: Optional[Cleanup] = None
+
+
+@dataclass
+class Scenario:
+    name: str
+    make_request: Callable[[SeedData, int], Request]
+
+
+def _pick(values: list, i: int) -> str:
+    return str(values[i % len(values)])
+
+
+async def _delete_dataset(response: httpx.Response) -> None:
+    bus = resolve(MessageBus)
+    await bus.execute(DeleteDataset(id=ID(response.json()["id"])))
+
+
+def _create_dataset(data: SeedData, i: int) -> Request:
+    payload = CreateDatasetPayloadFactory.build(
+        organization_siret=data.siret, tag_ids=data.tag_ids[:2]
+    )
+    return Request(
+        "POST", "/datasets/", json=json.loads(payload.json()), cleanup=_delete_dataset
+    )
+
+
+SCENARIOS: List[Scenario] = [
+    Scenario("list", lambda data, i: Request("GET", "/datasets/")),
+    Scenario(
+        "search",
+        lambda data, i: Request("GET", f"/datasets/?q={_pick(data.search_terms, i)}"),
+    ),
+    Scenario(
+        "search_by_tag",
+        lambda data, i: Request("GET", f"/datasets/?tag_id={_pick(data.tag_ids, i)}"),
+    ),
+    Scenario("filters", lambda data, i: Request("GET", "/datasets/filters/")),
+    Scenario(
+        "detail",
+        lambda data, i: Request("GET", f"/datasets/{_pick(data.dataset_ids, i)}/"),
+    ),
+    # As requested by the tag selector.
+    Scenario(
+        "tags", lambda data, i: Request("GET", "/tags/?sort=usage&page_size=100")
+    ),
+    # As requested by the tag selector while the user types.
+    Scenario(
+        "tags_search",
+        lambda data, i: Request(
+            "GET",
+            f"/tags/?sort=usage&page_size=100&q={_pick(data.search_terms, i)[:4]}",
+        ),
+    ),
+    Scenario(
+        "export", lambda data, i: Request("GET", f"/catalogs/{data.siret}/export.csv")
+    ),
+    Scenario("create", _create_dataset),
+]
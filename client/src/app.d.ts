@@ -2,7 +2,10 @@
 // for information about these interfaces
 // and what to do when importing types
 declare namespace App {
-  // interface Locals {}
+  interface Locals {
+    // Value of the `traceparent` header of API requests made during SSR.
+    traceparent?: string | null;
+  }
   interface PageData {
     title: string;
   }
@@ -73,6 +73,11 @@ export const UPDATE_FREQUENCY_LABELS: { [K in UpdateFrequency]: string } = {
 
 export const DATASETS_PER_PAGE = 50;
 
+// The tag selector lists the most used tags. Others are found by searching.
+// NOTE: must match TAG_SELECTOR_PAGE_SIZE in server/api/tags/schemas.py, so that
+// the server warms this query up on startup.
+export const TAGS_PER_PAGE = 100;
+
 export const USER_DOCUMENTATION_LINK =
   "https://github.com/etalab/catalogage-donnees/wiki/Documentation-%C3%A0-destination-des-utilisateurs";
 export const REGISTER_ORGANIZATION_LINK =
@@ -1,6 +1,11 @@
 // Vite reads this from .env files.
 // See: https://vitejs.dev/guide/env-and-mode.html#env-files
-const { VITE_API_BROWSER_URL, VITE_API_SSR_URL } = import.meta.env;
+const {
+  VITE_API_BROWSER_URL,
+  VITE_API_SSR_URL,
+  VITE_TRACING_EXPORT,
+  VITE_TRACING_SAMPLE_RATE,
+} = import.meta.env;
 
 const stringOnly = (value: string | boolean | undefined) =>
   typeof value === "string" ? value : undefined;
@@ -9,3 +14,11 @@ export const API_BROWSER_URL =
   stringOnly(VITE_API_BROWSER_URL) || "http://localhost:3579";
 export const API_SSR_URL =
   stringOnly(VITE_API_SSR_URL) || "http://localhost:3579";
+
+// Where to write traces of server-side rendering: a file path, or "-" for
+// stdout. Tracing is disabled if empty.
+export const TRACING_EXPORT = stringOnly(VITE_TRACING_EXPORT) || "";
+// For pages requested without a `traceparent` header.
+export const TRACING_SAMPLE_RATE = Number(
+  stringOnly(VITE_TRACING_SAMPLE_RATE) || "1"
+);
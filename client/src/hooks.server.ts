@@ -1,11 +1,54 @@
-import type { Handle } from "@sveltejs/kit";
+import type { Handle, HandleFetch } from "@sveltejs/kit";
+import { API_SSR_URL, TRACING_EXPORT } from "src/env";
 import { maybePatchDataUrl } from "$lib/fetch";
+import { endSpan, formatTraceparent, startSpan } from "$lib/tracing";
 
 // See: https://kit.svelte.dev/docs/hooks#server-hooks-handle
 export const handle: Handle = async ({ event, resolve }) => {
-  let response = await resolve(event);
+  const traceparent = event.request.headers.get("traceparent");
 
-  response = await maybePatchDataUrl(response, event.url);
+  if (!TRACING_EXPORT) {
+    // Spans would not be recorded: API requests made while rendering this page
+    // belong to the incoming trace, if any.
+    event.locals.traceparent = traceparent;
+    return maybePatchDataUrl(await resolve(event), event.url);
+  }
 
-  return response;
+  // Record rendering this page as a span, which API requests are children of.
+  const span = startSpan(
+    `${event.request.method} ${event.routeId || ""}`.trim(),
+    traceparent
+  );
+  span.attributes["http.method"] = event.request.method;
+  span.attributes["http.target"] = event.url.pathname;
+  event.locals.traceparent = formatTraceparent(span);
+
+  let error: string | null = null;
+
+  try {
+    let response = await resolve(event);
+
+    response = await maybePatchDataUrl(response, event.url);
+
+    span.attributes["http.status_code"] = response.status;
+    if (response.status >= 500) {
+      error = `HTTP ${response.status}`;
+    }
+
+    return response;
+  } catch (e) {
+    error = String(e);
+    throw e;
+  } finally {
+    await endSpan(span, error);
+  }
+};
+
+// See: https://kit.svelte.dev/docs/hooks#server-hooks-handlefetch
+export const handleFetch: HandleFetch = async ({ event, request, fetch }) => {
+  if (request.url.startsWith(API_SSR_URL) && event.locals.traceparent) {
+    request.headers.set("traceparent", event.locals.traceparent);
+  }
+
+  return fetch(request);
 };
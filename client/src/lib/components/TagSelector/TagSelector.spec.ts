@@ -3,8 +3,9 @@
  */
 import "@testing-library/jest-dom";
 
+import { vi } from "vitest";
 import TagSelector from "./TagSelector.svelte";
-import { render, fireEvent } from "@testing-library/svelte";
+import { render, fireEvent, waitFor } from "@testing-library/svelte";
 
 describe("Test the TagSelector", () => {
   test("should display no selected tags", async () => {
@@ -120,4 +121,29 @@ describe("Test the TagSelector", () => {
     const tags = getAllByRole("listitem");
     expect(tags).toHaveLength(1);
   });
+
+  test("should search tags as the user types", async () => {
+    const searchTags = vi.fn(async (q: string) => [
+      { id: "uuid2", name: `${q} result` },
+    ]);
+
+    const { getByRole, getByLabelText, getAllByRole } = render(TagSelector, {
+      name: "my-list",
+      tags: [{ id: "uuid1", name: "foo" }],
+      searchTags,
+    });
+
+    const input = getByLabelText("Rechercher un mot-clé", { exact: false });
+    await fireEvent.input(input, { target: { value: "env" } });
+
+    const select = getByRole("combobox");
+    await waitFor(() => expect(select).toHaveTextContent("env result"));
+    expect(searchTags).toHaveBeenCalledTimes(1);
+    expect(searchTags).toHaveBeenCalledWith("env");
+
+    await fireEvent.change(select, { target: { value: "uuid2" } });
+    const tags = getAllByRole("listitem");
+    expect(tags).toHaveLength(1);
+    expect(tags[0]).toHaveTextContent("env result");
+  });
 });
@@ -1,17 +1,33 @@
 import type { Fetch } from "src/definitions/fetch";
 import type { Tag } from "src/definitions/tag";
+import { TAGS_PER_PAGE } from "src/constants";
 import { getApiUrl, getHeaders, makeApiRequest } from "../fetch";
+import { toPaginated } from "../transformers/pagination";
+import { toQueryString } from "../util/urls";
 import { Maybe } from "../util/maybe";
 
 type GetTags = (opts: {
   fetch: Fetch;
   apiToken: string;
+  q?: string;
 }) => Promise<Maybe<Tag[]>>;
-export const getTags: GetTags = async ({ fetch, apiToken }) => {
-  const url = `${getApiUrl()}/tags/`;
+export const getTags: GetTags = async ({ fetch, apiToken, q = "" }) => {
+  // Only the most used tags are loaded: others are found by searching.
+  const queryString = toQueryString([
+    ["page_size", TAGS_PER_PAGE.toString()],
+    ["sort", "usage"],
+    ["q", q || null],
+  ]);
+  const url = `${getApiUrl()}/tags/${queryString}`;
   const request = new Request(url, {
     headers: getHeaders(apiToken),
   });
   const response = await makeApiRequest(fetch, request);
-  return Maybe.map(response, (response) => response.json());
+
+  if (!Maybe.Some(response)) {
+    return response;
+  }
+
+  const data = await response.json();
+  return toPaginated<Tag, Tag>(data, ({ id, name }) => ({ id, name })).items;
 };
@@ -0,0 +1,60 @@
+import { endSpan, formatTraceparent, startSpan } from "./tracing";
+
+describe("tracing", () => {
+  const traceId = "4bf92f3577b34da6a3ce929d0e0e4736";
+
+  test("Incoming trace is continued by a child span", () => {
+    const traceparent = `00-${traceId}-00f067aa0ba902b7-01`;
+    const span = startSpan("GET /", traceparent, 0);
+    expect(span).toMatchObject({
+      traceId,
+      parentSpanId: "00f067aa0ba902b7",
+      sampled: true,
+    });
+    expect(span.spanId).toMatch(/^[0-9a-f]{16}$/);
+    expect(span.spanId).not.toEqual("00f067aa0ba902b7");
+    expect(formatTraceparent(span)).toEqual(`00-${traceId}-${span.spanId}-01`);
+  });
+
+  test("Incoming sampling decision is kept", () => {
+    const traceparent = `00-${traceId}-00f067aa0ba902b7-00`;
+    const span = startSpan("GET /", traceparent, 1);
+    expect(span.sampled).toBe(false);
+    expect(formatTraceparent(span)).toMatch(/-00$/);
+  });
+
+  test.each([null, "invalid"])("A trace is started otherwise", (header) => {
+    const span = startSpan("GET /", header, 1);
+    expect(span.traceId).toMatch(/^[0-9a-f]{32}$/);
+    expect(span.traceId).not.toEqual(traceId);
+    expect(span.parentSpanId).toBeNull();
+    expect(span.sampled).toBe(true);
+    expect(startSpan("GET /", header, 0).sampled).toBe(false);
+  });
+
+  test("Only sampled spans are exported", async () => {
+    const lines: string[] = [];
+    const write = async (line: string) => {
+      lines.push(line);
+    };
+
+    await endSpan(startSpan("GET /", null, 0), null, write);
+    expect(lines).toHaveLength(0);
+
+    const parent = startSpan("GET /", null, 1);
+    const span = startSpan("GET /", formatTraceparent(parent));
+    span.attributes["http.status_code"] = 200;
+    await endSpan(span, null, write);
+    expect(lines).toHaveLength(1);
+
+    const data = JSON.parse(lines[0]);
+    const [exported] = data.resourceSpans[0].scopeSpans[0].spans;
+    expect(exported).toMatchObject({
+      traceId: parent.traceId,
+      spanId: span.spanId,
+      parentSpanId: parent.spanId,
+      attributes: [{ key: "http.status_code", value: { intValue: "200" } }],
+      status: { code: 1 },
+    });
+  });
+});
@@ -0,0 +1,162 @@
+import { appendFile } from "fs/promises";
+import { TRACING_EXPORT, TRACING_SAMPLE_RATE } from "src/env";
+
+/**
+ * Tracing of server-side rendering (SSR), so that API requests made while
+ * rendering a page are recorded in the same trace as the page.
+ *
+ * Spans are written like the API server does: one OTLP/JSON line per page.
+ * See: https://www.w3.org/TR/trace-context/#traceparent-header
+ */
+
+export type Span = {
+  traceId: string;
+  spanId: string;
+  parentSpanId: string | null;
+  sampled: boolean;
+  name: string;
+  startTimeUnixNano: string;
+  attributes: Record<string, string | number>;
+};
+
+const SAMPLED_FLAG = 0x01;
+
+// OTLP values.
+const SPAN_KIND_SERVER = 2;
+const STATUS_OK = 1;
+const STATUS_ERROR = 2;
+
+const randomHex = (bytes: number): string => {
+  // All zeros is an invalid ID.
+  for (;;) {
+    const values = crypto.getRandomValues(new Uint8Array(bytes));
+    if (values.some((value) => value !== 0)) {
+      const hex = Array.from(values, (v) => v.toString(16).padStart(2, "0"));
+      return hex.join("");
+    }
+  }
+};
+
+const nowUnixNano = (): string => {
+  const ms = performance.timeOrigin + performance.now();
+  return (BigInt(Math.round(ms * 1000)) * BigInt(1000)).toString();
+};
+
+/**
+ * Start a span as a child of the incoming `traceparent` header, if valid,
+ * keeping its sampling decision. Otherwise, start a new trace, sampled at
+ * the given rate.
+ */
+export const startSpan = (
+  name: string,
+  traceparent: string | null,
+  sampleRate: number = TRACING_SAMPLE_RATE
+): Span => {
+  const match = /^00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$/.exec(
+    traceparent?.trim().toLowerCase() || ""
+  );
+
+  const span = {
+    spanId: randomHex(8),
+    name,
+    startTimeUnixNano: nowUnixNano(),
+    attributes: {},
+  };
+
+  if (match) {
+    const [, traceId, parentSpanId, flags] = match;
+    const sampled = (parseInt(flags, 16) & SAMPLED_FLAG) !== 0;
+    return { ...span, traceId, parentSpanId, sampled };
+  }
+
+  return {
+    ...span,
+    traceId: randomHex(16),
+    parentSpanId: null,
+    sampled: Math.random() < sampleRate,
+  };
+};
+
+/**
+ * Return the `traceparent` header value of requests made within this span.
+ * The flags carry the sampling decision, which the API server follows.
+ */
+export const formatTraceparent = (span: Span): string => {
+  const flags = span.sampled ? "01" : "00";
+  return `00-${span.traceId}-${span.spanId}-${flags}`;
+};
+
+const makeAttributes = (attributes: Record<string, string | number>) =>
+  Object.entries(attributes).map(([key, value]) => ({
+    key,
+    // 64-bit integers are strings in OTLP/JSON.
+    value:
+      typeof value === "number"
+        ? { intValue: String(value) }
+        : { stringValue: value },
+  }));
+
+/**
+ * Return the span as a line of OTLP/JSON (an `ExportTraceServiceRequest`).
+ * See: https://opentelemetry.io/docs/specs/otlp/#json-protobuf-encoding
+ */
+export const makeOtlpJson = (
+  span: Span,
+  endTimeUnixNano: string,
+  error: string | null
+): string => {
+  const data = {
+    traceId: span.traceId,
+    spanId: span.spanId,
+    parentSpanId: span.parentSpanId || undefined,
+    name: span.name,
+    kind: SPAN_KIND_SERVER,
+    startTimeUnixNano: span.startTimeUnixNano,
+    endTimeUnixNano,
+    attributes: makeAttributes(span.attributes),
+    status: error
+      ? { code: STATUS_ERROR, message: error }
+      : { code: STATUS_OK },
+  };
+
+  const resource = {
+    attributes: makeAttributes({ "service.name": "catalogage-client" }),
+  };
+
+  return JSON.stringify({
+    resourceSpans: [
+      {
+        resource,
+        scopeSpans: [{ scope: { name: "client" }, spans: [data] }],
+      },
+    ],
+  });
+};
+
+const writeLine = async (line: string): Promise<void> => {
+  if (TRACING_EXPORT === "-") {
+    process.stdout.write(`${line}\n`);
+    return;
+  }
+
+  try {
+    await appendFile(TRACING_EXPORT, `${line}\n`);
+  } catch (error) {
+    console.error("Failed to export span", error);
+  }
+};
+
+/**
+ * End the span, and export it if it was sampled.
+ */
+export const endSpan = async (
+  span: Span,
+  error: string | null = null,
+  write: (line: string) => Promise<void> = writeLine
+): Promise<void> => {
+  if (!span.sampled) {
+    return;
+  }
+
+  await write(makeOtlpJson(span, nowUnixNano(), error));
+};
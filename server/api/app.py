@@ -1,14 +1,19 @@
-from debug_toolbar.middleware import DebugToolbarMiddleware
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from starlette.middleware.sessions import SessionMiddleware
 
 from server.config import Settings
 from server.config.di import resolve
+from server.infrastructure.metrics.loop import LoopLagMonitor
 
+from . import lifecycle
 from .auth.middleware import AuthMiddleware
+from .debugging.profiling import ProfilingMiddleware
+from .metrics.middleware import MetricsMiddleware, RequestStatsMiddleware
 from .resources import auth_backend
 from .routes import router
+from .tracing.middleware import TracingMiddleware
+from .tracing.routing import trace_endpoints
 
 origins = [
     "http://localhost:3000",
@@ -44,11 +49,44 @@ def create_app(settings: Settings = None) -> App:
     app.add_middleware(SessionMiddleware, secret_key=settings.secret_key)
 
     if settings.debug:
+        # Slow to import, and only useful in development.
+        from debug_toolbar.middleware import DebugToolbarMiddleware
+
         app.add_middleware(
             DebugToolbarMiddleware,
             panels=["server.api.debugging.debug_toolbar.panels.SQLAlchemyPanel"],
         )
 
+    if settings.profiling_dir:
+        app.add_middleware(
+            ProfilingMiddleware,
+            directory=settings.profiling_dir,
+            sample_rate=settings.profiling_sample_rate,
+        )
+
+    app.add_middleware(RequestStatsMiddleware)
+
+    if settings.tracing_export:
+        app.add_middleware(TracingMiddleware)
+
+    app.add_middleware(MetricsMiddleware)
+
+    # Resolved when called, as workers bootstrap again after fork if the app was
+    # preloaded. See: server/infrastructure/server.py
+    async def start_loop_lag_monitor() -> None:
+        await resolve(LoopLagMonitor).start()
+
+    async def stop_loop_lag_monitor() -> None:
+        await resolve(LoopLagMonitor).stop()
+
+    app.add_event_handler("startup", start_loop_lag_monitor)
+    app.add_event_handler("startup", lifecycle.on_startup)
+    app.add_event_handler("shutdown", lifecycle.on_shutdown)
+    app.add_event_handler("shutdown", stop_loop_lag_monitor)
+
     app.include_router(router)
 
+    if settings.tracing_export:
+        trace_endpoints(app.routes)
+
     return app
@@ -8,8 +8,10 @@ from starlette.authentication import (
 )
 from starlette.requests import HTTPConnection
 
+from server.application.auth.passwords import hash_api_token
 from server.config.di import resolve
 from server.domain.auth.repositories import AccountRepository
+from server.infrastructure.auth.caching import RejectedApiTokenCache
 
 from ..models import ApiUser
 
@@ -42,9 +44,16 @@ class TokenAuthBackend(AuthenticationBackend):
         if scheme.lower() != "bearer":
             return AuthCredentials(), ApiUser(None)
 
+        rejected_api_tokens = resolve(RejectedApiTokenCache)
+        api_token_hash = hash_api_token(api_token)
+
+        if rejected_api_tokens.contains(api_token_hash):
+            raise AuthenticationError()
+
         account = await account_repository.get_by_api_token(api_token)
 
         if account is None:
+            rejected_api_tokens.add(api_token_hash)
             raise AuthenticationError()
 
         return AuthCredentials(scopes=["authenticated"]), ApiUser(account)
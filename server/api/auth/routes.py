@@ -6,7 +6,11 @@ from server.application.auth.queries import GetAccountByEmail, LoginPasswordUser
 from server.application.auth.views import AccountView, AuthenticatedAccountView
 from server.config.di import resolve
 from server.domain.auth.entities import UserRole
-from server.domain.auth.exceptions import EmailAlreadyExists, LoginFailed
+from server.domain.auth.exceptions import (
+    EmailAlreadyExists,
+    LoginFailed,
+    PasswordEncoderBusy,
+)
 from server.domain.common.types import ID
 from server.domain.organizations.exceptions import OrganizationDoesNotExist
 from server.seedwork.application.messages import MessageBus
@@ -20,6 +24,14 @@ router = APIRouter(prefix="/auth", tags=["auth"])
 router.include_router(datapass.router)
 
 
+def _password_encoder_busy() -> HTTPException:
+    return HTTPException(
+        503,
+        detail="Too many password operations in progress, please retry later",
+        headers={"Retry-After": "1"},
+    )
+
+
 @router.post(
     "/users/",
     dependencies=[Depends(IsAuthenticated() & HasRole(UserRole.ADMIN))],
@@ -41,6 +53,8 @@ async def create_password_user(data: PasswordUserCreate) -> AccountView:
         raise HTTPException(400, detail=str(exc))
     except OrganizationDoesNotExist as exc:
         raise HTTPException(400, detail=str(exc))
+    except PasswordEncoderBusy:
+        raise _password_encoder_busy()
 
     query = GetAccountByEmail(email=data.email)
     return await bus.execute(query)
@@ -56,6 +70,8 @@ async def login_password_user(data: PasswordUserLogin) -> AuthenticatedAccountVi
         return await bus.execute(query)
     except LoginFailed as exc:
         raise HTTPException(401, detail=str(exc))
+    except PasswordEncoderBusy:
+        raise _password_encoder_busy()
 
 
 @router.get(
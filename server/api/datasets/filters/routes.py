@@ -1,6 +1,9 @@
 from fastapi import APIRouter, Depends
+from starlette.requests import Request
+from starlette.responses import Response
 
 from server.api.auth.permissions import IsAuthenticated
+from server.application.datasets.caching import DatasetFiltersCache
 from server.application.datasets.queries import GetDatasetFilters
 from server.application.datasets.views import DatasetFiltersView
 from server.config.di import resolve
@@ -9,11 +12,44 @@ from server.seedwork.application.messages import MessageBus
 router = APIRouter(prefix="/filters")
 
 
+def _strip_weak_prefix(value: str) -> str:
+    value = value.strip()
+    return value[2:] if value.startswith("W/") else value
+
+
+def _is_not_modified(request: Request, etag: str) -> bool:
+    if_none_match = request.headers.get("If-None-Match")
+
+    if if_none_match is None:
+        return False
+
+    candidates = {_strip_weak_prefix(value) for value in if_none_match.split(",")}
+
+    return "*" in candidates or etag in candidates
+
+
 @router.get(
     "/",
     dependencies=[Depends(IsAuthenticated())],
     response_model=DatasetFiltersView,
+    responses={304: {}},
 )
-async def get_dataset_filters() -> DatasetFiltersView:
-    bus = resolve(MessageBus)
-    return await bus.execute(GetDatasetFilters())
+async def get_dataset_filters(request: Request) -> Response:
+    cache = resolve(DatasetFiltersCache)
+
+    entry = cache.get()
+
+    if entry is None:
+        bus = resolve(MessageBus)
+        version = cache.version
+        filters = await bus.execute(GetDatasetFilters())
+        entry = cache.set(filters, version=version)
+
+    # Filters are only served to authenticated users, so shared caches must not
+    # store them. Clients may reuse their copy after revalidating it with the ETag.
+    headers = {"Cache-Control": "private, no-cache", "ETag": entry.etag}
+
+    if _is_not_modified(request, entry.etag):
+        return Response(status_code=304, headers=headers)
+
+    return Response(entry.content, media_type="application/json", headers=headers)
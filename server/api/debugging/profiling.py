@@ -0,0 +1,118 @@
+import asyncio
+import cProfile
+import datetime as dt
+import logging
+import random
+import secrets
+from pathlib import Path
+from typing import Optional
+from urllib.parse import parse_qs
+
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from server.application.auth.passwords import ProfilingSigner
+from server.config.di import resolve
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = "X-Profile"
+PROFILE_QUERY_PARAM = "profile"
+
+
+def make_profiling_token() -> str:
+    """
+    Return a signed token which triggers profiling of requests that carry it,
+    until it expires (see `Settings.profiling_token_max_age`).
+    """
+    signer = resolve(ProfilingSigner)
+    return signer.sign(secrets.token_hex(16)).decode("utf-8")
+
+
+class ProfilingMiddleware:
+    """
+    Profile selected requests with cProfile, and write profiles to `directory`
+    in pstats format (e.g. for snakeviz, or `python -m pstats`).
+
+    A request is profiled if it carries a signed token (see `make_profiling_token()`)
+    in the `X-Profile` header or the `profile` query parameter, or if it is picked
+    at random according to `sample_rate`.
+
+    Other requests only pay for a header lookup.
+
+    NOTE: cProfile observes the whole event loop thread, so requests served
+    concurrently show up in the profile too. Only one request is profiled at a time.
+    """
+
+    def __init__(self, app: ASGIApp, directory: str, sample_rate: float = 0) -> None:
+        self.app = app
+        self._directory = Path(directory)
+        self._sample_rate = sample_rate
+        self._active = False
+
+    def _is_triggered(self, scope: Scope) -> bool:
+        token = Headers(scope=scope).get(PROFILE_HEADER)
+
+        if token is None and PROFILE_QUERY_PARAM.encode() in scope["query_string"]:
+            query = parse_qs(scope["query_string"].decode("latin-1"))
+            token = query.get(PROFILE_QUERY_PARAM, [""])[0] or None
+
+        if token is not None:
+            signer = resolve(ProfilingSigner)
+            if signer.verify(token.encode()):
+                return True
+            logger.info("Ignoring invalid profiling token")
+
+        return self._sample_rate > 0 and random.random() < self._sample_rate
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or self._active or not self._is_triggered(scope):
+            await self.app(scope, receive, send)
+            return
+
+        profile_id = dt.datetime.now().strftime("%Y%m%dT%H%M%S") + (
+            "-" + secrets.token_hex(4)
+        )
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((b"x-profile-id", profile_id.encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        profiler = cProfile.Profile()
+        self._active = True
+        profiler.enable()
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            profiler.disable()
+            self._active = False
+            path = await self._write(profiler, scope, profile_id)
+
+        if path is not None:
+            logger.info(
+                "Profiled request %s %s: %s", scope["method"], scope["path"], path
+            )
+
+    async def _write(
+        self, profiler: cProfile.Profile, scope: Scope, profile_id: str
+    ) -> Optional[Path]:
+        route = str(getattr(scope.get("route"), "path_format", scope["path"]))
+        slug = "-".join(part for part in route.split("/") if part)
+        slug = "".join(c for c in slug if c.isalnum() or c in "-_") or "root"
+        path = self._directory / f"{profile_id}_{scope['method']}_{slug}.prof"
+
+        def write() -> None:
+            self._directory.mkdir(parents=True, exist_ok=True)
+            profiler.dump_stats(str(path))
+
+        try:
+            await asyncio.get_running_loop().run_in_executor(None, write)
+        except OSError:
+            logger.exception("Could not write profile to %s", path)
+            return None
+
+        return path
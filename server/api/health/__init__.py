@@ -0,0 +1,5 @@
+from .routes import router
+
+__all__ = [
+    "router",
+]
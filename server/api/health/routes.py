@@ -0,0 +1,18 @@
+from fastapi import APIRouter
+from starlette.responses import JSONResponse, Response
+
+from server.config.di import resolve
+from server.infrastructure.lifecycle import Lifecycle
+
+router = APIRouter(prefix="/health", tags=["health"])
+
+
+@router.get("/ready", include_in_schema=False)
+async def get_readiness() -> Response:
+    """
+    Respond with 200 once this process has warmed up, 503 before that and while
+    draining before shutdown.
+    """
+    lifecycle = resolve(Lifecycle)
+    status_code = 200 if lifecycle.is_ready else 503
+    return JSONResponse({"status": lifecycle.state.value}, status_code=status_code)
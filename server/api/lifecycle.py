@@ -0,0 +1,72 @@
+from server.application.catalogs.queries import GetAllCatalogs, GetCatalogExport
+from server.application.datasets.caching import DatasetFiltersCache
+from server.application.datasets.queries import GetAllDatasets, GetDatasetFilters
+from server.application.tags.queries import GetTagPage
+from server.config.di import resolve
+from server.config.settings import Settings
+from server.domain.common.pagination import Page
+from server.domain.tags.specifications import TagOrdering, TagSpec
+from server.infrastructure.catalogs.caching import ExportCache
+from server.infrastructure.database import Database
+from server.infrastructure.lifecycle import Lifecycle
+from server.seedwork.application.messages import MessageBus
+
+from .catalogs.rendering import to_csv
+from .tags.schemas import TAG_SELECTOR_PAGE_SIZE
+
+
+async def _warm_up_exports(n: int) -> None:
+    if n <= 0:
+        return
+
+    bus = resolve(MessageBus)
+    export_cache = resolve(ExportCache)
+
+    catalogs = await bus.execute(GetAllCatalogs())
+
+    for catalog in catalogs[:n]:
+        siret = catalog.organization.siret
+        export = await bus.execute(GetCatalogExport(siret=siret))
+        export_cache.set(siret, to_csv(export))
+
+
+async def warm_up() -> None:
+    """
+    Open database connections, compile common queries and fill caches, so that
+    first requests don't pay for it.
+    """
+    settings = resolve(Settings)
+    bus = resolve(MessageBus)
+
+    await resolve(Database).warm_up(settings.warmup_connections)
+
+    # Queries made by the client on its main pages.
+    await bus.execute(GetAllDatasets())
+
+    # Also fills the GetAllTags and GetLicenseSet query caches.
+    filters_cache = resolve(DatasetFiltersCache)
+    version = filters_cache.version
+    filters_cache.set(await bus.execute(GetDatasetFilters()), version=version)
+
+    # As requested by the tag selector. Not cached, but this loads the most used
+    # tags and their index pages into the database buffer cache.
+    await bus.execute(
+        GetTagPage(
+            page=Page(size=TAG_SELECTOR_PAGE_SIZE),
+            spec=TagSpec(ordering=TagOrdering.USAGE),
+        )
+    )
+
+    await _warm_up_exports(settings.warmup_exports)
+
+
+async def on_startup() -> None:
+    settings = resolve(Settings)
+    await resolve(Lifecycle).warm_up(warm_up, timeout=settings.warmup_timeout)
+
+
+async def on_shutdown() -> None:
+    # Uvicorn has stopped accepting requests and waited for in-flight ones (see:
+    # server/infrastructure/server.py). Close connections cleanly, rather than
+    # letting them drop on exit.
+    await resolve(Database).dispose()
@@ -0,0 +1,90 @@
+import logging
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from server.config.di import resolve
+from server.config.settings import Settings
+from server.infrastructure.metrics.http import HttpMetrics
+from server.infrastructure.metrics.request_stats import (
+    end_request_stats,
+    get_request_stats,
+    start_request_stats,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class MetricsMiddleware:
+    """
+    Record HTTP request metrics.
+
+    Must be the outermost middleware, so that the whole request is measured.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        metrics = resolve(HttpMetrics)
+        status = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        metrics.in_flight += 1
+        start = time.perf_counter()
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            metrics.in_flight -= 1
+
+            # The router stores the matched route in the scope.
+            route = scope.get("route")
+            route_template = getattr(route, "path_format", "<unmatched>")
+
+            metrics.observe(scope["method"], route_template, status, elapsed)
+
+
+class RequestStatsMiddleware:
+    """
+    Collect statistics about each request (see `RequestStats`), and warn about
+    requests that issue too many SQL queries.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        token = start_request_stats(scope)
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            stats = get_request_stats()
+            end_request_stats(token)
+
+            budget = resolve(Settings).db_query_budget
+
+            if stats is not None and stats.db_queries > budget:
+                logger.warning(
+                    "Request exceeded SQL query budget: %s %s issued %d queries "
+                    "(budget: %d)",
+                    scope["method"],
+                    stats.route,
+                    stats.db_queries,
+                    budget,
+                )
@@ -0,0 +1,16 @@
+from fastapi import APIRouter
+from starlette.responses import Response
+
+from server.config.di import resolve
+from server.infrastructure.metrics.registry import MetricsRegistry
+
+router = APIRouter(tags=["metrics"])
+
+
+@router.get("/metrics", include_in_schema=False)
+async def get_metrics() -> Response:
+    # NOTE: not exposed publicly. See: nginx-catalogage.conf.j2
+    metrics = resolve(MetricsRegistry)
+    return Response(
+        metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
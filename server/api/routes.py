@@ -5,7 +5,7 @@ from starlette.responses import RedirectResponse
 from server.config import Settings
 from server.config.di import resolve
 
-from . import auth, catalogs, datasets, licenses, organizations, tags
+from . import auth, catalogs, datasets, health, licenses, metrics, organizations, tags
 
 router = APIRouter()
 
@@ -23,3 +23,5 @@ router.include_router(tags.router)
 router.include_router(licenses.router)
 router.include_router(organizations.router)
 router.include_router(catalogs.router)
+router.include_router(metrics.router)
+router.include_router(health.router)
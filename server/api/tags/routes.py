@@ -1,13 +1,14 @@
-from typing import List
-
 from fastapi import APIRouter, Depends
 
-from server.application.tags.queries import GetAllTags
-from server.application.tags.views import TagView
+from server.application.tags.queries import GetTagPage
+from server.application.tags.views import TagListItemView
 from server.config.di import resolve
+from server.domain.common.pagination import Page, Pagination
+from server.domain.tags.specifications import TagSpec
 from server.seedwork.application.messages import MessageBus
 
 from ..auth.permissions import IsAuthenticated
+from .schemas import TagListParams
 
 router = APIRouter(prefix="/tags", tags=["tags"])
 
@@ -15,8 +16,16 @@ router = APIRouter(prefix="/tags", tags=["tags"])
 @router.get(
     "/",
     dependencies=[Depends(IsAuthenticated())],
-    response_model=List[TagView],
+    response_model=Pagination[TagListItemView],
 )
-async def list_tags() -> List[TagView]:
+async def list_tags(
+    params: TagListParams = Depends(),
+) -> Pagination[TagListItemView]:
     bus = resolve(MessageBus)
-    return await bus.execute(GetAllTags())
+
+    query = GetTagPage(
+        page=Page(number=params.page_number, size=params.page_size),
+        spec=TagSpec(search_term=params.q, ordering=params.sort),
+    )
+
+    return await bus.execute(query)
@@ -0,0 +1,23 @@
+from typing import Optional
+
+from fastapi import Query
+
+from server.domain.tags.specifications import TagOrdering
+
+# Most used tags listed by the client's tag selector.
+# NOTE: must match TAGS_PER_PAGE in client/src/constants.ts.
+TAG_SELECTOR_PAGE_SIZE = 100
+
+
+class TagListParams:
+    def __init__(
+        self,
+        q: Optional[str] = None,
+        page_number: int = Query(1, ge=1),
+        page_size: int = Query(10, ge=1, le=1000),
+        sort: TagOrdering = Query(TagOrdering.NAME),
+    ) -> None:
+        self.q = q
+        self.page_number = page_number
+        self.page_size = page_size
+        self.sort = sort
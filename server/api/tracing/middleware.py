@@ -0,0 +1,55 @@
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from server.config.di import resolve
+from server.infrastructure.tracing.spans import SERVER, Tracer
+
+
+class TracingMiddleware:
+    """
+    Trace each request, continuing the trace of the caller if it sent a W3C
+    `traceparent` header (e.g. the frontend during server-side rendering).
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        tracer = resolve(Tracer)
+        traceparent = Headers(scope=scope).get("traceparent")
+        status = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        with tracer.start_trace(
+            f"{scope['method']} {scope['path']}",
+            traceparent=traceparent,
+            kind=SERVER,
+            attributes={"http.method": scope["method"], "http.target": scope["path"]},
+        ) as span:
+            if span is None:
+                await self.app(scope, receive, send)
+                return
+
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                # The router stores the matched route in the scope.
+                route = getattr(scope.get("route"), "path_format", None)
+
+                if route is not None:
+                    span.name = f"{scope['method']} {route}"
+                    span.set_attribute("http.route", route)
+
+                span.set_attribute("http.status_code", status)
+
+                if status >= 500:
+                    span.error = f"HTTP {status}"
@@ -0,0 +1,25 @@
+from typing import Sequence
+
+from fastapi.routing import APIRoute
+from starlette.routing import BaseRoute
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from server.infrastructure.tracing.spans import start_span
+
+
+def _make_traced_app(app: ASGIApp, name: str) -> ASGIApp:
+    async def traced_app(scope: Scope, receive: Receive, send: Send) -> None:
+        with start_span(name):
+            await app(scope, receive, send)
+
+    return traced_app
+
+
+def trace_endpoints(routes: Sequence[BaseRoute]) -> None:
+    """
+    Run API endpoints in a span named after the endpoint (e.g. `list_datasets`),
+    covering request validation, the endpoint itself and response serialization.
+    """
+    for route in routes:
+        if isinstance(route, APIRoute):
+            route.app = _make_traced_app(route.app, route.name)
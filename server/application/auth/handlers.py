@@ -73,6 +73,9 @@ async def create_password_user(
     if organization is None:
         raise OrganizationDoesNotExist(siret)
 
+    # Hash first, so that no account is left behind if hashing fails.
+    password_hash = await password_encoder.hash(command.password)
+
     email = command.email
 
     account = await _maybe_reuse_account_of_existing_datapass_user(email, siret)
@@ -92,8 +95,6 @@ async def create_password_user(
         )
         await account_repository.insert(account)
 
-    password_hash = password_encoder.hash(command.password)
-
     password_user = PasswordUser(
         account_id=account.id,
         account=account,
@@ -115,10 +116,10 @@ async def login_password_user(query: LoginPasswordUser) -> AuthenticatedAccountV
     password_user = await repository.get_by_email(query.email)
 
     if password_user is None:
-        password_encoder.hash(query.password)  # Mitigate timing attacks.
+        await password_encoder.hash(query.password)  # Mitigate timing attacks.
         raise LoginFailed("Invalid credentials")
 
-    if not password_encoder.verify(
+    if not await password_encoder.verify(
         password=query.password, hash=password_user.password_hash
     ):
         raise LoginFailed("Invalid credentials")
@@ -206,7 +207,7 @@ async def change_password(command: ChangePassword) -> None:
     if password_user is None:
         raise AccountDoesNotExist(email)
 
-    password_user.update_password(password_encoder.hash(command.password))
+    password_user.update_password(await password_encoder.hash(command.password))
     password_user.account.update_api_token(generate_api_token())  # Require new login
 
     await repository.update(password_user)
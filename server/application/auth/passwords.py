@@ -1,13 +1,21 @@
+import hashlib
 import secrets
 
 from pydantic import SecretStr
 
 
 class PasswordEncoder:
-    def hash(self, password: SecretStr) -> str:
+    """
+    Hash and verify passwords.
+
+    Implementations may raise `PasswordEncoderBusy` when too many operations are
+    already in progress.
+    """
+
+    async def hash(self, password: SecretStr) -> str:
         raise NotImplementedError  # pragma: no cover
 
-    def verify(self, password: SecretStr, hash: str) -> bool:
+    async def verify(self, password: SecretStr, hash: str) -> bool:
         raise NotImplementedError  # pragma: no cover
 
 
@@ -19,9 +27,23 @@ def generate_api_token() -> str:
     return secrets.token_hex(nbytes)
 
 
+def hash_api_token(api_token: str) -> str:
+    # Only used to look up accounts by an indexed fixed-size key: the plaintext
+    # token is still stored, as it is returned upon login. API tokens are long
+    # random strings, so a fast unsalted hash does not collide in practice.
+    return hashlib.sha256(api_token.encode("utf-8")).hexdigest()
+
+
 class Signer:
     def sign(self, value: str) -> bytes:
         raise NotImplementedError  # pragma: no cover
 
     def verify(self, data: bytes) -> bool:
         raise NotImplementedError  # pragma: no cover
+
+
+class ProfilingSigner(Signer):
+    """
+    Sign profiling tokens, so that they are not interchangeable with other
+    signed tokens.
+    """
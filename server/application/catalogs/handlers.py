@@ -1,5 +1,6 @@
 from typing import Dict, List
 
+from server.application.datasets.caching import DatasetFiltersCache
 from server.config.di import resolve
 from server.domain.catalogs.entities import Catalog
 from server.domain.catalogs.exceptions import CatalogAlreadyExists, CatalogDoesNotExist
@@ -10,6 +11,7 @@ from server.domain.datasets.specifications import DatasetSpec
 from server.domain.organizations.exceptions import OrganizationDoesNotExist
 from server.domain.organizations.repositories import OrganizationRepository
 from server.domain.organizations.types import Siret
+from server.seedwork.domain.construction import construct_from
 
 from .commands import CreateCatalog
 from .queries import GetAllCatalogs, GetCatalogBySiret, GetCatalogExport
@@ -25,7 +27,7 @@ async def get_catalog_by_siret(query: GetCatalogBySiret) -> CatalogView:
     if catalog is None:
         raise CatalogDoesNotExist(siret)
 
-    return CatalogView(**catalog.dict())
+    return construct_from(CatalogView, catalog)
 
 
 async def get_all_catalogs(
@@ -33,7 +35,7 @@ async def get_all_catalogs(
 ) -> List[CatalogView]:
     repository = resolve(CatalogRepository)
     catalogs = await repository.get_all()
-    return [CatalogView(**catalog.dict()) for catalog in catalogs]
+    return [construct_from(CatalogView, catalog) for catalog in catalogs]
 
 
 async def create_catalog(
@@ -65,7 +67,11 @@ async def create_catalog(
         extra_fields=extra_fields,
     )
 
-    return await repository.insert(catalog)
+    siret = await repository.insert(catalog)
+
+    resolve(DatasetFiltersCache).invalidate()
+
+    return siret
 
 
 async def get_catalog_export(query: GetCatalogExport) -> CatalogExportView:
@@ -84,7 +90,9 @@ async def get_catalog_export(query: GetCatalogExport) -> CatalogExportView:
         account=Skip(),
     )
 
-    return CatalogExportView(
-        catalog=CatalogView(**catalog.dict()),
-        datasets=[DatasetExportView(**dataset.dict()) for (dataset, _) in datasets],
+    return CatalogExportView.construct(
+        catalog=construct_from(CatalogView, catalog),
+        datasets=[
+            construct_from(DatasetExportView, dataset) for (dataset, _) in datasets
+        ],
     )
@@ -0,0 +1,41 @@
+from typing import Optional
+
+from pydantic import BaseModel
+
+from .views import DatasetFiltersView
+
+
+class CachedDatasetFilters(BaseModel):
+    filters: DatasetFiltersView
+    content: str  # JSON-serialized filters, ready to be sent to clients.
+    etag: str
+
+
+class DatasetFiltersCache:
+    """
+    Store dataset filters, which are costly to compute but rarely change.
+
+    Handlers of commands that may change the filters must call `invalidate()`.
+    """
+
+    @property
+    def version(self) -> int:
+        """
+        An opaque value that changes each time the cache is invalidated.
+        """
+        raise NotImplementedError  # pragma: no cover
+
+    def get(self) -> Optional[CachedDatasetFilters]:
+        raise NotImplementedError  # pragma: no cover
+
+    def set(self, filters: DatasetFiltersView, *, version: int) -> CachedDatasetFilters:
+        """
+        Store filters computed while the cache was at the given `version`.
+
+        If the cache has been invalidated in the meantime, the filters may be stale
+        so they are not stored, but the entry is still returned for use by the caller.
+        """
+        raise NotImplementedError  # pragma: no cover
+
+    def invalidate(self) -> None:
+        raise NotImplementedError  # pragma: no cover
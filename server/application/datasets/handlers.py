@@ -1,3 +1,5 @@
+import asyncio
+
 from server.application.catalogs.queries import GetAllCatalogs
 from server.application.licenses.queries import GetLicenseSet
 from server.application.tags.queries import GetAllTags
@@ -14,7 +16,9 @@ from server.domain.datasets.repositories import DatasetRepository
 from server.domain.organizations.types import Siret
 from server.domain.tags.repositories import TagRepository
 from server.seedwork.application.messages import MessageBus
+from server.seedwork.domain.construction import construct_from
 
+from .caching import DatasetFiltersCache
 from .commands import CreateDataset, DeleteDataset, UpdateDataset
 from .exceptions import CannotCreateDataset, CannotSeeDataset, CannotUpdateDataset
 from .queries import GetAllDatasets, GetDatasetByID, GetDatasetFilters
@@ -70,7 +74,11 @@ async def create_dataset(command: CreateDataset, *, id_: ID = None) -> ID:
         **command.dict(exclude={"tag_ids"}),
     )
 
-    return await repository.insert(dataset)
+    id_ = await repository.insert(dataset)
+
+    resolve(DatasetFiltersCache).invalidate()
+
+    return id_
 
 
 async def update_dataset(command: UpdateDataset) -> None:
@@ -107,22 +115,37 @@ async def update_dataset(command: UpdateDataset) -> None:
 
     await repository.update(dataset)
 
+    resolve(DatasetFiltersCache).invalidate()
+
 
 async def delete_dataset(command: DeleteDataset) -> None:
     repository = resolve(DatasetRepository)
     await repository.delete(command.id)
 
+    resolve(DatasetFiltersCache).invalidate()
+
 
 async def get_dataset_filters(query: GetDatasetFilters) -> DatasetFiltersView:
     bus = resolve(MessageBus)
     repository = resolve(DatasetRepository)
 
-    catalogs = await bus.execute(GetAllCatalogs())
-    geographical_coverages = await repository.get_geographical_coverage_set()
-    services = await repository.get_service_set()
-    technical_sources = await repository.get_technical_source_set()
-    tags = await bus.execute(GetAllTags())
-    licenses = await bus.execute(GetLicenseSet())
+    # These queries are independent: run them concurrently. Each of them
+    # uses its own session, hence its own database connection.
+    (
+        catalogs,
+        geographical_coverages,
+        services,
+        technical_sources,
+        tags,
+        licenses,
+    ) = await asyncio.gather(
+        bus.execute(GetAllCatalogs()),
+        repository.get_geographical_coverage_set(),
+        repository.get_service_set(),
+        repository.get_technical_source_set(),
+        bus.execute(GetAllTags()),
+        bus.execute(GetLicenseSet()),
+    )
 
     return DatasetFiltersView(
         organization_siret=[
@@ -146,9 +169,12 @@ async def get_all_datasets(query: GetAllDatasets) -> Pagination[DatasetView]:
         page=query.page, spec=query.spec, account=query.account
     )
 
-    views = [DatasetView(**dataset.dict(), **extras) for dataset, extras in datasets]
+    # Entities come from the database: build views without validating them again.
+    views = [
+        construct_from(DatasetView, dataset, **extras) for dataset, extras in datasets
+    ]
 
-    return Pagination(items=views, total_items=count, page_size=query.page.size)
+    return Pagination.build(views, total_items=count, page_size=query.page.size)
 
 
 async def get_dataset_by_id(query: GetDatasetByID) -> DatasetView:
@@ -164,4 +190,4 @@ async def get_dataset_by_id(query: GetDatasetByID) -> DatasetView:
     ):
         raise CannotSeeDataset(f"{query.account.organization_siret=}, {id=}")
 
-    return DatasetView(**dataset.dict())
+    return construct_from(DatasetView, dataset)
@@ -8,6 +8,7 @@ from server.domain.organizations.exceptions import (
 )
 from server.domain.organizations.repositories import OrganizationRepository
 from server.domain.organizations.types import Siret
+from server.seedwork.domain.construction import construct_from
 
 from .views import OrganizationView
 
@@ -21,7 +22,7 @@ async def get_organization_by_siret(query: GetOrganizationBySiret) -> Organizati
     if organization is None:
         raise OrganizationDoesNotExist(siret)
 
-    return OrganizationView(**organization.dict())
+    return construct_from(OrganizationView, organization)
 
 
 async def create_organization(command: CreateOrganization) -> Siret:
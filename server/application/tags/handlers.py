@@ -1,12 +1,15 @@
 from typing import List
 
-from server.application.tags.queries import GetAllTags, GetTagByID
-from server.application.tags.views import TagView
+from server.application.datasets.caching import DatasetFiltersCache
+from server.application.tags.queries import GetAllTags, GetTagByID, GetTagPage
+from server.application.tags.views import TagListItemView, TagView
 from server.config.di import resolve
+from server.domain.common.pagination import Pagination
 from server.domain.common.types import ID
 from server.domain.tags.entities import Tag
 from server.domain.tags.exceptions import TagDoesNotExist
 from server.domain.tags.repositories import TagRepository
+from server.seedwork.domain.construction import construct_from
 
 from .commands import CreateTag
 
@@ -19,13 +22,27 @@ async def create_tag(command: CreateTag, *, id_: ID = None) -> ID:
 
     tag = Tag(id=id_, **command.dict())
 
-    return await repository.insert(tag)
+    id_ = await repository.insert(tag)
+
+    resolve(DatasetFiltersCache).invalidate()
+
+    return id_
 
 
 async def get_all_tags(query: GetAllTags) -> List[TagView]:
     repository = resolve(TagRepository)
     tags = await repository.get_all()
-    return [TagView(**tag.dict()) for tag in tags]
+    return [construct_from(TagView, tag) for tag in tags]
+
+
+async def get_tag_page(query: GetTagPage) -> Pagination[TagListItemView]:
+    repository = resolve(TagRepository)
+
+    tags, count = await repository.get_page(page=query.page, spec=query.spec)
+
+    views = [construct_from(TagListItemView, tag) for tag in tags]
+
+    return Pagination.build(views, total_items=count, page_size=query.page.size)
 
 
 async def get_tag_by_id(query: GetTagByID) -> TagView:
@@ -37,4 +54,4 @@ async def get_tag_by_id(query: GetTagByID) -> TagView:
     if tag is None:
         raise TagDoesNotExist(id_)
 
-    return TagView(**tag.dict())
+    return construct_from(TagView, tag)
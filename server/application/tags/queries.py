@@ -1,14 +1,21 @@
 from typing import List
 
+from server.domain.common.pagination import Page, Pagination
 from server.domain.common.types import ID
+from server.domain.tags.specifications import TagSpec
 from server.seedwork.application.queries import Query
 
-from .views import TagView
+from .views import TagListItemView, TagView
 
 
 class GetAllTags(Query[List[TagView]]):
     pass
 
 
+class GetTagPage(Query[Pagination[TagListItemView]]):
+    page: Page = Page()
+    spec: TagSpec = TagSpec()
+
+
 class GetTagByID(Query[TagView]):
     id: ID
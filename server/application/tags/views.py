@@ -6,3 +6,7 @@ from server.domain.common.types import ID
 class TagView(BaseModel):
     id: ID
     name: str
+
+
+class TagListItemView(TagView):
+    usage_count: int
@@ -61,7 +61,8 @@ Or in any custom scripts as seems fit.
 import datetime as dt
 from typing import Type, TypeVar
 
-from server.application.auth.passwords import PasswordEncoder, Signer
+from server.application.auth.passwords import PasswordEncoder, ProfilingSigner, Signer
+from server.application.datasets.caching import DatasetFiltersCache
 from server.domain.auth.repositories import (
     AccountRepository,
     DataPassUserRepository,
@@ -73,12 +74,20 @@ from server.domain.datasets.repositories import DatasetRepository
 from server.domain.organizations.repositories import OrganizationRepository
 from server.domain.tags.repositories import TagRepository
 from server.infrastructure.adapters.messages import MessageBusAdapter
+from server.infrastructure.adapters.middleware import (
+    MessageTimingMiddleware,
+    MessageTracingMiddleware,
+    QueryCachingMiddleware,
+    QueryCoalescingMiddleware,
+)
+from server.infrastructure.auth.caching import ApiTokenCache, RejectedApiTokenCache
 from server.infrastructure.auth.datapass import (
     DataPassOpenIDClient,
     get_datapass_openid_client,
 )
 from server.infrastructure.auth.passwords import (
     Argon2PasswordEncoder,
+    ItsDangerousProfilingSigner,
     ItsDangerousSigner,
 )
 from server.infrastructure.auth.repositories import (
@@ -92,9 +101,31 @@ from server.infrastructure.catalog_records.repositories import (
 from server.infrastructure.catalogs.caching import ExportCache
 from server.infrastructure.catalogs.repositories import SqlCatalogRepository
 from server.infrastructure.database import Database
+from server.infrastructure.datasets.caching import (
+    InMemoryDatasetFiltersCache,
+    NoDatasetFiltersCache,
+)
 from server.infrastructure.datasets.repositories import SqlDatasetRepository
+from server.infrastructure.lifecycle import Lifecycle
+from server.infrastructure.metrics.collectors import (
+    collect_export_cache,
+    collect_logging,
+    collect_message_bus,
+    collect_pool,
+    collect_process,
+    collect_rejected_api_tokens,
+    process_labels,
+)
+from server.infrastructure.metrics.http import HttpMetrics
+from server.infrastructure.metrics.loop import LoopLagMonitor
+from server.infrastructure.metrics.registry import MetricsRegistry
+from server.infrastructure.metrics.slow_queries import SlowQueryLog
+from server.infrastructure.metrics.sql import SqlMetrics
 from server.infrastructure.organizations.repositories import SqlOrganizationRepository
 from server.infrastructure.tags.repositories import SqlTagRepository
+from server.infrastructure.tracing.exporters import OtlpJsonExporter
+from server.infrastructure.tracing.spans import Tracer
+from server.infrastructure.tracing.sql import SqlTracing
 from server.seedwork.application.di import Container
 from server.seedwork.application.messages import MessageBus
 from server.seedwork.application.modules import load_modules
@@ -126,8 +157,13 @@ def configure(container: "Container") -> None:
     container.register_instance(Settings, settings)
 
     # Auth services
-    container.register_instance(PasswordEncoder, Argon2PasswordEncoder())
+    container.register_instance(
+        PasswordEncoder, Argon2PasswordEncoder.from_settings(settings)
+    )
     container.register_instance(Signer, ItsDangerousSigner(settings))
+    container.register_instance(
+        ProfilingSigner, ItsDangerousProfilingSigner(settings)
+    )
     container.register_instance(
         DataPassOpenIDClient, get_datapass_openid_client(settings)
     )
@@ -148,9 +184,46 @@ def configure(container: "Container") -> None:
         for query, handler in cls.query_handlers.items()
     }
 
-    bus = MessageBusAdapter(command_handlers, query_handlers)
+    # Caches are kept in each process, and writes only invalidate caches of the
+    # process which made them. With several processes, others would keep serving
+    # stale data, so caches invalidated by writes are disabled.
+    # Caches which only expire (e.g. exports) are kept.
+    invalidates_all_caches = settings.processes == 1
+
+    cached_queries = {
+        query: policy
+        for cls in modules
+        for query, policy in cls.cached_queries.items()
+        if invalidates_all_caches or not policy.invalidated_by
+    }
+
+    coalesced_queries = {query for cls in modules for query in cls.coalesced_queries}
+
+    message_timing = MessageTimingMiddleware()
+    container.register_instance(MessageTimingMiddleware, message_timing)
+
+    query_caching = QueryCachingMiddleware(cached_queries)
+    container.register_instance(QueryCachingMiddleware, query_caching)
+
+    query_coalescing = QueryCoalescingMiddleware(coalesced_queries)
+    container.register_instance(QueryCoalescingMiddleware, query_coalescing)
+
+    bus = MessageBusAdapter(
+        command_handlers,
+        query_handlers,
+        middleware=[
+            MessageTracingMiddleware(),
+            message_timing,
+            query_caching,
+            query_coalescing,
+        ],
+    )
     container.register_instance(MessageBus, bus)
 
+    # Process lifecycle (warm-up, readiness, draining)
+
+    container.register_instance(Lifecycle, Lifecycle())
+
     # Databases
 
     db = Database(url=settings.env_database_url, debug=settings.debug)
@@ -158,8 +231,20 @@ def configure(container: "Container") -> None:
 
     # Repositories
 
-    container.register_instance(AccountRepository, SqlAccountRepository(db))
-    container.register_instance(PasswordUserRepository, SqlPasswordUserRepository(db))
+    api_token_cache = ApiTokenCache(
+        max_age=dt.timedelta(minutes=1),
+        max_size=1024 if invalidates_all_caches else 0,
+    )
+    container.register_instance(ApiTokenCache, api_token_cache)
+    rejected_api_token_cache = RejectedApiTokenCache(period=dt.timedelta(minutes=5))
+    container.register_instance(RejectedApiTokenCache, rejected_api_token_cache)
+
+    container.register_instance(
+        AccountRepository, SqlAccountRepository(db, api_token_cache)
+    )
+    container.register_instance(
+        PasswordUserRepository, SqlPasswordUserRepository(db, api_token_cache)
+    )
     container.register_instance(DataPassUserRepository, SqlDataPassUserRepository(db))
     container.register_instance(CatalogRecordRepository, SqlCatalogRecordRepository(db))
     container.register_instance(DatasetRepository, SqlDatasetRepository(db))
@@ -168,7 +253,58 @@ def configure(container: "Container") -> None:
     container.register_instance(CatalogRepository, SqlCatalogRepository(db))
 
     # Caching
-    container.register_instance(ExportCache, ExportCache(max_age=dt.timedelta(days=1)))
+    export_cache = ExportCache(max_age=dt.timedelta(days=1))
+    container.register_instance(ExportCache, export_cache)
+    container.register_instance(
+        DatasetFiltersCache,
+        InMemoryDatasetFiltersCache(max_age=dt.timedelta(minutes=5))
+        if invalidates_all_caches
+        else NoDatasetFiltersCache(),
+    )
+
+    # Metrics
+
+    http_metrics = HttpMetrics()
+    container.register_instance(HttpMetrics, http_metrics)
+
+    sql_metrics = SqlMetrics()
+    db.on_engine_created(sql_metrics.instrument)
+
+    slow_query_log = SlowQueryLog(
+        threshold=settings.slow_query_threshold,
+        explain_file=settings.slow_query_explain_file,
+        explain_interval=settings.slow_query_explain_interval,
+    )
+    db.on_engine_created(slow_query_log.instrument)
+    container.register_instance(SlowQueryLog, slow_query_log)
+
+    loop_lag_monitor = LoopLagMonitor()
+    container.register_instance(LoopLagMonitor, loop_lag_monitor)
+
+    metrics = MetricsRegistry(labels=process_labels())
+    metrics.register(collect_process)
+    metrics.register(http_metrics.collect)
+    metrics.register(sql_metrics.collect)
+    metrics.register(lambda: collect_pool(db))
+    metrics.register(lambda: collect_export_cache(export_cache))
+    metrics.register(
+        lambda: collect_message_bus(message_timing, query_caching, query_coalescing)
+    )
+    metrics.register(lambda: collect_rejected_api_tokens(rejected_api_token_cache))
+    metrics.register(loop_lag_monitor.collect)
+    metrics.register(collect_logging)
+    container.register_instance(MetricsRegistry, metrics)
+
+    # Tracing
+
+    tracer = Tracer(
+        OtlpJsonExporter(settings.tracing_export) if settings.tracing_export else None,
+        sample_rate=settings.tracing_sample_rate,
+    )
+    container.register_instance(Tracer, tracer)
+
+    if tracer.enabled:
+        db.on_engine_created(SqlTracing().instrument)
 
 
 _CONTAINER = Container(configure)
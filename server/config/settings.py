@@ -1,3 +1,4 @@
+import os
 from typing import Literal
 
 from pydantic import BaseSettings
@@ -18,9 +19,66 @@ class Settings(BaseSettings):
     datapass_client_secret: str = "<define-me>"
     host: str = "localhost"
     port: int = 3579
+    # Live mode only: the server runs in this many worker processes (0: one per
+    # CPU), managed by Gunicorn. See: server/infrastructure/server.py
+    # NOTE: caches invalidated by writes are disabled with several workers, as
+    # invalidations would only reach the worker which made the write.
+    workers: int = 1
+    loop: Literal["auto", "asyncio", "uvloop"] = "auto"
+    http: Literal["auto", "h11", "httptools"] = "auto"
+    keep_alive: int = 5  # Seconds
+    backlog: int = 2048  # Maximum number of pending connections
+    # Workers are restarted after this many requests, plus a random jitter so that
+    # they don't all restart at once. 0: never.
+    max_requests: int = 0
+    max_requests_jitter: int = 0
+    # Also bounds how long shutdown waits for in-flight requests.
+    graceful_timeout: int = 30  # Seconds
+    # On stop, keep serving for this long while the readiness endpoint responds
+    # 503, so that load balancers polling it stop sending traffic before the
+    # listener closes. Should be shorter than `graceful_timeout`.
+    shutdown_delay: float = 0  # Seconds
+    # Import the app before forking workers, so that they start faster and share
+    # memory. Process-specific resources are still created in each worker.
+    preload: bool = False
+    # On startup, open this many database connections (at most the pool size), run
+    # common queries and preload exports of this many catalogs, so that first
+    # requests don't pay for it. Startup waits for warm-up at most `warmup_timeout`,
+    # then it goes on in the background. See: server/api/lifecycle.py
+    warmup_connections: int = 5
+    warmup_exports: int = 10
+    warmup_timeout: float = 10  # Seconds
     docs_url: str = "/docs"
     config_repo_api_key: str = ""
     debug: bool = False
+    # See: https://argon2-cffi.readthedocs.io/en/stable/parameters.html
+    argon2_time_cost: int = 3
+    argon2_memory_cost: int = 65536  # KiB
+    argon2_parallelism: int = 4
+    password_hashing_workers: int = 2
+    password_hashing_max_pending: int = 64
+    password_hashing_queue_timeout: float = 5  # Seconds
+    # Requests issuing more SQL queries than this are logged (e.g. N+1 queries).
+    db_query_budget: int = 20
+    # SQL queries slower than this are logged. Set to 0 to disable.
+    slow_query_threshold: float = 0.5  # Seconds
+    # If set, plans of slow queries are written to this file. (Rotated.)
+    slow_query_explain_file: str = ""
+    slow_query_explain_interval: float = 60  # Seconds
+    # If set, selected requests are profiled and profiles are written to this
+    # directory. See: server/api/debugging/profiling.py
+    profiling_dir: str = ""
+    profiling_sample_rate: float = 0  # Fraction of requests profiled at random
+    profiling_token_max_age: int = 3600  # Seconds
+    # If set, requests are traced and spans are written to this file ("-" for
+    # stdout) in OTLP/JSON format.
+    tracing_export: str = ""
+    tracing_sample_rate: float = 1  # For requests without a `traceparent` header
+    # If set, logs are written by a background thread, so that a stalled stdout does
+    # not block requests. Records are dropped when this many are pending.
+    log_queue_size: int = 0
+    # Access log records beyond this rate are skipped, except errors. 0: no limit.
+    access_log_max_rate: int = 0  # Per second
     testing: bool = False
 
     class Config:
@@ -44,3 +102,12 @@ class Settings(BaseSettings):
     @property
     def env_database_url(self) -> str:
         return self.test_database_url if self.testing else self.database_url
+
+    @property
+    def processes(self) -> int:
+        """
+        Number of processes serving the API.
+        """
+        if self.server_mode != "live":
+            return 1
+        return self.workers or os.cpu_count() or 1
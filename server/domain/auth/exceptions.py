@@ -15,3 +15,7 @@ class DataPassUserAlreadyExists(AlreadyExists):
 
 class LoginFailed(Exception):
     pass
+
+
+class PasswordEncoderBusy(Exception):
+    pass
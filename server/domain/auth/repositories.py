@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import Optional, Set
 
 from server.seedwork.domain.repositories import Repository
 
@@ -24,6 +24,9 @@ class PasswordUserRepository(Repository):
     async def get_by_email(self, email: str) -> Optional[PasswordUser]:
         raise NotImplementedError  # pragma: no cover
 
+    async def get_email_set(self) -> Set[str]:
+        raise NotImplementedError  # pragma: no cover
+
     async def insert(self, entity: PasswordUser) -> ID:
         raise NotImplementedError  # pragma: no cover
 
@@ -1,14 +1,17 @@
-from typing import Any, Generic, List, TypeVar, cast
+import math
+from typing import Generic, List, Optional, TypeVar
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, validator
 from pydantic.generics import GenericModel
 from typing_extensions import Annotated
 
-from server.infrastructure.helpers.pydantic import Computed
-
 T = TypeVar("T")
 
 
+def count_pages(total_items: int, page_size: int) -> int:
+    return math.ceil(total_items / page_size)
+
+
 class Page(BaseModel):
     number: Annotated[int, Field(ge=1, le=10_000)] = 1
     size: Annotated[int, Field(ge=1)] = 10
@@ -21,9 +24,25 @@ class Pagination(GenericModel, Generic[T]):
     items: List[T]
     total_items: int
     page_size: int
-    total_pages: Computed[int] = cast(
-        Any, Field(Computed.Expr("math.ceil(total_items / page_size)"))
-    )
+    total_pages: int = 0  # Computed from other fields.
 
     class Config:
         allow_mutation = False
+
+    @validator("total_pages", always=True)
+    def _compute_total_pages(cls, _: int, values: dict) -> Optional[int]:
+        if "total_items" not in values or "page_size" not in values:
+            return None  # Invalid fields are reported.
+        return count_pages(values["total_items"], values["page_size"])
+
+    @classmethod
+    def build(cls, items: List[T], total_items: int, page_size: int) -> "Pagination[T]":
+        """
+        Build a pagination of `items` without validating them again.
+        """
+        return cls.construct(
+            items=items,
+            total_items=total_items,
+            page_size=page_size,
+            total_pages=count_pages(total_items, page_size),
+        )
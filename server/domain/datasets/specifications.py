@@ -19,3 +19,4 @@ class DatasetSpec:
     tag__id__in: Optional[Sequence[ID]] = None
     license: Optional[str] = None
     include_all_datasets: bool = False
+    id__in: Optional[Sequence[ID]] = None
@@ -5,3 +5,12 @@ from server.seedwork.domain.entities import Entity
 class Tag(Entity):
     id: ID
     name: str
+    usage_count: int = 0  # Number of datasets, maintained by the database.
+
+
+def normalize_tag_name(name: str) -> str:
+    """
+    Tags whose names are equal once normalized are the same tag.
+    NOTE: must match the unique index on tag names.
+    """
+    return " ".join(name.split()).lower()
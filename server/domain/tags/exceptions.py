@@ -1,5 +1,9 @@
-from ..common.exceptions import DoesNotExist
+from ..common.exceptions import AlreadyExists, DoesNotExist
 
 
 class TagDoesNotExist(DoesNotExist):
     entity_name = "Tag"
+
+
+class TagAlreadyExists(AlreadyExists):
+    entity_name = "Tag"
@@ -1,16 +1,29 @@
-from typing import List, Optional
+from typing import Dict, List, Optional, Sequence, Tuple
 
+from server.domain.common.pagination import Page
 from server.domain.common.types import ID, id_factory
 from server.seedwork.domain.repositories import Repository
 
 from .entities import Tag
+from .specifications import TagSpec
 
 
 class TagRepository(Repository):
     def make_id(self) -> ID:
         return id_factory()
 
-    async def get_all(self, *, ids: List[ID] = None) -> List[Tag]:
+    async def get_all(
+        self, *, ids: List[ID] = None, names: Sequence[str] = None
+    ) -> List[Tag]:
+        """
+        Return tags, optionally restricted to the given IDs, or to the given names
+        (compared once normalized).
+        """
+        raise NotImplementedError  # pragma: no cover
+
+    async def get_page(
+        self, *, page: Page = Page(), spec: TagSpec = TagSpec()
+    ) -> Tuple[List[Tag], int]:
         raise NotImplementedError  # pragma: no cover
 
     async def get_by_id(self, id_: ID) -> Optional[Tag]:
@@ -19,8 +32,22 @@ class TagRepository(Repository):
     async def insert(self, entity: Tag) -> ID:
         raise NotImplementedError  # pragma: no cover
 
+    async def get_or_create_by_names(self, names: Sequence[str]) -> Dict[str, ID]:
+        """
+        Return the ID of the tag of each name, creating missing tags.
+        """
+        raise NotImplementedError  # pragma: no cover
+
     async def delete_by_id(self, id_: ID) -> ID:
         raise NotImplementedError  # pragma: no cover
 
     async def delete_many_by_id(self, ids_: List[ID]) -> List[ID]:
         raise NotImplementedError  # pragma: no cover
+
+    async def merge_duplicates(self) -> Tuple[int, int]:
+        """
+        Merge tags whose names are equal once normalized into the most used of them.
+
+        Return the number of tags before merging, and the number of tags removed.
+        """
+        raise NotImplementedError  # pragma: no cover
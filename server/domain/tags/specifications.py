@@ -0,0 +1,14 @@
+import enum
+from dataclasses import dataclass
+from typing import Optional
+
+
+class TagOrdering(enum.Enum):
+    NAME = "name"
+    USAGE = "usage"
+
+
+@dataclass(frozen=True)
+class TagSpec:
+    search_term: Optional[str] = None
+    ordering: TagOrdering = TagOrdering.NAME
@@ -1,7 +1,10 @@
-from typing import Any, Awaitable, Callable, Dict, Type, TypeVar, Union
+import functools
+from typing import Any, Awaitable, Callable, Dict, List, Type, TypeVar, Union
 
+from server.infrastructure.tracing.spans import start_span
 from server.seedwork.application.commands import Command
 from server.seedwork.application.messages import MessageBus
+from server.seedwork.application.middleware import MessageBusMiddleware
 from server.seedwork.application.queries import Query
 
 T = TypeVar("T")
@@ -13,11 +16,21 @@ class MessageBusAdapter(MessageBus):
         self,
         command_handlers: Dict[Type[Command], Callable[..., Awaitable]],
         query_handlers: Dict[Type[Query], Callable[..., Awaitable]],
+        middleware: List[MessageBusMiddleware] = None,
     ) -> None:
         self.command_handlers = command_handlers
         self.query_handlers = query_handlers
 
+        # Outermost middleware comes first.
+        call: Callable[..., Awaitable] = self._handle
+        for item in reversed(middleware or []):
+            call = functools.partial(item, call_next=call)
+        self._call = call
+
     async def execute(self, message: Union[Command[T], Query[T]], **kwargs: Any) -> T:
+        return await self._call(message, **kwargs)
+
+    async def _handle(self, message: Union[Command[T], Query[T]], **kwargs: Any) -> T:
         try:
             if isinstance(message, Command):
                 handler = self.command_handlers[type(message)]
@@ -26,4 +39,5 @@ class MessageBusAdapter(MessageBus):
         except KeyError:
             raise NotImplementedError(f"No handler for {type(message)}")
 
-        return await handler(message, **kwargs)
+        with start_span(handler.__qualname__):
+            return await handler(message, **kwargs)
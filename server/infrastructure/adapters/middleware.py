@@ -0,0 +1,163 @@
+import asyncio
+import datetime as dt
+import time
+from collections import defaultdict
+from typing import Any, Callable, DefaultDict, Dict, List, Set, Tuple, Type
+
+from server.domain.common.datetime import now
+from server.infrastructure.metrics.registry import LatencyHistogram
+from server.infrastructure.tracing.spans import start_span
+from server.seedwork.application.caching import QueryCachePolicy
+from server.seedwork.application.commands import Command
+from server.seedwork.application.middleware import (
+    CallNext,
+    Message,
+    MessageBusMiddleware,
+)
+from server.seedwork.application.queries import Query
+
+
+class MessageTimingMiddleware(MessageBusMiddleware):
+    """
+    Record execution latency of each type of command and query.
+    """
+
+    def __init__(self) -> None:
+        self.histograms: DefaultDict[str, LatencyHistogram] = defaultdict(
+            LatencyHistogram
+        )
+
+    async def __call__(
+        self, message: Message, call_next: CallNext, **kwargs: Any
+    ) -> Any:
+        start = time.perf_counter()
+        try:
+            return await call_next(message, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - start
+            self.histograms[type(message).__name__].observe(elapsed)
+
+
+class MessageTracingMiddleware(MessageBusMiddleware):
+    """
+    Run each command and query in a span of the current trace, if any.
+    """
+
+    async def __call__(
+        self, message: Message, call_next: CallNext, **kwargs: Any
+    ) -> Any:
+        with start_span(f"MessageBus.execute {type(message).__name__}"):
+            return await call_next(message, **kwargs)
+
+
+class QueryCachingMiddleware(MessageBusMiddleware):
+    """
+    Cache results of queries according to their `QueryCachePolicy`.
+
+    Cached results are shared between callers, so they must be treated as read-only.
+    """
+
+    def __init__(
+        self,
+        policies: Dict[Type[Query], QueryCachePolicy],
+        nowfunc: Callable[[], dt.datetime] = now,
+    ) -> None:
+        self._policies = policies
+        self._now = nowfunc
+        self._entries: Dict[Tuple[type, str], Tuple[dt.datetime, Any]] = {}
+        self._versions: DefaultDict[type, int] = defaultdict(int)
+        self._invalidations: DefaultDict[
+            Type[Command], List[Type[Query]]
+        ] = defaultdict(list)
+
+        for query_type, policy in policies.items():
+            for command_type in policy.invalidated_by:
+                self._invalidations[command_type].append(query_type)
+
+        self.hits = 0
+        self.misses = 0
+
+    async def __call__(
+        self, message: Message, call_next: CallNext, **kwargs: Any
+    ) -> Any:
+        if isinstance(message, Command):
+            try:
+                return await call_next(message, **kwargs)
+            finally:
+                # Invalidate even on failure, as some changes may have been made.
+                for query_type in self._invalidations.get(type(message), []):
+                    self.invalidate(query_type)
+
+        policy = self._policies.get(type(message))
+
+        if policy is None or kwargs:
+            return await call_next(message, **kwargs)
+
+        key = (type(message), message.json())
+
+        try:
+            expiry_date, result = self._entries[key]
+        except KeyError:
+            pass
+        else:
+            if self._now() <= expiry_date:
+                self.hits += 1
+                return result
+            del self._entries[key]
+
+        self.misses += 1
+
+        version = self._versions[type(message)]
+        result = await call_next(message, **kwargs)
+
+        # Don't store results that may have been made stale by a concurrent command.
+        if version == self._versions[type(message)]:
+            self._entries[key] = (self._now() + policy.max_age, result)
+
+        return result
+
+    def invalidate(self, query_type: Type[Query]) -> None:
+        self._versions[query_type] += 1
+
+        for key in [key for key in self._entries if key[0] is query_type]:
+            del self._entries[key]
+
+    def clear(self) -> None:
+        for query_type in self._policies:
+            self.invalidate(query_type)
+
+
+class QueryCoalescingMiddleware(MessageBusMiddleware):
+    """
+    Share a single execution between concurrent executions of equal queries
+    (a.k.a. "single-flight"), so that a burst of identical queries results in only
+    one execution of the handler.
+
+    Results are shared between callers, so they must be treated as read-only.
+    """
+
+    def __init__(self, query_types: Set[Type[Query]]) -> None:
+        self._query_types = query_types
+        self._in_flight: Dict[Tuple[type, str], "asyncio.Future[Any]"] = {}
+        self.coalesced = 0
+
+    async def __call__(
+        self, message: Message, call_next: CallNext, **kwargs: Any
+    ) -> Any:
+        if type(message) not in self._query_types or kwargs:
+            return await call_next(message, **kwargs)
+
+        key = (type(message), message.json())
+
+        future = self._in_flight.get(key)
+
+        if future is None:
+            # Run in a separate task, so that cancelling the first caller
+            # does not cancel the execution shared with other callers.
+            future = asyncio.ensure_future(call_next(message))
+            self._in_flight[key] = future
+            future.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        else:
+            self.coalesced += 1
+
+        return await asyncio.shield(future)
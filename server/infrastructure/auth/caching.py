@@ -0,0 +1,150 @@
+import datetime as dt
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Set, Tuple
+
+from server.domain.auth.entities import Account
+from server.domain.common.datetime import now
+from server.domain.common.types import ID
+
+
+class ApiTokenCache:
+    """
+    Keep recently authenticated accounts in memory, by API token hash, so that most
+    authenticated requests don't need to hit the database.
+
+    Entries expire after `max_age`, and the least recently used entries are evicted
+    beyond `max_size` (0: nothing is cached). Repositories must call `invalidate()`
+    when an account changes.
+    """
+
+    def __init__(
+        self,
+        max_age: dt.timedelta,
+        max_size: int = 1024,
+        nowfunc: Callable[[], dt.datetime] = now,
+    ) -> None:
+        self._entries: "OrderedDict[str, Tuple[dt.datetime, Account]]" = OrderedDict()
+        self._api_token_hashes_by_account_id: Dict[ID, str] = {}
+        self._version = 0
+        self._max_age = max_age
+        self._max_size = max_size
+        self._now = nowfunc
+
+    @property
+    def version(self) -> int:
+        """
+        An opaque value that changes each time an account is invalidated.
+        """
+        return self._version
+
+    def get(self, api_token_hash: str) -> Optional[Account]:
+        try:
+            expiry_date, account = self._entries[api_token_hash]
+        except KeyError:
+            return None
+
+        if self._now() > expiry_date:
+            self._remove(api_token_hash)
+            return None
+
+        self._entries.move_to_end(api_token_hash)
+
+        return account
+
+    def set(self, api_token_hash: str, account: Account, *, version: int) -> None:
+        """
+        Store an account read from the database while the cache was at `version`.
+
+        If an account has been invalidated in the meantime, the account may be stale
+        so it is not stored.
+        """
+        if version != self._version or not self._max_size:
+            return
+
+        self._entries[api_token_hash] = (self._now() + self._max_age, account)
+        self._entries.move_to_end(api_token_hash)
+        self._api_token_hashes_by_account_id[account.id] = api_token_hash
+
+        while len(self._entries) > self._max_size:
+            oldest_api_token_hash = next(iter(self._entries))
+            self._remove(oldest_api_token_hash)
+
+    def invalidate(self, account_id: ID) -> None:
+        self._version += 1
+
+        api_token_hash = self._api_token_hashes_by_account_id.get(account_id)
+
+        if api_token_hash is not None:
+            self._remove(api_token_hash)
+
+    def clear(self) -> None:
+        self._version += 1
+        self._entries.clear()
+        self._api_token_hashes_by_account_id.clear()
+
+    def _remove(self, api_token_hash: str) -> None:
+        _, account = self._entries.pop(api_token_hash)
+        self._api_token_hashes_by_account_id.pop(account.id, None)
+
+
+class RejectedApiTokenCache:
+    """
+    Remember hashes of API tokens that recently failed to authenticate, so that
+    repeated attempts can be rejected without querying the database.
+
+    Hashes are kept in two time buckets which rotate every `period` (or earlier when
+    the current bucket is full), so entries live between one and two periods, and at
+    most `2 * max_size` hashes are kept in memory.
+    """
+
+    def __init__(
+        self,
+        period: dt.timedelta,
+        max_size: int = 10000,
+        nowfunc: Callable[[], dt.datetime] = now,
+    ) -> None:
+        self._period = period
+        self._max_size = max_size
+        self._now = nowfunc
+        self._current: Set[str] = set()
+        self._previous: Set[str] = set()
+        self._current_start = self._now()
+        self.hits = 0  # Database lookups avoided.
+        self.misses = 0
+
+    def contains(self, api_token_hash: str) -> bool:
+        self._maybe_rotate()
+
+        if api_token_hash in self._current or api_token_hash in self._previous:
+            self.hits += 1
+            return True
+
+        self.misses += 1
+        return False
+
+    def add(self, api_token_hash: str) -> None:
+        self._maybe_rotate()
+
+        if len(self._current) >= self._max_size:
+            self._rotate()
+
+        self._current.add(api_token_hash)
+
+    def clear(self) -> None:
+        self._current.clear()
+        self._previous.clear()
+
+    def _maybe_rotate(self) -> None:
+        elapsed = self._now() - self._current_start
+
+        if elapsed >= 2 * self._period:
+            self._previous = set()
+            self._current = set()
+            self._current_start = self._now()
+        elif elapsed >= self._period:
+            self._rotate()
+
+    def _rotate(self) -> None:
+        self._previous = self._current
+        self._current = set()
+        self._current_start = self._now()
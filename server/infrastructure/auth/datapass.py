@@ -1,12 +1,13 @@
-from typing import List, TypedDict
+from typing import TYPE_CHECKING, List, Optional, TypedDict
 
-from authlib.common.security import generate_token
-from authlib.integrations.starlette_client import OAuth, StarletteOAuth2App
 from starlette.requests import Request
 from starlette.responses import Response
 
 from server.config.settings import Settings
 
+if TYPE_CHECKING:  # pragma: no cover
+    from authlib.integrations.starlette_client import StarletteOAuth2App
+
 
 class _UserInfoOrganization(TypedDict):
     siret: str
@@ -45,23 +46,38 @@ class DataPassOpenIDClient:
 
 class _AuthlibDataPassOpenIDClient(DataPassOpenIDClient):
     def __init__(self, settings: Settings) -> None:
-        # See: https://docs.authlib.org/en/latest/client/starlette.html#starlette-openid-connect # noqa: E501
-        oauth = OAuth()
-
-        # See: https://github.com/betagouv/api-auth/blob/7fe480f6000ebba4e25b54f01fb0a0ffe595937f/README.md  # noqa: E501
-        oauth.register(
-            name="datapass",
-            client_id=settings.datapass_client_id,
-            client_secret=settings.datapass_client_secret,
-            server_metadata_url=(
-                f"{settings.datapass_url}/.well-known/openid-configuration"
-            ),
-            client_kwargs={"scope": "openid email organizations"},
-        )
+        self._settings = settings
+        self._app_instance: Optional["StarletteOAuth2App"] = None
+
+    @property
+    def _app(self) -> "StarletteOAuth2App":
+        # Authlib (and its HTTP client) is slow to import: only do so on first login.
+        if self._app_instance is None:
+            from authlib.integrations.starlette_client import OAuth
+
+            settings = self._settings
 
-        self._app: StarletteOAuth2App = oauth.datapass
+            # See: https://docs.authlib.org/en/latest/client/starlette.html#starlette-openid-connect # noqa: E501
+            oauth = OAuth()
+
+            # See: https://github.com/betagouv/api-auth/blob/7fe480f6000ebba4e25b54f01fb0a0ffe595937f/README.md  # noqa: E501
+            oauth.register(
+                name="datapass",
+                client_id=settings.datapass_client_id,
+                client_secret=settings.datapass_client_secret,
+                server_metadata_url=(
+                    f"{settings.datapass_url}/.well-known/openid-configuration"
+                ),
+                client_kwargs={"scope": "openid email organizations"},
+            )
+
+            self._app_instance = oauth.datapass
+
+        return self._app_instance
 
     async def authorize_redirect(self, request: Request, callback_uri: str) -> Response:
+        from authlib.common.security import generate_token
+
         return await self._app.authorize_redirect(
             request,
             callback_uri,
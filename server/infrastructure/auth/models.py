@@ -35,6 +35,8 @@ class AccountModel(Base):
     email: str = Column(String, nullable=False, unique=True, index=True)
     role: UserRole = Column(Enum(UserRole, name="user_role_enum"), nullable=False)
     api_token: str = Column(String(API_TOKEN_LENGTH), nullable=False)
+    # Used for authentication lookups. See: hash_api_token().
+    api_token_hash: str = Column(CHAR(64), nullable=False, unique=True, index=True)
 
     password_user: Optional["PasswordUserModel"] = relationship(
         "PasswordUserModel", back_populates="account", uselist=False
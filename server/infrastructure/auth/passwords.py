@@ -1,19 +1,90 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional, TypeVar
+
 import argon2
 import itsdangerous
 from pydantic import SecretStr
 
-from server.application.auth.passwords import PasswordEncoder, Signer
+from server.application.auth.passwords import PasswordEncoder, ProfilingSigner, Signer
 from server.config.settings import Settings
+from server.domain.auth.exceptions import PasswordEncoderBusy
+
+T = TypeVar("T")
 
 
 class Argon2PasswordEncoder(PasswordEncoder):
-    def __init__(self) -> None:
-        self._hasher = argon2.PasswordHasher()
+    """
+    Hash passwords using Argon2 in a bounded thread pool, so that CPU-intensive
+    hashing does not block the event loop. (argon2-cffi releases the GIL.)
+
+    At most `max_pending` operations may be submitted at once, and operations that
+    waited for a worker more than `queue_timeout` seconds are dropped from the queue,
+    without making the caller wait any longer. In both cases, `PasswordEncoderBusy`
+    is raised.
+    """
+
+    def __init__(
+        self,
+        *,
+        time_cost: int = argon2.DEFAULT_TIME_COST,
+        memory_cost: int = argon2.DEFAULT_MEMORY_COST,
+        parallelism: int = argon2.DEFAULT_PARALLELISM,
+        workers: int = 2,
+        max_pending: int = 64,
+        queue_timeout: float = 5,
+    ) -> None:
+        self._hasher = argon2.PasswordHasher(
+            time_cost=time_cost, memory_cost=memory_cost, parallelism=parallelism
+        )
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="argon2"
+        )
+        self._max_pending = max_pending
+        self._queue_timeout = queue_timeout
+        self._pending = 0
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "Argon2PasswordEncoder":
+        return cls(
+            time_cost=settings.argon2_time_cost,
+            memory_cost=settings.argon2_memory_cost,
+            parallelism=settings.argon2_parallelism,
+            workers=settings.password_hashing_workers,
+            max_pending=settings.password_hashing_max_pending,
+            queue_timeout=settings.password_hashing_queue_timeout,
+        )
+
+    async def _run(self, func: Callable[[], T]) -> T:
+        if self._pending >= self._max_pending:
+            raise PasswordEncoderBusy()
+
+        future = self._executor.submit(func)
+        result = asyncio.wrap_future(future)
 
-    def hash(self, password: SecretStr) -> str:
-        return self._hasher.hash(password.get_secret_value())
+        self._pending += 1
+        try:
+            try:
+                # Shield the job, so that it is not cancelled once it has started.
+                return await asyncio.wait_for(
+                    asyncio.shield(result), timeout=self._queue_timeout
+                )
+            except asyncio.TimeoutError:
+                # Drop the job if no worker picked it up yet. Otherwise, it is
+                # being hashed already, so wait for it to finish.
+                if future.cancel():
+                    raise PasswordEncoderBusy()
+                return await result
+        finally:
+            self._pending -= 1
+
+    async def hash(self, password: SecretStr) -> str:
+        return await self._run(lambda: self._hasher.hash(password.get_secret_value()))
 
-    def verify(self, password: SecretStr, hash: str) -> bool:
+    async def verify(self, password: SecretStr, hash: str) -> bool:
+        return await self._run(lambda: self._verify(password, hash))
+
+    def _verify(self, password: SecretStr, hash: str) -> bool:
         try:
             return self._hasher.verify(hash, password.get_secret_value())
         except argon2.exceptions.VerificationError:
@@ -23,11 +94,26 @@ class Argon2PasswordEncoder(PasswordEncoder):
 
 
 class ItsDangerousSigner(Signer):
-    def __init__(self, settings: Settings) -> None:
-        self._signer = itsdangerous.TimestampSigner(settings.secret_key)
+    def __init__(
+        self,
+        settings: Settings,
+        salt: Optional[str] = None,
+        max_age: Optional[int] = None,
+    ) -> None:
+        self._signer = itsdangerous.TimestampSigner(settings.secret_key, salt=salt)
+        self._max_age = max_age
 
     def sign(self, value: str) -> bytes:
         return self._signer.sign(value)
 
     def verify(self, data: bytes) -> bool:
-        return self._signer.validate(data)
+        return self._signer.validate(data, max_age=self._max_age)
+
+
+class ItsDangerousProfilingSigner(ItsDangerousSigner, ProfilingSigner):
+    def __init__(self, settings: Settings) -> None:
+        super().__init__(
+            settings,
+            salt="profiling",
+            max_age=settings.profiling_token_max_age,
+        )
@@ -1,10 +1,11 @@
-from typing import Any, Optional
+from typing import Any, Optional, Set
 
 from sqlalchemy import select
 from sqlalchemy.exc import NoResultFound
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import contains_eager
 
+from server.application.auth.passwords import hash_api_token
 from server.domain.auth.entities import Account, DataPassUser, PasswordUser
 from server.domain.auth.exceptions import AccountDoesNotExist
 from server.domain.auth.repositories import (
@@ -15,6 +16,7 @@ from server.domain.auth.repositories import (
 from server.domain.common.types import ID
 
 from ..database import Database
+from .caching import ApiTokenCache
 from .models import AccountModel, DataPassUserModel, PasswordUserModel
 from .transformers import (
     make_account_entity,
@@ -28,8 +30,9 @@ from .transformers import (
 
 
 class SqlAccountRepository(AccountRepository):
-    def __init__(self, db: Database) -> None:
+    def __init__(self, db: Database, token_cache: ApiTokenCache) -> None:
         self._db = db
+        self._token_cache = token_cache
 
     async def _maybe_get_by(
         self, session: AsyncSession, *whereclauses: Any
@@ -46,13 +49,26 @@ class SqlAccountRepository(AccountRepository):
             return make_account_entity(instance)
 
     async def get_by_api_token(self, api_token: str) -> Optional[Account]:
+        api_token_hash = hash_api_token(api_token)
+
+        account = self._token_cache.get(api_token_hash)
+
+        if account is not None:
+            return account
+
+        version = self._token_cache.version
+
         async with self._db.session() as session:
             instance = await self._maybe_get_by(
-                session, AccountModel.api_token == api_token
+                session, AccountModel.api_token_hash == api_token_hash
             )
             if instance is None:
                 return None
-            return make_account_entity(instance)
+            account = make_account_entity(instance)
+
+        self._token_cache.set(api_token_hash, account, version=version)
+
+        return account
 
     async def insert(self, account: Account) -> ID:
         async with self._db.session() as session:
@@ -66,8 +82,9 @@ class SqlAccountRepository(AccountRepository):
 
 
 class SqlPasswordUserRepository(PasswordUserRepository):
-    def __init__(self, db: Database) -> None:
+    def __init__(self, db: Database, token_cache: ApiTokenCache) -> None:
         self._db = db
+        self._token_cache = token_cache
 
     async def _maybe_get_by(
         self, session: AsyncSession, *whereclauses: Any
@@ -93,6 +110,12 @@ class SqlPasswordUserRepository(PasswordUserRepository):
 
             return make_password_user_entity(instance)
 
+    async def get_email_set(self) -> Set[str]:
+        async with self._db.session() as session:
+            stmt = select(AccountModel.email).join(PasswordUserModel)
+            result = await session.execute(stmt)
+            return set(result.scalars())
+
     async def insert(self, entity: PasswordUser) -> ID:
         async with self._db.session() as session:
             instance = make_password_user_instance(entity)
@@ -116,6 +139,8 @@ class SqlPasswordUserRepository(PasswordUserRepository):
 
             await session.commit()
 
+        self._token_cache.invalidate(entity.account_id)
+
     async def delete(self, account_id: ID) -> None:
         async with self._db.session() as session:
             instance = await self._maybe_get_by(
@@ -128,6 +153,8 @@ class SqlPasswordUserRepository(PasswordUserRepository):
             await session.delete(instance)
             await session.commit()
 
+        self._token_cache.invalidate(account_id)
+
 
 class SqlDataPassUserRepository(DataPassUserRepository):
     def __init__(self, db: Database) -> None:
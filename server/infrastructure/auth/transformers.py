@@ -1,3 +1,4 @@
+from server.application.auth.passwords import hash_api_token
 from server.domain.auth.entities import Account, DataPassUser, PasswordUser
 
 from .models import AccountModel, DataPassUserModel, PasswordUserModel
@@ -10,6 +11,7 @@ def make_account_instance(entity: Account) -> AccountModel:
         email=entity.email,
         role=entity.role,
         api_token=entity.api_token,
+        api_token_hash=hash_api_token(entity.api_token),
     )
 
 
@@ -43,7 +45,9 @@ def update_instance(instance: PasswordUserModel, entity: PasswordUser) -> None:
         setattr(instance, field, getattr(entity, field))
 
     for field in set(Account.__fields__) - {"id"}:
-        setattr(instance, field, getattr(entity.account, field))
+        setattr(instance.account, field, getattr(entity.account, field))
+
+    instance.account.api_token_hash = hash_api_token(entity.account.api_token)
 
 
 def make_datapass_user_instance(entity: DataPassUser) -> DataPassUserModel:
@@ -1,14 +1,15 @@
 from server.domain.catalog_records.entities import CatalogRecord
+from server.seedwork.domain.construction import construct_from
 
 from ..organizations.transformers import make_entity as make_organization_entity
 from .models import CatalogRecordModel
 
 
 def make_entity(instance: CatalogRecordModel) -> CatalogRecord:
-    return CatalogRecord(
-        id=instance.id,
+    return construct_from(
+        CatalogRecord,
+        instance,
         organization=make_organization_entity(instance.catalog.organization),
-        created_at=instance.created_at,
     )
 
 
@@ -19,27 +19,41 @@ class ExportCache:
     def __init__(
         self, max_age: dt.timedelta, nowfunc: Callable[[], dt.datetime] = now
     ) -> None:
-        self._exports: Dict[str, Tuple[dt.datetime, str]] = {}
+        # Siret -> (expiry date, content, size in bytes)
+        self._exports: Dict[str, Tuple[dt.datetime, str, int]] = {}
         self._max_age = max_age
         self._cache_control = f"max-age={int(self._max_age.total_seconds())}"
         self._now = nowfunc
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def size_bytes(self) -> int:
+        return sum(size for _, _, size in self._exports.values())
 
     def get(self, siret: Siret) -> Optional[str]:
         try:
-            expiry_date, content = self._exports[siret]
+            expiry_date, content, _ = self._exports[siret]
         except KeyError:
+            self.misses += 1
             return None
 
         is_stale = self._now() > expiry_date
 
         if is_stale:
             del self._exports[siret]
+            self.misses += 1
             return None
 
+        self.hits += 1
         return content
 
     def set(self, siret: Siret, content: str) -> None:
-        self._exports[siret] = (self._now() + self._max_age, content)
+        size = len(content.encode())
+        self._exports[siret] = (self._now() + self._max_age, content, size)
+
+    def clear(self) -> None:
+        self._exports.clear()
 
     @property
     def hit_headers(self) -> dict:
@@ -1,3 +1,5 @@
+import datetime as dt
+
 from server.application.catalogs.commands import CreateCatalog
 from server.application.catalogs.handlers import (
     create_catalog,
@@ -10,6 +12,8 @@ from server.application.catalogs.queries import (
     GetCatalogBySiret,
     GetCatalogExport,
 )
+from server.application.organizations.commands import CreateOrganization
+from server.seedwork.application.caching import QueryCachePolicy
 from server.seedwork.application.modules import Module
 
 
@@ -23,3 +27,12 @@ class CatalogsModule(Module):
         GetAllCatalogs: get_all_catalogs,
         GetCatalogExport: get_catalog_export,
     }
+
+    coalesced_queries = {GetCatalogExport}
+
+    cached_queries = {
+        GetAllCatalogs: QueryCachePolicy(
+            max_age=dt.timedelta(minutes=5),
+            invalidated_by=[CreateCatalog, CreateOrganization],
+        ),
+    }
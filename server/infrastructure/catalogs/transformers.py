@@ -5,13 +5,16 @@ from server.domain.catalogs.entities import (
     parse_extra_field,
 )
 from server.domain.common.types import ID
+from server.seedwork.domain.construction import construct_from
 
 from ..organizations.transformers import make_entity as make_organization_entity
 from .models import CatalogModel, ExtraFieldModel, ExtraFieldValueModel
 
 
 def make_entity(instance: CatalogModel) -> Catalog:
-    return Catalog(
+    return construct_from(
+        Catalog,
+        instance,
         organization=make_organization_entity(instance.organization),
         extra_fields=[
             _make_extra_field_entity(extra_field_instance)
@@ -53,10 +56,7 @@ def _make_extra_field_entity(instance: ExtraFieldModel) -> ExtraField:
 
 
 def make_extra_field_value_entity(instance: ExtraFieldValueModel) -> ExtraFieldValue:
-    return ExtraFieldValue(
-        extra_field_id=instance.extra_field_id,
-        value=instance.value,
-    )
+    return construct_from(ExtraFieldValue, instance)
 
 
 def make_extra_field_value_instance(
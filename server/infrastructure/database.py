@@ -1,8 +1,10 @@
-from contextlib import asynccontextmanager
-from typing import AsyncIterator
+import asyncio
+from contextlib import AsyncExitStack, asynccontextmanager
+from typing import AsyncIterator, Callable, List, Optional
 
 from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
 from sqlalchemy.orm import DeclarativeMeta, registry, sessionmaker
+from sqlalchemy.pool import QueuePool
 
 mapper_registry = registry()
 
@@ -22,26 +24,75 @@ class Base(metaclass=DeclarativeMeta):
 
 
 class Database:
+    """
+    The engine is created on first use, so that entrypoints that don't query the
+    database (and each worker process, until it does) start faster.
+    """
+
     def __init__(self, url: str, debug: bool = False) -> None:
-        self._engine = create_async_engine(url, future=True)
-        self._session_cls = sessionmaker(
-            bind=self._engine, class_=AsyncSession, future=True
-        )
+        self._url = url
+        self._engine: Optional[AsyncEngine] = None
+        self._engine_hooks: List[Callable[[AsyncEngine], None]] = []
+        self._session_cls = sessionmaker(class_=AsyncSession, future=True)
+
+    def on_engine_created(self, hook: Callable[[AsyncEngine], None]) -> None:
+        """
+        Call `hook` with the engine once it is created, e.g. to instrument it.
+        """
+        self._engine_hooks.append(hook)
+
+        if self._engine is not None:
+            hook(self._engine)
+
+    @property
+    def has_engine(self) -> bool:
+        return self._engine is not None
 
     @property
     def engine(self) -> AsyncEngine:
+        if self._engine is None:
+            self._engine = create_async_engine(self._url, future=True)
+            self._session_cls.configure(bind=self._engine)
+
+            for hook in self._engine_hooks:
+                hook(self._engine)
+
         return self._engine
 
+    async def warm_up(self, connections: int) -> None:
+        """
+        Open up to `connections` connections (at most the pool size), so that they
+        are readily available in the pool.
+        """
+        pool = self.engine.sync_engine.pool
+        size = pool.size() if isinstance(pool, QueuePool) else 1
+        n = min(connections, size)
+
+        if n <= 0:
+            return
+
+        async with AsyncExitStack() as stack:
+            conns = await asyncio.gather(
+                *(stack.enter_async_context(self.engine.connect()) for _ in range(n))
+            )
+            for conn in conns:
+                await conn.exec_driver_sql("SELECT 1")
+
+    async def dispose(self) -> None:
+        if self._engine is not None:
+            await self._engine.dispose()
+
     def session(self) -> AsyncSession:
+        self.engine  # Ensure sessions are bound.
         return self._session_cls()
 
     @asynccontextmanager
     async def autorollback(self) -> AsyncIterator[None]:
-        async with self._engine.connect() as conn:
+        async with self.engine.connect() as conn:
             self._session_cls.configure(bind=conn)
             try:
                 async with conn.begin() as tx:
                     yield
                     await tx.rollback()
             finally:
-                self._session_cls.configure(bind=self._engine)
+                self._session_cls.configure(bind=self.engine)
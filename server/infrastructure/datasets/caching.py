@@ -0,0 +1,81 @@
+import datetime as dt
+import hashlib
+from typing import Callable, Optional, Tuple
+
+from server.application.datasets.caching import (
+    CachedDatasetFilters,
+    DatasetFiltersCache,
+)
+from server.application.datasets.views import DatasetFiltersView
+from server.domain.common.datetime import now
+
+
+def _make_entry(filters: DatasetFiltersView) -> CachedDatasetFilters:
+    content = filters.json()
+    etag = '"%s"' % hashlib.sha256(content.encode()).hexdigest()[:32]
+    return CachedDatasetFilters(filters=filters, content=content, etag=etag)
+
+
+class InMemoryDatasetFiltersCache(DatasetFiltersCache):
+    """
+    Keep dataset filters in process memory.
+
+    Entries are invalidated by writes made through this process, and expire after
+    `max_age` so that writes made by other processes (e.g. tools) are eventually seen.
+    """
+
+    def __init__(
+        self, max_age: dt.timedelta, nowfunc: Callable[[], dt.datetime] = now
+    ) -> None:
+        self._entry: Optional[Tuple[dt.datetime, CachedDatasetFilters]] = None
+        self._version = 0
+        self._max_age = max_age
+        self._now = nowfunc
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def get(self) -> Optional[CachedDatasetFilters]:
+        if self._entry is None:
+            return None
+
+        expiry_date, entry = self._entry
+
+        if self._now() > expiry_date:
+            self._entry = None
+            return None
+
+        return entry
+
+    def set(self, filters: DatasetFiltersView, *, version: int) -> CachedDatasetFilters:
+        entry = _make_entry(filters)
+
+        if version == self._version:
+            self._entry = (self._now() + self._max_age, entry)
+
+        return entry
+
+    def invalidate(self) -> None:
+        self._version += 1
+        self._entry = None
+
+
+class NoDatasetFiltersCache(DatasetFiltersCache):
+    """
+    Don't store dataset filters, e.g. when invalidations can't reach all processes
+    which would hold a copy.
+    """
+
+    @property
+    def version(self) -> int:
+        return 0
+
+    def get(self) -> Optional[CachedDatasetFilters]:
+        return None
+
+    def set(self, filters: DatasetFiltersView, *, version: int) -> CachedDatasetFilters:
+        return _make_entry(filters)
+
+    def invalidate(self) -> None:
+        pass
@@ -9,6 +9,7 @@ from sqlalchemy import (
     ForeignKey,
     Index,
     Integer,
+    PrimaryKeyConstraint,
     String,
     Table,
 )
@@ -106,3 +107,31 @@ class DatasetModel(Base):
             postgresql_using="GIN",
         ),
     )
+
+
+# Columns of the 'dataset' table whose distinct values are tracked in
+# 'dataset_facet_value'. The facet name is the column name.
+# NOTE: must match the 'dataset_facet_value_*' triggers (see migrations).
+DATASET_FACETS = ["geographical_coverage", "service", "technical_source", "license"]
+
+
+class DatasetFacetValueModel(Base):
+    """
+    Summary of values used by datasets for filterable fields, with usage counts.
+
+    This table is maintained by database triggers on the `dataset` table
+    (see migrations `e3b6a1f4c2d7` and `fc5549be47f4`). It must not be written to
+    by the application. Values used by no dataset are removed.
+
+    Triggers lock changed values in (facet, value) order, so concurrent writes
+    do not deadlock. But they stay locked until the end of the transaction:
+    writes to datasets which share a value wait on each other.
+    """
+
+    __tablename__ = "dataset_facet_value"
+
+    facet = Column(String, nullable=False)
+    value = Column(String, nullable=False)
+    usage_count = Column(Integer, nullable=False)
+
+    __table_args__ = (PrimaryKeyConstraint(facet, value),)
@@ -31,3 +31,5 @@ class DatasetsModule(Module):
         GetDatasetByID: get_dataset_by_id,
         GetDatasetFilters: get_dataset_filters,
     }
+
+    coalesced_queries = {GetAllDatasets, GetDatasetFilters}
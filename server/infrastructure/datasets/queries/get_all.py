@@ -65,6 +65,9 @@ class GetAllQuery:
             # Sort rows by search rank, best match first.
             orderbyclauses.append(desc(text("rank")))
 
+        if (ids := spec.id__in) is not None:
+            whereclauses.append(DatasetModel.id.in_(ids))
+
         if isinstance(account, Skip):
             if organization_siret := spec.organization_siret:
                 whereclauses.append(
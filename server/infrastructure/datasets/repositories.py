@@ -16,8 +16,13 @@ from ..catalog_records.raw_queries import get_catalog_record_instance_by_id
 from ..catalogs.models import CatalogModel
 from ..database import Database
 from ..helpers.sqlalchemy import get_count_from, to_limit_offset
-from ..tags.raw_queries import get_all_tag_instances_by_ids
-from .models import DatasetModel
+from ..metrics.request_stats import add_request_context
+from ..tags.raw_queries import (
+    get_all_tag_instances_by_ids,
+    lock_tag_instances_by_ids,
+)
+from ..tracing.spans import traced
+from .models import DatasetFacetValueModel, DatasetModel
 from .queries.get_all import GetAllQuery
 from .raw_queries import get_all_dataformat_instances
 from .transformers import make_entity, make_instance, update_instance
@@ -27,6 +32,7 @@ class SqlDatasetRepository(DatasetRepository):
     def __init__(self, db: Database) -> None:
         self._db = db
 
+    @traced()
     async def get_all(
         self,
         *,
@@ -35,6 +41,8 @@ class SqlDatasetRepository(DatasetRepository):
         spec: DatasetSpec = DatasetSpec(),
     ) -> Tuple[List[Tuple[Dataset, DatasetGetAllExtras]], int]:
 
+        add_request_context(dataset_spec=spec)
+
         async with self._db.session() as session:
             query = GetAllQuery(spec, account=account)
             stmt = query.statement
@@ -84,33 +92,27 @@ class SqlDatasetRepository(DatasetRepository):
 
             return make_entity(instance)
 
-    async def get_geographical_coverage_set(self) -> Set[str]:
+    async def _get_facet_value_set(self, facet: str) -> Set[str]:
+        # Read from the summary table maintained by triggers, rather than scanning
+        # the whole 'dataset' table with a SELECT DISTINCT.
         async with self._db.session() as session:
-            stmt = select(DatasetModel.geographical_coverage.distinct())
+            stmt = select(DatasetFacetValueModel.value).where(
+                DatasetFacetValueModel.facet == facet
+            )
             result = await session.execute(stmt)
             return set(result.scalars())
 
+    async def get_geographical_coverage_set(self) -> Set[str]:
+        return await self._get_facet_value_set("geographical_coverage")
+
     async def get_service_set(self) -> Set[str]:
-        async with self._db.session() as session:
-            stmt = select(DatasetModel.service.distinct())
-            result = await session.execute(stmt)
-            return set(result.scalars())
+        return await self._get_facet_value_set("service")
 
     async def get_technical_source_set(self) -> Set[str]:
-        async with self._db.session() as session:
-            stmt = select(DatasetModel.technical_source.distinct()).where(
-                DatasetModel.technical_source.is_not(None)
-            )
-            result = await session.execute(stmt)
-            return set(result.scalars())
+        return await self._get_facet_value_set("technical_source")
 
     async def get_license_set(self) -> Set[str]:
-        async with self._db.session() as session:
-            stmt = select(DatasetModel.license.distinct()).where(
-                DatasetModel.license.is_not(None)
-            )
-            result = await session.execute(stmt)
-            return set(result.scalars())
+        return await self._get_facet_value_set("license")
 
     async def insert(self, entity: Dataset) -> ID:
         async with self._db.session() as session:
@@ -119,9 +121,9 @@ class SqlDatasetRepository(DatasetRepository):
                     session, entity.catalog_record.id
                 )
                 formats = await get_all_dataformat_instances(session, entity.formats)
-                tags = await get_all_tag_instances_by_ids(
-                    session, [tag.id for tag in entity.tags]
-                )
+                tag_ids = [tag.id for tag in entity.tags]
+                await lock_tag_instances_by_ids(session, tag_ids)
+                tags = await get_all_tag_instances_by_ids(session, tag_ids)
                 instance = make_instance(entity, catalog_record, formats, tags)
 
                 session.add(instance)
@@ -139,9 +141,11 @@ class SqlDatasetRepository(DatasetRepository):
                     return
 
                 formats = await get_all_dataformat_instances(session, entity.formats)
-                tags = await get_all_tag_instances_by_ids(
-                    session, [tag.id for tag in entity.tags]
+                tag_ids = [tag.id for tag in entity.tags]
+                await lock_tag_instances_by_ids(
+                    session, [*(ID(tag.id) for tag in instance.tags), *tag_ids]
                 )
+                tags = await get_all_tag_instances_by_ids(session, tag_ids)
                 update_instance(instance, entity, formats, tags)
 
     async def delete(self, id: ID) -> None:
@@ -151,6 +155,9 @@ class SqlDatasetRepository(DatasetRepository):
             if instance is None:
                 return
 
+            await lock_tag_instances_by_ids(
+                session, [ID(tag.id) for tag in instance.tags]
+            )
             await session.delete(instance)
 
             await session.commit()
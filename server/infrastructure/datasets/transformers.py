@@ -1,6 +1,7 @@
 from typing import List
 
 from server.domain.datasets.entities import Dataset
+from server.seedwork.domain.construction import construct_from
 
 from ..catalog_records.models import CatalogRecordModel
 from ..catalog_records.transformers import make_entity as make_catalog_record_entity
@@ -14,24 +15,18 @@ from .models import DataFormatModel, DatasetModel
 
 
 def make_entity(instance: DatasetModel) -> Dataset:
-    kwargs: dict = {
-        "catalog_record": make_catalog_record_entity(instance.catalog_record),
-        "formats": [fmt.name for fmt in instance.formats],
-        "tags": [make_tag_entity(tag) for tag in instance.tags],
-        "extra_field_values": [
+    return construct_from(
+        Dataset,
+        instance,
+        catalog_record=make_catalog_record_entity(instance.catalog_record),
+        formats=[fmt.name for fmt in instance.formats],
+        tags=[make_tag_entity(tag) for tag in instance.tags],
+        extra_field_values=[
             make_extra_field_value_entity(value)
             for value in instance.extra_field_values
         ],
-    }
-
-    kwargs.update(
-        (field, getattr(instance, field))
-        for field in Dataset.__fields__
-        if field not in kwargs
     )
 
-    return Dataset(**kwargs)
-
 
 def make_instance(
     entity: Dataset,
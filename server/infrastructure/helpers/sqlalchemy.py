@@ -5,6 +5,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.sql import Select
 
 from server.domain.common.pagination import Page
+from server.infrastructure.tracing.spans import traced
 
 
 def to_limit_offset(page: Page) -> Tuple[int, int]:
@@ -13,6 +14,7 @@ def to_limit_offset(page: Page) -> Tuple[int, int]:
     return limit, offset
 
 
+@traced()
 async def get_count_from(stmt: Select, session: AsyncSession) -> int:
     count_stmt = select(func.count()).select_from(stmt.subquery())
     result = await session.execute(count_stmt)
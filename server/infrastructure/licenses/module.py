@@ -1,5 +1,13 @@
+import datetime as dt
+
+from server.application.datasets.commands import (
+    CreateDataset,
+    DeleteDataset,
+    UpdateDataset,
+)
 from server.application.licenses.handlers import get_license_set
 from server.application.licenses.queries import GetLicenseSet
+from server.seedwork.application.caching import QueryCachePolicy
 from server.seedwork.application.modules import Module
 
 
@@ -7,3 +15,10 @@ class LicensesModule(Module):
     query_handlers = {
         GetLicenseSet: get_license_set,
     }
+
+    cached_queries = {
+        GetLicenseSet: QueryCachePolicy(
+            max_age=dt.timedelta(minutes=5),
+            invalidated_by=[CreateDataset, UpdateDataset, DeleteDataset],
+        ),
+    }
@@ -0,0 +1,70 @@
+import asyncio
+import enum
+import logging
+from typing import Awaitable, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class LifecycleState(str, enum.Enum):
+    STARTING = "starting"
+    READY = "ready"
+    DRAINING = "draining"
+
+
+class Lifecycle:
+    """
+    Track the state of this process, as reported by the readiness endpoint: it
+    should only receive traffic once warmed up, and not anymore while draining.
+    """
+
+    def __init__(self) -> None:
+        self.state = LifecycleState.STARTING
+        self._warm_up_task: Optional["asyncio.Task[None]"] = None
+
+    @property
+    def is_ready(self) -> bool:
+        return self.state == LifecycleState.READY
+
+    async def warm_up(
+        self, func: Callable[[], Awaitable[None]], timeout: float
+    ) -> None:
+        """
+        Run `func`, then become ready.
+
+        Waits at most `timeout` seconds: past that, warm-up goes on in the background
+        so that startup is not held back indefinitely.
+        """
+        self._warm_up_task = asyncio.ensure_future(self._run_warm_up(func))
+
+        try:
+            await asyncio.wait_for(asyncio.shield(self._warm_up_task), timeout)
+        except asyncio.TimeoutError:
+            logger.warning(
+                "Warm-up is taking more than %ss, continuing in the background",
+                timeout,
+            )
+
+    async def _run_warm_up(self, func: Callable[[], Awaitable[None]]) -> None:
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+
+        try:
+            await func()
+        except Exception:
+            # Requests may still succeed: don't keep the process out of service.
+            logger.exception("Warm-up failed")
+        else:
+            logger.info("Warm-up completed in %.2fs", loop.time() - start)
+
+        if self.state == LifecycleState.STARTING:
+            self.state = LifecycleState.READY
+
+    def drain(self) -> None:
+        """
+        Stop being ready, as the process is about to stop serving requests.
+        """
+        self.state = LifecycleState.DRAINING
+
+        if self._warm_up_task is not None:
+            self._warm_up_task.cancel()
@@ -1,6 +1,20 @@
 from server.config.settings import Settings
 
 
+def _get_stream_handler_config(settings: Settings) -> dict:
+    if settings.log_queue_size > 0:
+        return {
+            "class": "server.infrastructure.logging.handlers.QueueStreamHandler",
+            "max_size": settings.log_queue_size,
+            "stream": "ext://sys.stdout",
+        }
+
+    return {
+        "class": "logging.StreamHandler",
+        "stream": "ext://sys.stdout",
+    }
+
+
 def get_log_config(settings: Settings) -> dict:
     return {
         "version": 1,
@@ -14,13 +28,34 @@ def get_log_config(settings: Settings) -> dict:
                 "()": "server.infrastructure.logging.formatters.JsonFormatter",
                 "format": "%(asctime)s %(levelname)s %(name)s %(message)s",
             },
+            "access_json": {
+                "()": "server.infrastructure.logging.formatters.AccessJsonFormatter",
+                "format": "%(asctime)s %(levelname)s %(name)s %(message)s",
+            },
+        },
+        "filters": {
+            "access_sampling": {
+                "()": "server.infrastructure.logging.filters.AccessLogSamplingFilter",
+                "max_rate": settings.access_log_max_rate,
+            },
+            "request_stats": {
+                "()": "server.infrastructure.metrics.request_stats.RequestStatsLogFilter",  # noqa: E501
+            },
         },
         "handlers": {
             "default": {
+                **_get_stream_handler_config(settings),
                 "level": "DEBUG",
-                "class": "logging.StreamHandler",
                 "formatter": "console" if settings.server_mode == "local" else "json",
-                "stream": "ext://sys.stdout",
+            },
+            "access": {
+                **_get_stream_handler_config(settings),
+                "level": "DEBUG",
+                "formatter": (
+                    "console" if settings.server_mode == "local" else "access_json"
+                ),
+                # Filters run when the record is logged, even in queue mode.
+                "filters": ["access_sampling", "request_stats"],
             },
         },
         "loggers": {
@@ -39,7 +74,7 @@ def get_log_config(settings: Settings) -> dict:
                 "propagate": False,
             },
             "uvicorn.access": {
-                "handlers": ["default"],
+                "handlers": ["access"],
                 "level": "INFO",
                 "propagate": False,
             },
@@ -0,0 +1,51 @@
+import logging
+import time
+import weakref
+from typing import Callable
+
+
+class AccessLogSamplingFilter(logging.Filter):
+    """
+    Keep at most `max_rate` access log records per second, so that logging does not
+    become a bottleneck at high request rates. Error responses are always kept.
+
+    Skipped records are counted in `sampled_out`.
+    """
+
+    instances: "weakref.WeakSet[AccessLogSamplingFilter]" = weakref.WeakSet()
+
+    def __init__(
+        self, max_rate: int = 0, clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        super().__init__()
+        self.sampled_out = 0
+        self._max_rate = max_rate
+        self._clock = clock
+        self._window = 0
+        self._count = 0
+        AccessLogSamplingFilter.instances.add(self)
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if self._max_rate <= 0:
+            return True
+
+        window = int(self._clock())
+
+        if window != self._window:
+            self._window = window
+            self._count = 0
+
+        self._count += 1
+
+        if self._count <= self._max_rate:
+            return True
+
+        # Comes from Uvicorn's access_logger.info(<message>, *args)
+        args = record.args
+        status_code = args[-1] if isinstance(args, tuple) and args else None
+
+        if isinstance(status_code, int) and status_code >= 500:
+            return True
+
+        self.sampled_out += 1
+        return False
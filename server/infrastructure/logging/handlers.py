@@ -0,0 +1,91 @@
+import logging
+import logging.handlers
+import os
+import queue
+import weakref
+from typing import IO, Optional
+
+
+class QueueStreamHandler(logging.handlers.QueueHandler):
+    """
+    A stream handler which formats and writes records in a background thread, so
+    that logging does not block the event loop (e.g. if the stdout pipe stalls).
+
+    At most `max_size` records are kept in memory: further records are dropped
+    and counted in `dropped`.
+
+    Filters still run in the logging thread, so they may use context variables.
+    Records are formatted later, so arguments must not be mutated after logging.
+    """
+
+    instances: "weakref.WeakSet[QueueStreamHandler]" = weakref.WeakSet()
+
+    def __init__(self, stream: Optional[IO[str]] = None, max_size: int = 10000) -> None:
+        self._queue: "queue.Queue[logging.LogRecord]" = queue.Queue(max_size)
+        super().__init__(self._queue)
+        self.dropped = 0
+        self._max_size = max_size
+        self._target = logging.StreamHandler(stream)
+        self._listener: Optional[logging.handlers.QueueListener] = None
+        self._pid: Optional[int] = None
+        QueueStreamHandler.instances.add(self)
+
+    def setFormatter(self, fmt: Optional[logging.Formatter]) -> None:
+        super().setFormatter(fmt)
+        self._target.setFormatter(fmt)
+
+    def _ensure_listener(self) -> None:
+        # emit() may be called from any thread: make sure only one listener starts.
+        with self.lock:  # type: ignore
+            pid = os.getpid()
+
+            if self._listener is not None and self._pid == pid:
+                return
+
+            if self._pid is not None and self._pid != pid:
+                # Forked: the listener thread was not copied, nor should pending
+                # records.
+                self._queue = self.queue = queue.Queue(self._max_size)
+
+            self._pid = pid
+            self._listener = logging.handlers.QueueListener(self._queue, self._target)
+            self._listener.start()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Records stay in this process, so there is no need to format them eagerly.
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self._ensure_listener()
+        super().emit(record)
+
+    def flush(self, timeout: float = 1.0) -> None:
+        """
+        Wait (up to `timeout` seconds) for pending records to be written.
+        """
+        if self._listener is not None and self._pid == os.getpid():
+            q = self._queue
+            with q.all_tasks_done:
+                q.all_tasks_done.wait_for(lambda: not q.unfinished_tasks, timeout)
+
+        self._target.flush()
+
+    def close(self) -> None:
+        with self.lock:  # type: ignore
+            if self._listener is not None and self._pid == os.getpid():
+                self.flush()
+                try:
+                    self._listener.stop()
+                except queue.Full:  # pragma: no cover
+                    pass
+            self._listener = None
+
+        QueueStreamHandler.instances.discard(self)
+        self._target.close()
+        super().close()
@@ -0,0 +1,132 @@
+import os
+from typing import Dict, Iterator
+
+from sqlalchemy.pool import QueuePool
+
+from ..adapters.middleware import (
+    MessageTimingMiddleware,
+    QueryCachingMiddleware,
+    QueryCoalescingMiddleware,
+)
+from ..auth.caching import RejectedApiTokenCache
+from ..catalogs.caching import ExportCache
+from ..database import Database
+from ..logging.filters import AccessLogSamplingFilter
+from ..logging.handlers import QueueStreamHandler
+from .registry import MetricFamily
+
+
+def process_labels() -> Dict[str, str]:
+    # In live mode, each worker process has its own metrics, and scrapes are served
+    # by any of them: series of each worker must be kept apart, or counters would
+    # appear to be reset between scrapes.
+    return {"pid": str(os.getpid())}
+
+
+def collect_process() -> Iterator[MetricFamily]:
+    yield MetricFamily(
+        "process_info", "gauge", "Identifies the process serving the metrics."
+    ).add(1)
+
+
+def collect_pool(db: Database) -> Iterator[MetricFamily]:
+    if not db.has_engine:
+        # Not used yet by this process: don't create the engine just for this.
+        return
+
+    pool = db.engine.sync_engine.pool
+
+    if not isinstance(pool, QueuePool):  # pragma: no cover
+        return
+
+    yield MetricFamily(
+        "db_pool_size", "gauge", "Configured size of the connection pool."
+    ).add(pool.size())
+
+    yield MetricFamily(
+        "db_pool_checked_out",
+        "gauge",
+        "Number of connections currently in use.",
+    ).add(pool.checkedout())
+
+    yield MetricFamily(
+        "db_pool_overflow",
+        "gauge",
+        "Number of connections opened beyond the pool size.",
+    ).add(max(pool.overflow(), 0))
+
+
+def collect_export_cache(cache: ExportCache) -> Iterator[MetricFamily]:
+    yield MetricFamily(
+        "export_cache_hits_total", "counter", "Number of catalog exports served."
+    ).add(cache.hits)
+
+    yield MetricFamily(
+        "export_cache_misses_total",
+        "counter",
+        "Number of catalog exports that had to be generated.",
+    ).add(cache.misses)
+
+    yield MetricFamily(
+        "export_cache_size_bytes", "gauge", "Size of cached catalog exports."
+    ).add(cache.size_bytes)
+
+
+def collect_message_bus(
+    timing: MessageTimingMiddleware,
+    caching: QueryCachingMiddleware,
+    coalescing: QueryCoalescingMiddleware,
+) -> Iterator[MetricFamily]:
+    family = MetricFamily(
+        "bus_message_duration_seconds",
+        "histogram",
+        "Duration of commands and queries executed by the message bus.",
+    )
+
+    for message_type, histogram in sorted(timing.histograms.items()):
+        family.add_histogram(histogram, {"message": message_type})
+
+    yield family
+
+    yield MetricFamily(
+        "bus_query_cache_hits_total", "counter", "Number of cached query results used."
+    ).add(caching.hits)
+
+    yield MetricFamily(
+        "bus_query_cache_misses_total",
+        "counter",
+        "Number of cacheable queries that had to be executed.",
+    ).add(caching.misses)
+
+    yield MetricFamily(
+        "bus_query_coalesced_total",
+        "counter",
+        "Number of queries that shared an execution already in progress.",
+    ).add(coalescing.coalesced)
+
+
+def collect_rejected_api_tokens(cache: RejectedApiTokenCache) -> Iterator[MetricFamily]:
+    yield MetricFamily(
+        "auth_rejected_token_hits_total",
+        "counter",
+        "Number of database lookups avoided for recently rejected API tokens.",
+    ).add(cache.hits)
+
+
+def collect_logging() -> Iterator[MetricFamily]:
+    dropped = MetricFamily(
+        "log_records_dropped_total",
+        "counter",
+        "Number of log records dropped because the logging queue was full.",
+    )
+
+    for handler in list(QueueStreamHandler.instances):
+        dropped.add(handler.dropped, {"handler": handler.name or ""})
+
+    yield dropped
+
+    yield MetricFamily(
+        "access_log_sampled_out_total",
+        "counter",
+        "Number of access log records skipped due to the access log rate limit.",
+    ).add(sum(f.sampled_out for f in list(AccessLogSamplingFilter.instances)))
@@ -0,0 +1,41 @@
+from collections import defaultdict
+from typing import DefaultDict, Iterator, Tuple
+
+from .registry import LatencyHistogram, MetricFamily
+
+
+class HttpMetrics:
+    """
+    Record HTTP request latencies, by method, route template and status code.
+
+    Route templates (e.g. `/datasets/{id}/`) are used instead of actual paths, so
+    that the number of series remains bounded.
+    """
+
+    def __init__(self) -> None:
+        self.in_flight = 0
+        self.duration: DefaultDict[
+            Tuple[str, str, str], LatencyHistogram
+        ] = defaultdict(LatencyHistogram)
+
+    def observe(self, method: str, route: str, status: int, seconds: float) -> None:
+        self.duration[(method, route, str(status))].observe(seconds)
+
+    def collect(self) -> Iterator[MetricFamily]:
+        yield MetricFamily(
+            "http_requests_in_flight",
+            "gauge",
+            "Number of HTTP requests being processed.",
+        ).add(self.in_flight)
+
+        family = MetricFamily(
+            "http_request_duration_seconds",
+            "histogram",
+            "Duration of HTTP requests.",
+        )
+
+        for (method, route, status), histogram in sorted(self.duration.items()):
+            labels = {"method": method, "route": route, "status": status}
+            family.add_histogram(histogram, labels)
+
+        yield family
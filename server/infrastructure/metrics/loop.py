@@ -0,0 +1,49 @@
+import asyncio
+from typing import Iterator, Optional
+
+from .registry import LatencyHistogram, MetricFamily
+
+
+class LoopLagMonitor:
+    """
+    Measure how late the event loop runs a callback scheduled at regular intervals.
+
+    A high lag means that some code blocks the loop, delaying all other requests.
+    """
+
+    def __init__(self, interval: float = 0.5) -> None:
+        self._interval = interval
+        self._task: Optional["asyncio.Task[None]"] = None
+        self.lag = LatencyHistogram()
+        self.last_lag = 0.0
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.ensure_future(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+
+        while True:
+            start = loop.time()
+            await asyncio.sleep(self._interval)
+            self.last_lag = max(0.0, loop.time() - start - self._interval)
+            self.lag.observe(self.last_lag)
+
+    def collect(self) -> Iterator[MetricFamily]:
+        yield MetricFamily(
+            "event_loop_lag_seconds",
+            "histogram",
+            "Delay of callbacks scheduled on the event loop.",
+        ).add_histogram(self.lag)
+
+        yield MetricFamily(
+            "event_loop_last_lag_seconds",
+            "gauge",
+            "Last measured delay of callbacks scheduled on the event loop.",
+        ).add(self.last_lag)
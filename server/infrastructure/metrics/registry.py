@@ -0,0 +1,155 @@
+from typing import Callable, Dict, Iterable, Iterator, List, Sequence, Tuple
+
+# Seconds. Same as the Prometheus client defaults.
+DEFAULT_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.075,
+    0.1,
+    0.25,
+    0.5,
+    0.75,
+    1.0,
+    2.5,
+    5.0,
+    7.5,
+    10.0,
+)
+
+Labels = Dict[str, str]
+
+
+class LatencyHistogram:
+    """
+    Count observed durations into cumulative buckets.
+
+    Observing is cheap (no locks, no allocations), so that instrumentation can stay
+    enabled in production. Instances must only be updated from the event loop thread.
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        self.buckets = tuple(buckets)
+        self.counts = [0] * len(self.buckets)  # Per bucket, not cumulative.
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, seconds: float) -> None:
+        self.count += 1
+        self.sum += seconds
+
+        for index, upper_bound in enumerate(self.buckets):
+            if seconds <= upper_bound:
+                self.counts[index] += 1
+                break
+
+    def cumulative_counts(self) -> List[Tuple[float, int]]:
+        """
+        Return `(upper_bound, count)` pairs, ending with `(inf, total count)`.
+        """
+        result = []
+        total = 0
+
+        for upper_bound, count in zip(self.buckets, self.counts):
+            total += count
+            result.append((upper_bound, total))
+
+        result.append((float("inf"), self.count))
+
+        return result
+
+
+class MetricFamily:
+    """
+    Samples of a metric, ready to be exposed in the Prometheus text format.
+
+    See: https://prometheus.io/docs/instrumenting/exposition_formats/
+    """
+
+    def __init__(self, name: str, type_: str, help: str) -> None:
+        self.name = name
+        self.type = type_
+        self.help = help
+        self.samples: List[Tuple[str, Labels, float]] = []
+
+    def add(self, value: float, labels: Labels = None) -> "MetricFamily":
+        self.samples.append((self.name, labels or {}, value))
+        return self
+
+    def add_histogram(
+        self, histogram: LatencyHistogram, labels: Labels = None
+    ) -> "MetricFamily":
+        labels = labels or {}
+
+        for upper_bound, count in histogram.cumulative_counts():
+            bucket_labels = {**labels, "le": _format_value(upper_bound)}
+            self.samples.append((f"{self.name}_bucket", bucket_labels, count))
+
+        self.samples.append((f"{self.name}_sum", labels, histogram.sum))
+        self.samples.append((f"{self.name}_count", labels, histogram.count))
+
+        return self
+
+    def render(self, extra_labels: Labels = None) -> Iterator[str]:
+        """
+        Render samples, adding `extra_labels` to each of them.
+        """
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} {self.type}"
+
+        for name, sample_labels, value in self.samples:
+            labels = {**(extra_labels or {}), **sample_labels}
+
+            if labels:
+                label_str = ",".join(
+                    f'{key}="{_escape(val)}"' for key, val in labels.items()
+                )
+                yield f"{name}{{{label_str}}} {_format_value(value)}"
+            else:
+                yield f"{name} {_format_value(value)}"
+
+
+Collector = Callable[[], Iterable[MetricFamily]]
+
+
+class MetricsRegistry:
+    """
+    Gather metrics from registered collectors when scraped.
+
+    Collectors read the current state of instrumented components, so that work is
+    only done at scrape time. `labels` are added to all samples.
+    """
+
+    def __init__(self, labels: Labels = None) -> None:
+        self._collectors: List[Collector] = []
+        self._labels = labels or {}
+
+    def register(self, collector: Collector) -> None:
+        self._collectors.append(collector)
+
+    def collect(self) -> Iterator[MetricFamily]:
+        for collector in self._collectors:
+            yield from collector()
+
+    def render(self) -> str:
+        lines = [
+            line
+            for family in self.collect()
+            for line in family.render(self._labels)
+        ]
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+
+    if isinstance(value, int) or float(value).is_integer():
+        return str(int(value))
+
+    return repr(float(value))
@@ -0,0 +1,73 @@
+import logging
+import time
+from contextvars import ContextVar, Token
+from typing import Any, Dict, Mapping, Optional
+
+
+class RequestStats:
+    """
+    Statistics about the processing of the current request.
+
+    `context` holds information that helps diagnosing the request, e.g. the
+    `DatasetSpec` of a dataset search. See `add_request_context()`.
+    """
+
+    def __init__(self, scope: Mapping[str, Any] = None) -> None:
+        self.start_time = time.perf_counter()
+        self.db_queries = 0
+        self.db_time = 0.0
+        self.context: Dict[str, Any] = {}
+        self._scope = scope or {}
+
+    @property
+    def route(self) -> Optional[str]:
+        """
+        The route template (e.g. '/datasets/{id}/') if the request has been routed
+        already, or else the request path.
+        """
+        route = self._scope.get("route")
+        return getattr(route, "path_format", None) or self._scope.get("path")
+
+    @property
+    def total_time(self) -> float:
+        return time.perf_counter() - self.start_time
+
+
+_current: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+
+def start_request_stats(
+    scope: Mapping[str, Any] = None
+) -> "Token[Optional[RequestStats]]":
+    return _current.set(RequestStats(scope))
+
+
+def end_request_stats(token: "Token[Optional[RequestStats]]") -> None:
+    _current.reset(token)
+
+
+def get_request_stats() -> Optional[RequestStats]:
+    return _current.get()
+
+
+def add_request_context(**kwargs: Any) -> None:
+    stats = get_request_stats()
+
+    if stats is not None:
+        stats.context.update(kwargs)
+
+
+class RequestStatsLogFilter(logging.Filter):
+    """
+    Attach statistics about the current request to log records, if any.
+    """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        stats = get_request_stats()
+
+        if stats is not None:
+            record.db_queries = stats.db_queries
+            record.db_time_ms = round(stats.db_time * 1000, 2)
+            record.total_time_ms = round(stats.total_time * 1000, 2)
+
+        return True
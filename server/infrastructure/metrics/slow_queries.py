@@ -0,0 +1,177 @@
+import asyncio
+import dataclasses
+import datetime as dt
+import json
+import logging
+import logging.handlers
+import time
+from typing import Any, Dict, Optional, Set
+
+from sqlalchemy import event
+from sqlalchemy.engine import Connection, ExecutionContext
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from .request_stats import get_request_stats
+
+logger = logging.getLogger(__name__)
+
+_EXPLAIN = "EXPLAIN (FORMAT JSON)"
+
+
+class SlowQueryLog:
+    """
+    Log SQL queries slower than `threshold` seconds, with their parameters and
+    information about the originating request.
+
+    If `explain_file` is set, the plan of slow SELECT queries is also obtained using
+    `EXPLAIN (FORMAT JSON)` on a separate connection, in the background, and written
+    to that file as JSON lines. This is done at most once every `explain_interval`
+    seconds, so as not to add load to a database that is already slow.
+    """
+
+    def __init__(
+        self,
+        threshold: float,
+        explain_file: str = None,
+        explain_interval: float = 60,
+        explain_max_bytes: int = 10 * 1024 * 1024,
+    ) -> None:
+        self._threshold = threshold
+        self._explain_interval = explain_interval
+        self._last_explain_time: Optional[float] = None
+        self._engine: Optional[AsyncEngine] = None
+        self._tasks: Set["asyncio.Task[None]"] = set()
+        self._plans_handler: Optional[logging.Handler] = None
+
+        if explain_file:
+            self._plans_handler = logging.handlers.RotatingFileHandler(
+                explain_file, maxBytes=explain_max_bytes, backupCount=5, delay=True
+            )
+
+    def instrument(self, engine: AsyncEngine) -> None:
+        self._engine = engine
+        sync_engine = engine.sync_engine
+        event.listen(sync_engine, "before_cursor_execute", self._before_execute)
+        event.listen(sync_engine, "after_cursor_execute", self._after_execute)
+
+    def _before_execute(
+        self,
+        conn: Connection,
+        cursor: Any,
+        statement: str,
+        parameters: Any,
+        context: ExecutionContext,
+        executemany: bool,
+    ) -> None:
+        context._slow_query_start_time = time.perf_counter()  # type: ignore
+
+    def _after_execute(
+        self,
+        conn: Connection,
+        cursor: Any,
+        statement: str,
+        parameters: Any,
+        context: ExecutionContext,
+        executemany: bool,
+    ) -> None:
+        start_time = getattr(context, "_slow_query_start_time", None)
+
+        if start_time is None or self._threshold <= 0:
+            return
+
+        duration = time.perf_counter() - start_time
+
+        if duration < self._threshold or statement.startswith(_EXPLAIN):
+            return
+
+        info = self._make_info(statement, parameters, duration)
+
+        logger.warning(
+            "Slow query (%.1f ms, route: %s): %s; parameters: %r",
+            info["duration_ms"],
+            info["route"],
+            statement,
+            parameters,
+            extra={"slow_query": info},
+        )
+
+        if self._should_explain(statement):
+            self._explain_in_background(statement, parameters, info)
+
+    def _make_info(
+        self, statement: str, parameters: Any, duration: float
+    ) -> Dict[str, Any]:
+        stats = get_request_stats()
+        dataset_spec = stats.context.get("dataset_spec") if stats else None
+
+        return {
+            "time": dt.datetime.now(dt.timezone.utc).isoformat(),
+            "duration_ms": round(duration * 1000, 2),
+            "route": stats.route if stats else None,
+            "dataset_spec": (
+                dataclasses.asdict(dataset_spec) if dataset_spec is not None else None
+            ),
+            "statement": statement,
+            "parameters": parameters,
+        }
+
+    def _should_explain(self, statement: str) -> bool:
+        if self._plans_handler is None or self._engine is None:
+            return False
+
+        if not statement.lstrip().upper().startswith("SELECT"):
+            return False
+
+        now = time.monotonic()
+
+        if (
+            self._last_explain_time is not None
+            and now - self._last_explain_time < self._explain_interval
+        ):
+            return False
+
+        self._last_explain_time = now
+
+        return True
+
+    def _explain_in_background(
+        self, statement: str, parameters: Any, info: Dict[str, Any]
+    ) -> None:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:  # pragma: no cover
+            return  # Not running in an event loop (e.g. sync scripts).
+
+        task = loop.create_task(self._explain(statement, parameters, info))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _explain(
+        self, statement: str, parameters: Any, info: Dict[str, Any]
+    ) -> None:
+        assert self._engine is not None
+        assert self._plans_handler is not None
+
+        try:
+            async with self._engine.connect() as conn:
+                result = await conn.exec_driver_sql(
+                    f"{_EXPLAIN} {statement}", parameters
+                )
+                plan = result.scalar()
+        except Exception:
+            logger.exception("Failed to explain slow query")
+            return
+
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+
+        content = json.dumps({**info, "plan": plan}, default=str)
+        record = logging.makeLogRecord({"msg": content, "levelno": logging.INFO})
+        self._plans_handler.handle(record)
+
+    async def wait(self) -> None:
+        """
+        Wait for pending EXPLAIN queries to complete.
+        """
+        if self._tasks:
+            await asyncio.gather(*self._tasks)
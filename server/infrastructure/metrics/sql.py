@@ -0,0 +1,74 @@
+import time
+from typing import Any, Iterator
+
+from sqlalchemy import event
+from sqlalchemy.engine import Connection, ExecutionContext
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from .registry import LatencyHistogram, MetricFamily
+from .request_stats import get_request_stats
+
+
+class SqlMetrics:
+    """
+    Record the number and duration of SQL queries executed by an engine, globally
+    and for the current request.
+    """
+
+    def __init__(self) -> None:
+        self.duration = LatencyHistogram()
+        self.errors = 0
+
+    def instrument(self, engine: AsyncEngine) -> None:
+        sync_engine = engine.sync_engine
+        event.listen(sync_engine, "before_cursor_execute", self._before_execute)
+        event.listen(sync_engine, "after_cursor_execute", self._after_execute)
+        event.listen(sync_engine, "handle_error", self._handle_error)
+
+    def _before_execute(
+        self,
+        conn: Connection,
+        cursor: Any,
+        statement: str,
+        parameters: Any,
+        context: ExecutionContext,
+        executemany: bool,
+    ) -> None:
+        context._metrics_start_time = time.perf_counter()  # type: ignore
+
+    def _after_execute(
+        self,
+        conn: Connection,
+        cursor: Any,
+        statement: str,
+        parameters: Any,
+        context: ExecutionContext,
+        executemany: bool,
+    ) -> None:
+        start_time = getattr(context, "_metrics_start_time", None)
+
+        if start_time is None:
+            return
+
+        elapsed = time.perf_counter() - start_time
+        self.duration.observe(elapsed)
+
+        stats = get_request_stats()
+
+        if stats is not None:
+            stats.db_queries += 1
+            stats.db_time += elapsed
+
+    def _handle_error(self, exception_context: Any) -> None:
+        self.errors += 1
+
+    def collect(self) -> Iterator[MetricFamily]:
+        yield MetricFamily(
+            "db_query_duration_seconds",
+            "histogram",
+            "Duration of SQL queries.",
+        ).add_histogram(self.duration)
+
+        yield MetricFamily(
+            "db_query_errors_total", "counter", "Number of failed SQL queries."
+        ).add(self.errors)
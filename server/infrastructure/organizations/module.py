@@ -1,9 +1,12 @@
+import datetime as dt
+
 from server.application.organizations.commands import CreateOrganization
 from server.application.organizations.handlers import (
     create_organization,
     get_organization_by_siret,
 )
 from server.application.organizations.queries import GetOrganizationBySiret
+from server.seedwork.application.caching import QueryCachePolicy
 from server.seedwork.application.modules import Module
 
 
@@ -15,3 +18,9 @@ class OrganizationsModule(Module):
     query_handlers = {
         GetOrganizationBySiret: get_organization_by_siret,
     }
+
+    cached_queries = {
+        GetOrganizationBySiret: QueryCachePolicy(
+            max_age=dt.timedelta(minutes=5), invalidated_by=[CreateOrganization]
+        ),
+    }
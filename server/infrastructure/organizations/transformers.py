@@ -1,12 +1,11 @@
 from server.domain.organizations.entities import Organization
+from server.seedwork.domain.construction import construct_from
 
 from .models import OrganizationModel
 
 
 def make_entity(instance: OrganizationModel) -> Organization:
-    return Organization(
-        siret=instance.siret, name=instance.name, logo_url=instance.logo_url
-    )
+    return construct_from(Organization, instance)
 
 
 def make_instance(entity: Organization) -> OrganizationModel:
@@ -1,13 +1,36 @@
-from typing import Callable, Union
-
+import asyncio
+import logging
+import socket
+import sys
+from typing import Any, Callable, Dict, List, Optional, Union
+
+import gunicorn.app.base
+import gunicorn.arbiter
+import gunicorn.util
+import gunicorn.workers.base
 import uvicorn
 import uvicorn.supervisors
+import uvicorn.workers
 
-from server.config.di import resolve
+from server.config.di import bootstrap, resolve
 from server.config.settings import Settings
 
+from .lifecycle import Lifecycle
 from .logging.config import get_log_config
 
+logger = logging.getLogger(__name__)
+
+
+def _get_live_config_kwargs() -> dict:
+    return dict(
+        # Pass any proxy headers, so that Uvicorn sees information about the
+        # connecting client, rather than the connecting Nginx proxy.
+        # See: https://www.uvicorn.org/deployment/#running-behind-nginx
+        proxy_headers=True,
+        # Match Nginx mount path.
+        root_path="/api",
+    )
+
 
 def get_server_config(
     app: Union[str, Callable], settings: Settings = None
@@ -28,20 +51,96 @@ def get_server_config(
             reload_dirs=["server"],
         )
     elif settings.server_mode == "live":
-        kwargs.update(
-            # Pass any proxy headers, so that Uvicorn sees information about the
-            # connecting client, rather than the connecting Nginx proxy.
-            # See: https://www.uvicorn.org/deployment/#running-behind-nginx
-            proxy_headers=True,
-            # Match Nginx mount path.
-            root_path="/api",
-        )
+        kwargs.update(_get_live_config_kwargs())
 
     return uvicorn.Config(app, **kwargs)
 
 
 class Server(uvicorn.Server):
-    pass
+    async def shutdown(self, sockets: Optional[List[socket.socket]] = None) -> None:
+        # Uvicorn closes the listener, then waits for in-flight requests, before
+        # running the app's shutdown handlers. Stop being ready before that.
+        resolve(Lifecycle).drain()
+
+        delay = resolve(Settings).shutdown_delay
+
+        if delay > 0:
+            logger.info("Draining for %ss before shutting down", delay)
+            await asyncio.sleep(delay)
+
+        await super().shutdown(sockets=sockets)
+
+
+# Live mode
+# The app is served by several worker processes, managed by Gunicorn.
+# See: https://www.uvicorn.org/deployment/#gunicorn
+
+
+def get_worker_config_kwargs(settings: Settings) -> dict:
+    return dict(
+        loop=settings.loop,
+        http=settings.http,
+        # Use our logging rather than Gunicorn's.
+        log_config=get_log_config(settings),
+        **_get_live_config_kwargs(),
+    )
+
+
+class UvicornWorker(uvicorn.workers.UvicornWorker):
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        # Uvicorn options. (Workers are created by the master process, which has
+        # been bootstrapped.)
+        self.CONFIG_KWARGS = get_worker_config_kwargs(resolve(Settings))
+        super().__init__(*args, **kwargs)
+
+    async def _serve(self) -> None:
+        # Same as the parent implementation, with our `Server`.
+        self.config.app = self.wsgi
+        server = Server(config=self.config)
+        await server.serve(sockets=self.sockets)
+        if not server.started:
+            sys.exit(gunicorn.arbiter.Arbiter.WORKER_BOOT_ERROR)
+
+
+def _post_fork(
+    arbiter: gunicorn.arbiter.Arbiter, worker: gunicorn.workers.base.Worker
+) -> None:
+    if arbiter.cfg.preload_app:
+        # The app was imported by the master process. Create the database pool,
+        # caches, executors, etc, again, so that workers don't share them.
+        # (Otherwise, workers import the app themselves.)
+        bootstrap()
+
+
+def get_gunicorn_options(settings: Settings) -> Dict[str, Any]:
+    return {
+        "bind": f"{settings.host}:{settings.port}",
+        "workers": settings.processes,
+        "worker_class": f"{__name__}.UvicornWorker",
+        "keepalive": settings.keep_alive,
+        "backlog": settings.backlog,
+        "max_requests": settings.max_requests,
+        "max_requests_jitter": settings.max_requests_jitter,
+        "graceful_timeout": settings.graceful_timeout,
+        "preload_app": settings.preload,
+        "post_fork": _post_fork,
+    }
+
+
+class GunicornApplication(gunicorn.app.base.BaseApplication):
+    def __init__(self, app: Union[str, Callable], options: Dict[str, Any]) -> None:
+        self._app = app
+        self._options = options
+        super().__init__()
+
+    def load_config(self) -> None:
+        for key, value in self._options.items():
+            self.cfg.set(key, value)
+
+    def load(self) -> Callable:
+        if isinstance(self._app, str):
+            return gunicorn.util.import_app(self._app)
+        return self._app
 
 
 def run(app: Union[str, Callable]) -> int:
@@ -50,7 +149,14 @@ def run(app: Union[str, Callable]) -> int:
 
     This is a simplified version of `uvicorn.run()`.
     """
-    config = get_server_config(app)
+    settings = resolve(Settings)
+
+    if settings.server_mode == "live":
+        # Exits the process when stopped.
+        GunicornApplication(app, get_gunicorn_options(settings)).run()
+        return 0  # pragma: no cover
+
+    config = get_server_config(app, settings)
     server = Server(config)
 
     if config.should_reload:
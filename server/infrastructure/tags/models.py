@@ -1,7 +1,7 @@
 import uuid
 from typing import TYPE_CHECKING, List
 
-from sqlalchemy import Column, ForeignKey, String, Table
+from sqlalchemy import Column, ForeignKey, Index, Integer, String, Table, func, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 
@@ -24,7 +24,27 @@ class TagModel(Base):
 
     id: uuid.UUID = Column(UUID(as_uuid=True), primary_key=True)
     name = Column(String, nullable=False)
+    # Maintained by triggers on 'dataset_tag', see migrations 3f7a9c2e5d14 and
+    # 7e4e7bb28cf8. Tags are locked while their datasets change, until commit: so
+    # writes which use the same tag wait for each other. This is accepted, as
+    # dataset writes are short transactions. Lock tags upfront and in order with
+    # lock_tag_instances_by_ids(), to avoid deadlocks.
+    usage_count = Column(Integer, nullable=False, server_default="0")
 
     datasets: List["DatasetModel"] = relationship(
         "DatasetModel", back_populates="tags", secondary=dataset_tag
     )
+
+    __table_args__ = (
+        # NOTE: must match normalize_tag_name().
+        Index(
+            "ix_tag_name_normalized",
+            func.lower(func.btrim(func.regexp_replace(name, r"\s+", " ", "g"))),
+            unique=True,
+        ),
+        Index(
+            "ix_tag_name_trgm",
+            text("lower(name) gin_trgm_ops"),
+            postgresql_using="GIN",
+        ),
+    )
@@ -1,6 +1,14 @@
+import datetime as dt
+
 from server.application.tags.commands import CreateTag
-from server.application.tags.handlers import create_tag, get_all_tags, get_tag_by_id
-from server.application.tags.queries import GetAllTags, GetTagByID
+from server.application.tags.handlers import (
+    create_tag,
+    get_all_tags,
+    get_tag_by_id,
+    get_tag_page,
+)
+from server.application.tags.queries import GetAllTags, GetTagByID, GetTagPage
+from server.seedwork.application.caching import QueryCachePolicy
 from server.seedwork.application.modules import Module
 
 
@@ -11,5 +19,12 @@ class TagsModule(Module):
 
     query_handlers = {
         GetAllTags: get_all_tags,
+        GetTagPage: get_tag_page,
         GetTagByID: get_tag_by_id,
     }
+
+    cached_queries = {
+        GetAllTags: QueryCachePolicy(
+            max_age=dt.timedelta(minutes=5), invalidated_by=[CreateTag]
+        ),
+    }
@@ -1,4 +1,4 @@
-from typing import List
+from typing import Iterable, List
 
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -14,3 +14,28 @@ async def get_all_tag_instances_by_ids(
     stmt = select(TagModel).where(TagModel.id.in_(ids))
     result = await session.execute(stmt)
     return result.scalars().all()
+
+
+async def lock_tag_instances_by_ids(session: AsyncSession, ids: Iterable[ID]) -> None:
+    """
+    Lock tags until the end of the transaction, in a fixed order.
+
+    Changes to 'dataset_tag' update the usage count of tags (see TagModel), which
+    locks them. Transactions which change several tags must lock them upfront, in
+    the same order, or they may deadlock: e.g. when concurrently moving a dataset
+    from tag A to tag B, and another one from tag B to tag A.
+    """
+    ids = sorted(set(ids))
+
+    if not ids:
+        return
+
+    stmt = (
+        select(TagModel.id)
+        .where(TagModel.id.in_(ids))
+        .order_by(TagModel.id)
+        # FOR NO KEY UPDATE: the lock taken by the trigger, which does not block
+        # foreign key checks of other transactions.
+        .with_for_update(key_share=True)
+    )
+    await session.execute(stmt)
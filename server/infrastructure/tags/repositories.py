@@ -1,15 +1,102 @@
-from typing import List, Optional
+import asyncio
+from typing import Dict, List, Optional, Sequence, Tuple
 
-from sqlalchemy import delete, select
+from sqlalchemy import bindparam, delete, func, literal, or_, select, text
+from sqlalchemy.dialects.postgresql import ARRAY, UUID, insert
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.types import String
 
+from server.domain.common.pagination import Page
 from server.domain.common.types import ID, id_factory
-from server.domain.tags.entities import Tag
+from server.domain.tags.entities import Tag, normalize_tag_name
+from server.domain.tags.exceptions import TagAlreadyExists
 from server.domain.tags.repositories import TagRepository
+from server.domain.tags.specifications import TagOrdering, TagSpec
 
 from ..database import Database
+from ..helpers.sqlalchemy import get_count_from, to_limit_offset
 from .models import TagModel
-from .transformers import make_entity, make_instance
+from .transformers import make_entity
+
+# NOTE: must match the 'ix_tag_name_normalized' index.
+_NORMALIZED_NAME = r"lower(btrim(regexp_replace({}, '\s+', ' ', 'g')))"
+
+# For each name, keep the tag used by the most datasets (then the smallest ID), and
+# move associations of other tags to it. This is a single statement, so all parts
+# see the same snapshot of the data.
+_MERGE_DUPLICATES = text(
+    f"""
+    WITH usage AS (
+        SELECT
+            tag.id,
+            {_NORMALIZED_NAME.format("tag.name")} AS name,
+            count(dataset_tag.dataset_id) AS n
+        FROM tag
+        LEFT JOIN dataset_tag ON dataset_tag.tag_id = tag.id
+        GROUP BY tag.id
+    ),
+    kept AS (
+        SELECT DISTINCT ON (name) id, name
+        FROM usage
+        ORDER BY name, n DESC, id
+    ),
+    merged AS (
+        SELECT usage.id, kept.id AS kept_id
+        FROM usage
+        JOIN kept ON kept.name = usage.name
+        WHERE usage.id <> kept.id
+    ),
+    relinked AS (
+        INSERT INTO dataset_tag (dataset_id, tag_id)
+        SELECT DISTINCT dataset_tag.dataset_id, merged.kept_id
+        FROM dataset_tag
+        JOIN merged ON merged.id = dataset_tag.tag_id
+        ON CONFLICT DO NOTHING
+    ),
+    unlinked AS (
+        DELETE FROM dataset_tag
+        WHERE tag_id IN (SELECT id FROM merged)
+    ),
+    deleted AS (
+        DELETE FROM tag
+        WHERE id IN (SELECT id FROM merged)
+        RETURNING id
+    )
+    SELECT (SELECT count(*) FROM usage), (SELECT count(*) FROM deleted)
+    """
+)
+
+# Existing tags are not visible to the INSERT's snapshot, hence the UNION.
+# Rows are returned with the given name, so that callers don't need to match names
+# themselves (which might not agree with the index, e.g. on Unicode case folding).
+_GET_OR_CREATE_BY_NAMES = text(
+    f"""
+    WITH input AS (
+        SELECT id, name
+        FROM unnest(CAST(:ids AS uuid[]), CAST(:names AS varchar[]))
+            AS input (id, name)
+    ),
+    inserted AS (
+        INSERT INTO tag (id, name)
+        SELECT id, name FROM input
+        ON CONFLICT DO NOTHING
+        RETURNING id, name
+    )
+    SELECT id, name FROM inserted
+    UNION ALL
+    SELECT tag.id, input.name
+    FROM tag
+    JOIN input
+    ON {_NORMALIZED_NAME.format("tag.name")} = {_NORMALIZED_NAME.format("input.name")}
+    """
+).bindparams(
+    bindparam("ids", type_=ARRAY(UUID(as_uuid=True))),
+    bindparam("names", type_=ARRAY(String)),
+)
+
+
+# Tags being created by concurrent transactions are waited for, up to this many times.
+_GET_OR_CREATE_MAX_ATTEMPTS = 10
 
 
 class SqlTagRepository(TagRepository):
@@ -19,15 +106,55 @@ class SqlTagRepository(TagRepository):
     def make_id(self) -> ID:
         return id_factory()
 
-    async def get_all(self, *, ids: List[ID] = None) -> List[Tag]:
+    async def get_all(
+        self, *, ids: List[ID] = None, names: Sequence[str] = None
+    ) -> List[Tag]:
         async with self._db.session() as session:
             stmt = select(TagModel)
             if ids is not None:
                 stmt = stmt.where(TagModel.id.in_(ids))
+            if names is not None:
+                # May use the 'ix_tag_name_normalized' index.
+                normalized_name = func.lower(
+                    func.btrim(func.regexp_replace(TagModel.name, r"\s+", " ", "g"))
+                )
+                stmt = stmt.where(
+                    normalized_name.in_([normalize_tag_name(name) for name in names])
+                )
             stmt = stmt.order_by(TagModel.name)
             result = await session.execute(stmt)
             return [make_entity(instance) for instance in result.scalars().all()]
 
+    async def get_page(
+        self, *, page: Page = Page(), spec: TagSpec = TagSpec()
+    ) -> Tuple[List[Tag], int]:
+        async with self._db.session() as session:
+            stmt = select(TagModel)
+            order_by = []
+
+            if spec.search_term:
+                # Both conditions may use the 'ix_tag_name_trgm' index.
+                term = normalize_tag_name(spec.search_term)
+                name = func.lower(TagModel.name)
+                is_prefix = name.startswith(term, autoescape=True)
+                is_similar = literal(term).op("<%", is_comparison=True)(name)
+                stmt = stmt.where(or_(is_prefix, is_similar))
+                # Tags starting with the search term first.
+                order_by.append(is_prefix.desc())
+
+            if spec.ordering == TagOrdering.USAGE:
+                order_by.append(TagModel.usage_count.desc())
+
+            stmt = stmt.order_by(*order_by, TagModel.name, TagModel.id)
+
+            count = await get_count_from(stmt, session)
+
+            limit, offset = to_limit_offset(page)
+            result = await session.execute(stmt.limit(limit).offset(offset))
+
+            items = [make_entity(instance) for instance in result.scalars().all()]
+            return items, count
+
     async def _maybe_get_by_id(
         self, session: AsyncSession, id_: ID
     ) -> Optional[TagModel]:
@@ -57,9 +184,66 @@ class SqlTagRepository(TagRepository):
     async def insert(self, entity: Tag) -> ID:
         async with self._db.session() as session:
             async with session.begin():
-                instance = make_instance(entity)
-                session.add(instance)
-
-            await session.refresh(instance)
-
-            return ID(instance.id)
+                stmt = (
+                    insert(TagModel)
+                    .values(**entity.dict())
+                    .on_conflict_do_nothing()
+                    .returning(TagModel.id)
+                )
+                result = await session.execute(stmt)
+                id_ = result.scalar_one_or_none()
+
+            if id_ is None:
+                raise TagAlreadyExists(entity.name)
+
+            return ID(id_)
+
+    async def get_or_create_by_names(self, names: Sequence[str]) -> Dict[str, ID]:
+        if not names:
+            return {}
+
+        # One name per tag (the first one given), sorted so that concurrent callers
+        # insert in the same order, avoiding deadlocks.
+        names_by_normalized_name: Dict[str, str] = {}
+        for name in names:
+            names_by_normalized_name.setdefault(
+                normalize_tag_name(name), " ".join(name.split())
+            )
+        missing = sorted(names_by_normalized_name.values())
+
+        ids_by_name: Dict[str, ID] = {}
+
+        for attempt in range(_GET_OR_CREATE_MAX_ATTEMPTS):
+            if attempt > 0:
+                await asyncio.sleep(0.01)
+
+            async with self._db.session() as session:
+                async with session.begin():
+                    result = await session.execute(
+                        _GET_OR_CREATE_BY_NAMES,
+                        {"ids": [id_factory() for _ in missing], "names": missing},
+                    )
+
+                    for id_, name in result:
+                        ids_by_name[name] = ID(id_)
+
+            # Tags being created by a concurrent transaction are neither inserted nor
+            # found: try again, once that transaction has committed.
+            missing = [name for name in missing if name not in ids_by_name]
+
+            if not missing:
+                break
+        else:
+            raise RuntimeError(f"Failed to get or create tags: {missing}")
+
+        return {
+            name: ids_by_name[names_by_normalized_name[normalize_tag_name(name)]]
+            for name in names
+        }
+
+    async def merge_duplicates(self) -> Tuple[int, int]:
+        async with self._db.session() as session:
+            async with session.begin():
+                result = await session.execute(_MERGE_DUPLICATES)
+                num_tags, num_deleted = result.one()
+                return num_tags, num_deleted
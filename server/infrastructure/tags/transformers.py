@@ -1,11 +1,8 @@
 from server.domain.tags.entities import Tag
+from server.seedwork.domain.construction import construct_from
 
 from .models import TagModel
 
 
 def make_entity(instance: TagModel) -> Tag:
-    return Tag(**{field: getattr(instance, field) for field in Tag.__fields__})
-
-
-def make_instance(entity: Tag) -> TagModel:
-    return TagModel(**entity.dict())
+    return construct_from(Tag, instance)
@@ -0,0 +1,108 @@
+import json
+import logging
+import logging.handlers
+import sys
+from typing import TYPE_CHECKING, Any, Dict, List, Sequence
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .spans import Span
+
+# OTLP status codes.
+_STATUS_OK = 1
+_STATUS_ERROR = 2
+
+
+class SpanExporter:
+    def export(self, spans: Sequence["Span"]) -> None:
+        raise NotImplementedError  # pragma: no cover
+
+
+def _make_attribute_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}  # 64-bit integers are strings in OTLP/JSON.
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _make_attributes(attributes: Dict[str, Any]) -> List[dict]:
+    return [
+        {"key": key, "value": _make_attribute_value(value)}
+        for key, value in attributes.items()
+        if value is not None
+    ]
+
+
+def _make_span(span: "Span") -> dict:
+    data: Dict[str, Any] = {
+        "traceId": span.trace.trace_id,
+        "spanId": span.span_id,
+        "name": span.name,
+        "kind": span.kind,
+        "startTimeUnixNano": str(span.start_time_ns),
+        "endTimeUnixNano": str(span.end_time_ns),
+        "attributes": _make_attributes(span.attributes),
+    }
+
+    if span.parent_span_id is not None:
+        data["parentSpanId"] = span.parent_span_id
+
+    if span.error is not None:
+        data["status"] = {"code": _STATUS_ERROR, "message": span.error}
+    else:
+        data["status"] = {"code": _STATUS_OK}
+
+    return data
+
+
+class OtlpJsonExporter(SpanExporter):
+    """
+    Write each trace as a line of OTLP/JSON (an `ExportTraceServiceRequest`), which
+    can be loaded by e.g. the OpenTelemetry Collector `otlpjsonfile` receiver.
+
+    `path` may be "-" to write to stdout. Files are rotated.
+    See: https://opentelemetry.io/docs/specs/otlp/#json-protobuf-encoding
+    """
+
+    def __init__(
+        self,
+        path: str,
+        service_name: str = "catalogage-server",
+        max_bytes: int = 10 * 1024 * 1024,
+    ) -> None:
+        self._handler: logging.Handler
+
+        if path == "-":
+            self._handler = logging.StreamHandler(sys.stdout)
+        else:
+            self._handler = logging.handlers.RotatingFileHandler(
+                path, maxBytes=max_bytes, backupCount=5, delay=True
+            )
+
+        self._resource = {
+            "attributes": _make_attributes({"service.name": service_name})
+        }
+
+    def export(self, spans: Sequence["Span"]) -> None:
+        if not spans:
+            return
+
+        data = {
+            "resourceSpans": [
+                {
+                    "resource": self._resource,
+                    "scopeSpans": [
+                        {
+                            "scope": {"name": "server"},
+                            "spans": [_make_span(span) for span in spans],
+                        }
+                    ],
+                }
+            ]
+        }
+
+        content = json.dumps(data, default=str)
+        record = logging.makeLogRecord({"msg": content, "levelno": logging.INFO})
+        self._handler.handle(record)
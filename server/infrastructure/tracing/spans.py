@@ -0,0 +1,245 @@
+import contextlib
+import functools
+import random
+import re
+import secrets
+import time
+from contextvars import ContextVar
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+    cast,
+)
+
+from .exporters import SpanExporter
+
+F = TypeVar("F", bound=Callable[..., Awaitable])
+
+# See: https://www.w3.org/TR/trace-context/#traceparent-header
+_TRACEPARENT_RE = re.compile(
+    r"^00-(?P<trace_id>[0-9a-f]{32})-(?P<span_id>[0-9a-f]{16})-(?P<flags>[0-9a-f]{2})$"
+)
+
+# Span kinds, as defined by OpenTelemetry.
+INTERNAL = 1
+SERVER = 2
+CLIENT = 3
+
+MAX_SPANS_PER_TRACE = 1000
+
+_current_span: ContextVar[Optional["Span"]] = ContextVar("current_span", default=None)
+
+
+def parse_traceparent(value: str) -> Optional[Tuple[str, str, bool]]:
+    """
+    Return `(trace_id, parent_span_id, sampled)`, or None if `value` is invalid.
+    """
+    m = _TRACEPARENT_RE.match(value.strip().lower())
+
+    if m is None or m["trace_id"] == "0" * 32 or m["span_id"] == "0" * 16:
+        return None
+
+    sampled = bool(int(m["flags"], 16) & 0x01)
+
+    return m["trace_id"], m["span_id"], sampled
+
+
+def format_traceparent(span: "Span") -> str:
+    return f"00-{span.trace.trace_id}-{span.span_id}-01"
+
+
+class Trace:
+    """
+    Collect finished spans of a trace, until its local root span ends.
+    """
+
+    def __init__(self, trace_id: str, exporter: SpanExporter) -> None:
+        self.trace_id = trace_id
+        self.spans: List["Span"] = []
+        self.dropped = 0
+        self._exporter = exporter
+
+    def add(self, span: "Span") -> None:
+        if len(self.spans) >= MAX_SPANS_PER_TRACE:
+            self.dropped += 1
+            return
+
+        self.spans.append(span)
+
+    def export(self) -> None:
+        self._exporter.export(self.spans)
+
+
+class Span:
+    def __init__(
+        self,
+        trace: Trace,
+        name: str,
+        *,
+        parent_span_id: str = None,
+        kind: int = INTERNAL,
+        attributes: Dict[str, Any] = None,
+        is_root: bool = False,
+    ) -> None:
+        self.trace = trace
+        self.span_id = secrets.token_hex(8)
+        self.parent_span_id = parent_span_id
+        self.name = name
+        self.kind = kind
+        self.attributes = attributes or {}
+        self.error: Optional[str] = None
+        self.start_time_ns = time.time_ns()
+        self.end_time_ns: Optional[int] = None
+        self._is_root = is_root
+
+    def child(
+        self, name: str, *, kind: int = INTERNAL, attributes: Dict[str, Any] = None
+    ) -> "Span":
+        """
+        Start a child span. It does not become the current span.
+        """
+        return Span(
+            self.trace,
+            name,
+            parent_span_id=self.span_id,
+            kind=kind,
+            attributes=attributes,
+        )
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def end(self, error: BaseException = None) -> None:
+        if self.end_time_ns is not None:
+            return
+
+        self.end_time_ns = time.time_ns()
+
+        if error is not None:
+            self.error = f"{type(error).__name__}: {error}"
+
+        self.trace.add(self)
+
+        if self._is_root:
+            self.trace.export()
+
+
+def get_current_span() -> Optional[Span]:
+    return _current_span.get()
+
+
+@contextlib.contextmanager
+def _activate(span: Span) -> Iterator[Span]:
+    token = _current_span.set(span)
+    try:
+        yield span
+    except BaseException as exc:
+        span.end(error=exc)
+        raise
+    else:
+        span.end()
+    finally:
+        _current_span.reset(token)
+
+
+@contextlib.contextmanager
+def start_span(name: str, **attributes: Any) -> Iterator[Optional[Span]]:
+    """
+    Run the enclosed code in a child of the current span.
+
+    Outside of a trace, this does nothing and returns None.
+    """
+    parent = _current_span.get()
+
+    if parent is None:
+        yield None
+        return
+
+    with _activate(parent.child(name, attributes=attributes)) as span:
+        yield span
+
+
+def traced(name: str = None) -> Callable[[F], F]:
+    """
+    Run the decorated async function in a span (see `start_span()`).
+    """
+
+    def decorate(func: F) -> F:
+        span_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if _current_span.get() is None:
+                return await func(*args, **kwargs)
+
+            with start_span(span_name):
+                return await func(*args, **kwargs)
+
+        return cast(F, wrapper)
+
+    return decorate
+
+
+class Tracer:
+    """
+    Start traces, and hand them to `exporter` when they end.
+
+    Traces continue the remote trace given by a W3C `traceparent`, if any, according
+    to its sampled flag. Other traces are sampled according to `sample_rate`.
+    If `exporter` is None, nothing is traced.
+    """
+
+    def __init__(
+        self, exporter: Optional[SpanExporter], sample_rate: float = 1
+    ) -> None:
+        self._exporter = exporter
+        self._sample_rate = sample_rate
+
+    @property
+    def enabled(self) -> bool:
+        return self._exporter is not None
+
+    @contextlib.contextmanager
+    def start_trace(
+        self,
+        name: str,
+        *,
+        traceparent: str = None,
+        kind: int = SERVER,
+        attributes: Dict[str, Any] = None,
+    ) -> Iterator[Optional[Span]]:
+        remote = parse_traceparent(traceparent) if traceparent else None
+
+        if self._exporter is None or _current_span.get() is not None:
+            yield None
+            return
+
+        if remote is not None:
+            trace_id, parent_span_id, sampled = remote
+        else:
+            trace_id = secrets.token_hex(16)
+            parent_span_id = None
+            sampled = random.random() < self._sample_rate
+
+        if not sampled:
+            yield None
+            return
+
+        root = Span(
+            Trace(trace_id, self._exporter),
+            name,
+            parent_span_id=parent_span_id,
+            kind=kind,
+            attributes=attributes,
+            is_root=True,
+        )
+
+        with _activate(root) as span:
+            yield span
@@ -0,0 +1,61 @@
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.engine import Connection, ExceptionContext, ExecutionContext
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from .spans import CLIENT, get_current_span
+
+
+class SqlTracing:
+    """
+    Record a span for each SQL query executed by an engine in a trace.
+    """
+
+    def instrument(self, engine: AsyncEngine) -> None:
+        sync_engine = engine.sync_engine
+        event.listen(sync_engine, "before_cursor_execute", self._before_execute)
+        event.listen(sync_engine, "after_cursor_execute", self._after_execute)
+        event.listen(sync_engine, "handle_error", self._handle_error)
+
+    def _before_execute(
+        self,
+        conn: Connection,
+        cursor: Any,
+        statement: str,
+        parameters: Any,
+        context: ExecutionContext,
+        executemany: bool,
+    ) -> None:
+        parent = get_current_span()
+
+        if parent is None:
+            return
+
+        operation = statement.lstrip().split(None, 1)[0].upper() if statement else ""
+
+        context._trace_span = parent.child(  # type: ignore
+            operation or "SQL",
+            kind=CLIENT,
+            attributes={"db.system": "postgresql", "db.statement": statement},
+        )
+
+    def _after_execute(
+        self,
+        conn: Connection,
+        cursor: Any,
+        statement: str,
+        parameters: Any,
+        context: ExecutionContext,
+        executemany: bool,
+    ) -> None:
+        span = getattr(context, "_trace_span", None)
+
+        if span is not None:
+            span.end()
+
+    def _handle_error(self, exception_context: ExceptionContext) -> None:
+        span = getattr(exception_context.execution_context, "_trace_span", None)
+
+        if span is not None:
+            span.end(error=exception_context.original_exception)
@@ -30,8 +30,9 @@ config.set_main_option("sqlalchemy.echo", str(settings.debug))
 
 # Interpret the config file for Python logging.
 # This line sets up loggers basically.
+# Keep loggers of the app enabled when migrations run in-process (e.g. tests).
 assert config.config_file_name
-fileConfig(config.config_file_name)
+fileConfig(config.config_file_name, disable_existing_loggers=False)
 
 # add your model's MetaData object here
 # for 'autogenerate' support
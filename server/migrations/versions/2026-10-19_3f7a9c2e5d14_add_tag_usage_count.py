@@ -0,0 +1,87 @@
+"""add-tag-usage-count
+
+Revision ID: 3f7a9c2e5d14
+Revises: 8d2f4a6c1b3e
+Create Date: 2026-10-19 18:05:12.734920
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "3f7a9c2e5d14"
+down_revision = "8d2f4a6c1b3e"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column(
+        "tag",
+        sa.Column("usage_count", sa.Integer(), server_default="0", nullable=False),
+    )
+
+    # Statement-level triggers, so that bulk changes (e.g. COPY) update each tag
+    # once rather than once per row.
+    for event, table, sign in [
+        ("INSERT", "new_rows", "+"),
+        ("DELETE", "old_rows", "-"),
+    ]:
+        op.execute(
+            f"""
+            CREATE FUNCTION tag_usage_count_{event.lower()}() RETURNS trigger AS $$
+            BEGIN
+                UPDATE tag
+                SET usage_count = tag.usage_count {sign} changes.n
+                FROM (
+                    SELECT tag_id, count(*) AS n
+                    FROM {table}
+                    GROUP BY tag_id
+                ) AS changes
+                WHERE tag.id = changes.tag_id;
+                RETURN NULL;
+            END;
+            $$ LANGUAGE plpgsql;
+            """
+        )
+
+        op.execute(
+            f"""
+            CREATE TRIGGER tag_usage_count_{event.lower()}
+            AFTER {event} ON dataset_tag
+            REFERENCING {"NEW" if event == "INSERT" else "OLD"} TABLE AS {table}
+            FOR EACH STATEMENT EXECUTE FUNCTION tag_usage_count_{event.lower()}();
+            """
+        )
+
+    # Backfill from existing datasets.
+    op.execute(
+        """
+        UPDATE tag
+        SET usage_count = usage.n
+        FROM (
+            SELECT tag_id, count(*) AS n
+            FROM dataset_tag
+            GROUP BY tag_id
+        ) AS usage
+        WHERE tag.id = usage.tag_id;
+        """
+    )
+
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm;")
+    op.create_index(
+        "ix_tag_name_trgm",
+        "tag",
+        [sa.text("lower(name) gin_trgm_ops")],
+        postgresql_using="GIN",
+    )
+
+
+def downgrade():
+    op.drop_index("ix_tag_name_trgm", table_name="tag")
+
+    for event in ("insert", "delete"):
+        op.execute(f"DROP TRIGGER tag_usage_count_{event} ON dataset_tag;")
+        op.execute(f"DROP FUNCTION tag_usage_count_{event}();")
+
+    op.drop_column("tag", "usage_count")
@@ -0,0 +1,37 @@
+"""add-account-api-token-hash
+
+Revision ID: 5c0e7d2b9a41
+Revises: e3b6a1f4c2d7
+Create Date: 2026-10-19 14:21:08.603114
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "5c0e7d2b9a41"
+down_revision = "e3b6a1f4c2d7"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column("account", sa.Column("api_token_hash", sa.CHAR(64), nullable=True))
+
+    # NOTE: must match hash_api_token().
+    op.execute(
+        """
+        UPDATE account
+        SET api_token_hash = encode(sha256(convert_to(api_token, 'UTF8')), 'hex');
+        """
+    )
+
+    op.alter_column("account", "api_token_hash", nullable=False)
+    op.create_index(
+        op.f("ix_account_api_token_hash"), "account", ["api_token_hash"], unique=True
+    )
+
+
+def downgrade():
+    op.drop_index(op.f("ix_account_api_token_hash"), table_name="account")
+    op.drop_column("account", "api_token_hash")
@@ -0,0 +1,63 @@
+"""lock-tags-in-order
+
+Revision ID: 7e4e7bb28cf8
+Revises: 3f7a9c2e5d14
+Create Date: 2026-10-19 21:12:44.208157
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "7e4e7bb28cf8"
+down_revision = "3f7a9c2e5d14"
+branch_labels = None
+depends_on = None
+
+
+def _create_functions(lock: bool) -> None:
+    for event, table, sign in [
+        ("INSERT", "new_rows", "+"),
+        ("DELETE", "old_rows", "-"),
+    ]:
+        # Lock tags in a fixed order first, as UPDATE ... FROM locks them in
+        # whatever order the plan produces: concurrent statements which change
+        # the same tags could deadlock otherwise.
+        lock_statement = (
+            f"""
+                PERFORM 1
+                FROM tag
+                WHERE id IN (SELECT tag_id FROM {table})
+                ORDER BY id
+                FOR NO KEY UPDATE;
+            """
+            if lock
+            else ""
+        )
+
+        op.execute(
+            f"""
+            CREATE OR REPLACE FUNCTION tag_usage_count_{event.lower()}()
+            RETURNS trigger AS $$
+            BEGIN
+                {lock_statement}
+                UPDATE tag
+                SET usage_count = tag.usage_count {sign} changes.n
+                FROM (
+                    SELECT tag_id, count(*) AS n
+                    FROM {table}
+                    GROUP BY tag_id
+                ) AS changes
+                WHERE tag.id = changes.tag_id;
+                RETURN NULL;
+            END;
+            $$ LANGUAGE plpgsql;
+            """
+        )
+
+
+def upgrade():
+    _create_functions(lock=True)
+
+
+def downgrade():
+    _create_functions(lock=False)
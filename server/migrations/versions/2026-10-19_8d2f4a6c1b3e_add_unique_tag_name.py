@@ -0,0 +1,67 @@
+"""add-unique-tag-name
+
+Revision ID: 8d2f4a6c1b3e
+Revises: 5c0e7d2b9a41
+Create Date: 2026-10-19 16:42:51.208113
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "8d2f4a6c1b3e"
+down_revision = "5c0e7d2b9a41"
+branch_labels = None
+depends_on = None
+
+# NOTE: must match normalize_tag_name().
+NORMALIZED_NAME = r"lower(btrim(regexp_replace(name, '\s+', ' ', 'g')))"
+
+
+def upgrade():
+    # Merge existing duplicates first, as in TagRepository.merge_duplicates().
+    op.execute(
+        f"""
+        WITH usage AS (
+            SELECT tag.id, {NORMALIZED_NAME} AS name, count(dataset_tag.dataset_id) AS n
+            FROM tag
+            LEFT JOIN dataset_tag ON dataset_tag.tag_id = tag.id
+            GROUP BY tag.id
+        ),
+        kept AS (
+            SELECT DISTINCT ON (name) id, name
+            FROM usage
+            ORDER BY name, n DESC, id
+        ),
+        merged AS (
+            SELECT usage.id, kept.id AS kept_id
+            FROM usage
+            JOIN kept ON kept.name = usage.name
+            WHERE usage.id <> kept.id
+        ),
+        relinked AS (
+            INSERT INTO dataset_tag (dataset_id, tag_id)
+            SELECT DISTINCT dataset_tag.dataset_id, merged.kept_id
+            FROM dataset_tag
+            JOIN merged ON merged.id = dataset_tag.tag_id
+            ON CONFLICT DO NOTHING
+        ),
+        unlinked AS (
+            DELETE FROM dataset_tag
+            WHERE tag_id IN (SELECT id FROM merged)
+        )
+        DELETE FROM tag
+        WHERE id IN (SELECT id FROM merged);
+        """
+    )
+
+    op.create_index(
+        "ix_tag_name_normalized",
+        "tag",
+        [sa.text(NORMALIZED_NAME)],
+        unique=True,
+    )
+
+
+def downgrade():
+    op.drop_index("ix_tag_name_normalized", table_name="tag")
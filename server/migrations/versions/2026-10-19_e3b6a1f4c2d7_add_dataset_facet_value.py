@@ -0,0 +1,124 @@
+"""add-dataset-facet-value
+
+Revision ID: e3b6a1f4c2d7
+Revises: a6fd9d9cdb24
+Create Date: 2026-10-19 10:02:37.418306
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "e3b6a1f4c2d7"
+down_revision = "a6fd9d9cdb24"
+branch_labels = None
+depends_on = None
+
+# Columns of the 'dataset' table whose distinct values are tracked.
+# NOTE: the facet name is the column name. Copy of `DATASET_FACETS` at this revision:
+# changes must go there, and in a new migration which updates the trigger.
+FACETS = ["geographical_coverage", "service", "technical_source", "license"]
+
+
+def upgrade():
+    op.create_table(
+        "dataset_facet_value",
+        sa.Column("facet", sa.String(), nullable=False),
+        sa.Column("value", sa.String(), nullable=False),
+        sa.Column("usage_count", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("facet", "value"),
+    )
+
+    op.execute(
+        """
+        CREATE FUNCTION dataset_facet_value_incr(_facet text, _value text)
+        RETURNS void AS $$
+        BEGIN
+            IF _value IS NULL THEN
+                RETURN;
+            END IF;
+
+            INSERT INTO dataset_facet_value (facet, value, usage_count)
+            VALUES (_facet, _value, 1)
+            ON CONFLICT (facet, value)
+            DO UPDATE SET usage_count = dataset_facet_value.usage_count + 1;
+        END;
+        $$ LANGUAGE plpgsql;
+        """
+    )
+
+    op.execute(
+        """
+        CREATE FUNCTION dataset_facet_value_decr(_facet text, _value text)
+        RETURNS void AS $$
+        BEGIN
+            IF _value IS NULL THEN
+                RETURN;
+            END IF;
+
+            UPDATE dataset_facet_value
+            SET usage_count = usage_count - 1
+            WHERE facet = _facet AND value = _value;
+
+            DELETE FROM dataset_facet_value
+            WHERE facet = _facet AND value = _value AND usage_count <= 0;
+        END;
+        $$ LANGUAGE plpgsql;
+        """
+    )
+
+    sync_statements = "\n".join(
+        f"""
+            IF TG_OP = 'DELETE' OR (
+                TG_OP = 'UPDATE' AND OLD.{facet} IS DISTINCT FROM NEW.{facet}
+            ) THEN
+                PERFORM dataset_facet_value_decr('{facet}', OLD.{facet});
+            END IF;
+
+            IF TG_OP = 'INSERT' OR (
+                TG_OP = 'UPDATE' AND OLD.{facet} IS DISTINCT FROM NEW.{facet}
+            ) THEN
+                PERFORM dataset_facet_value_incr('{facet}', NEW.{facet});
+            END IF;
+        """
+        for facet in FACETS
+    )
+
+    op.execute(
+        f"""
+        CREATE FUNCTION dataset_facet_value_sync() RETURNS trigger AS $$
+        BEGIN
+            {sync_statements}
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+        """
+    )
+
+    op.execute(
+        f"""
+        CREATE TRIGGER dataset_facet_value_sync
+        AFTER INSERT OR DELETE OR UPDATE OF {", ".join(FACETS)} ON dataset
+        FOR EACH ROW EXECUTE FUNCTION dataset_facet_value_sync();
+        """
+    )
+
+    # Backfill from existing datasets.
+    for facet in FACETS:
+        op.execute(
+            f"""
+            INSERT INTO dataset_facet_value (facet, value, usage_count)
+            SELECT '{facet}', {facet}, count(*)
+            FROM dataset
+            WHERE {facet} IS NOT NULL
+            GROUP BY {facet};
+            """
+        )
+
+
+def downgrade():
+    op.execute("DROP TRIGGER dataset_facet_value_sync ON dataset;")
+    op.execute("DROP FUNCTION dataset_facet_value_sync();")
+    op.execute("DROP FUNCTION dataset_facet_value_decr(text, text);")
+    op.execute("DROP FUNCTION dataset_facet_value_incr(text, text);")
+    op.drop_table("dataset_facet_value")
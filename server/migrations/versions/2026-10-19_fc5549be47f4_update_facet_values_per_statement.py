@@ -0,0 +1,129 @@
+"""update-facet-values-per-statement
+
+Revision ID: fc5549be47f4
+Revises: 7e4e7bb28cf8
+Create Date: 2026-10-19 21:48:03.551920
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "fc5549be47f4"
+down_revision = "7e4e7bb28cf8"
+branch_labels = None
+depends_on = None
+
+# NOTE: Copy of `DATASET_FACETS` at this revision: changes must go there, and in a
+# new migration which updates the triggers.
+FACETS = ["geographical_coverage", "service", "technical_source", "license"]
+
+EVENTS = [
+    ("INSERT", "REFERENCING NEW TABLE AS new_rows", [("new_rows", "+")]),
+    (
+        "UPDATE",
+        "REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows",
+        [("old_rows", "-"), ("new_rows", "+")],
+    ),
+    ("DELETE", "REFERENCING OLD TABLE AS old_rows", [("old_rows", "-")]),
+]
+
+
+def _changes(tables: list) -> str:
+    return " UNION ALL ".join(
+        f"""
+        SELECT '{facet}' AS facet, {facet} AS value, {sign}1 AS delta
+        FROM {table}
+        WHERE {facet} IS NOT NULL
+        """
+        for table, sign in tables
+        for facet in FACETS
+    )
+
+
+def upgrade():
+    # Row-level triggers changed facet values one at a time, e.g. decrementing the
+    # old value then incrementing the new one. Concurrent transactions could then
+    # lock the same values in opposite orders, and deadlock. Statement-level
+    # triggers apply the net change of each value in (facet, value) order instead,
+    # and bulk changes update each value once.
+    op.execute("DROP TRIGGER dataset_facet_value_sync ON dataset;")
+    op.execute("DROP FUNCTION dataset_facet_value_sync();")
+
+    for event, referencing, tables in EVENTS:
+        changes = _changes(tables)
+
+        op.execute(
+            f"""
+            CREATE FUNCTION dataset_facet_value_{event.lower()}()
+            RETURNS trigger AS $$
+            BEGIN
+                INSERT INTO dataset_facet_value AS f (facet, value, usage_count)
+                SELECT facet, value, sum(delta)
+                FROM ({changes}) AS changes
+                GROUP BY facet, value
+                HAVING sum(delta) <> 0
+                ORDER BY facet, value
+                ON CONFLICT (facet, value)
+                DO UPDATE SET usage_count = f.usage_count + EXCLUDED.usage_count;
+
+                -- Values used by no dataset are removed. (Already locked above.)
+                DELETE FROM dataset_facet_value
+                WHERE usage_count <= 0
+                AND (facet, value) IN (SELECT facet, value FROM ({changes}) AS c);
+
+                RETURN NULL;
+            END;
+            $$ LANGUAGE plpgsql;
+            """
+        )
+
+        op.execute(
+            f"""
+            CREATE TRIGGER dataset_facet_value_{event.lower()}
+            AFTER {event} ON dataset
+            {referencing}
+            FOR EACH STATEMENT EXECUTE FUNCTION dataset_facet_value_{event.lower()}();
+            """
+        )
+
+
+def downgrade():
+    for event, _, _ in EVENTS:
+        op.execute(f"DROP TRIGGER dataset_facet_value_{event.lower()} ON dataset;")
+        op.execute(f"DROP FUNCTION dataset_facet_value_{event.lower()}();")
+
+    sync_statements = "\n".join(
+        f"""
+            IF TG_OP = 'DELETE' OR (
+                TG_OP = 'UPDATE' AND OLD.{facet} IS DISTINCT FROM NEW.{facet}
+            ) THEN
+                PERFORM dataset_facet_value_decr('{facet}', OLD.{facet});
+            END IF;
+
+            IF TG_OP = 'INSERT' OR (
+                TG_OP = 'UPDATE' AND OLD.{facet} IS DISTINCT FROM NEW.{facet}
+            ) THEN
+                PERFORM dataset_facet_value_incr('{facet}', NEW.{facet});
+            END IF;
+        """
+        for facet in FACETS
+    )
+
+    op.execute(
+        f"""
+        CREATE FUNCTION dataset_facet_value_sync() RETURNS trigger AS $$
+        BEGIN
+            {sync_statements}
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+        """
+    )
+
+    op.execute(
+        f"""
+        CREATE TRIGGER dataset_facet_value_sync
+        AFTER INSERT OR DELETE OR UPDATE OF {", ".join(FACETS)} ON dataset
+        FOR EACH ROW EXECUTE FUNCTION dataset_facet_value_sync();
+        """
+    )
@@ -0,0 +1,16 @@
+import datetime as dt
+from typing import List, Type
+
+from pydantic import BaseModel
+
+from .commands import Command
+
+
+class QueryCachePolicy(BaseModel):
+    """
+    Declare that results of a query may be cached for up to `max_age`, and must
+    be invalidated when any of the `invalidated_by` commands is executed.
+    """
+
+    max_age: dt.timedelta
+    invalidated_by: List[Type[Command]] = []
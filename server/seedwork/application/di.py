@@ -1,4 +1,4 @@
-from typing import Callable, Optional, Type, TypeVar
+from typing import Any, Callable, Dict, List, Optional, Type, TypeVar
 
 import punq
 
@@ -8,6 +8,9 @@ T = TypeVar("T")
 class Container:
     """
     Implements a configurable DI container.
+
+    Once configured, registered instances are frozen into a flat lookup table, so
+    that `resolve()` is a plain dictionary access.
     """
 
     def __init__(
@@ -15,10 +18,22 @@ class Container:
     ) -> None:
         self._impl: Optional[punq.Container] = None
         self._configure = configure
+        self._types: List[Any] = []
+        self._instances: Dict[Any, Any] = {}
+        self._frozen = False
 
     def bootstrap(self) -> None:
         self._impl = punq.Container()
+        self._types = []
+        self._instances = {}
+        self._frozen = False
         self._configure(self)
+        self._freeze()
+
+    def _freeze(self) -> None:
+        assert self._impl is not None
+        self._instances = {type_: self._impl.resolve(type_) for type_ in self._types}
+        self._frozen = True
 
     def register_instance(self, type_: Type[T], instance: T) -> None:
         """
@@ -26,12 +41,18 @@ class Container:
         """
         assert self._impl is not None
         self._impl.register(type_, instance=instance)
+        self._types.append(type_)
+
+        if self._frozen:
+            self._instances[type_] = instance
 
     def resolve(self, type_: Type[T]) -> T:
+        try:
+            return self._instances[type_]
+        except KeyError:
+            pass
+
         if self._impl is None:
             raise RuntimeError("Container not ready. Please call bootstrap()")
 
-        try:
-            return self._impl.resolve(type_)
-        except punq.MissingDependencyError:
-            raise RuntimeError(f"Failed to resolve implementation for {type_}")
+        raise RuntimeError(f"Failed to resolve implementation for {type_}")
@@ -0,0 +1,22 @@
+from typing import Any, Awaitable, Callable, Union
+
+from .commands import Command
+from .queries import Query
+
+Message = Union[Command, Query]
+
+CallNext = Callable[..., Awaitable]
+
+
+class MessageBusMiddleware:
+    """
+    Wrap the execution of commands and queries by the message bus.
+
+    Implementations must call `call_next(message, **kwargs)` to continue
+    down the chain, unless they produce the result themselves.
+    """
+
+    async def __call__(
+        self, message: Message, call_next: CallNext, **kwargs: Any
+    ) -> Any:
+        raise NotImplementedError  # pragma: no cover
@@ -1,12 +1,14 @@
 import importlib
 from typing import ClassVar, List
 
-from .types import CommandHandlers, QueryHandlers
+from .types import CachedQueries, CoalescedQueries, CommandHandlers, QueryHandlers
 
 
 class Module:
     command_handlers: ClassVar[CommandHandlers] = {}
     query_handlers: ClassVar[QueryHandlers] = {}
+    cached_queries: ClassVar[CachedQueries] = {}
+    coalesced_queries: ClassVar[CoalescedQueries] = set()
 
 
 def load_modules(paths: List[str]) -> List[Module]:
@@ -1,8 +1,13 @@
-from typing import Awaitable, Callable, Dict, Type
+from typing import Awaitable, Callable, Dict, Set, Type
 
+from .caching import QueryCachePolicy
 from .commands import Command
 from .queries import Query
 
 CommandHandlers = Dict[Type[Command], Callable[..., Awaitable]]
 
 QueryHandlers = Dict[Type[Query], Callable[..., Awaitable]]
+
+CachedQueries = Dict[Type[Query], QueryCachePolicy]
+
+CoalescedQueries = Set[Type[Query]]
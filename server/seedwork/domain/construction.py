@@ -0,0 +1,58 @@
+import functools
+from typing import Any, List, Optional, Tuple, Type, TypeVar
+
+from pydantic import BaseModel
+from pydantic.fields import SHAPE_LIST
+
+M = TypeVar("M", bound=BaseModel)
+
+
+@functools.lru_cache(maxsize=None)
+def _get_construct_plan(
+    model_cls: Type[BaseModel],
+) -> List[Tuple[str, Optional[Type[BaseModel]], bool]]:
+    plan = []
+
+    for name, field in model_cls.__fields__.items():
+        type_ = field.type_
+        nested = (
+            type_ if isinstance(type_, type) and issubclass(type_, BaseModel) else None
+        )
+        plan.append((name, nested, field.shape == SHAPE_LIST))
+
+    return plan
+
+
+def _construct_nested(model_cls: Type[M], value: Any) -> M:
+    return value if isinstance(value, model_cls) else construct_from(model_cls, value)
+
+
+def construct_from(model_cls: Type[M], obj: Any, **values: Any) -> M:
+    """
+    Build a model from the attributes of `obj` (e.g. an ORM instance, or an entity
+    for a view), plus any given `values`. Nested models are built likewise.
+
+    No validation is performed: only use this for trusted data, such as data read
+    from our database, which was validated when it was written.
+    """
+    for name, nested, is_list in _get_construct_plan(model_cls):
+        if name in values:
+            continue
+
+        try:
+            value = getattr(obj, name)
+        except AttributeError:
+            continue  # Use the default, if any.
+
+        if is_list:
+            value = (
+                [_construct_nested(nested, item) for item in value]
+                if nested is not None
+                else list(value)
+            )
+        elif nested is not None and value is not None:
+            value = _construct_nested(nested, value)
+
+        values[name] = value
+
+    return model_cls.construct(**values)
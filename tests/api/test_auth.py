@@ -2,14 +2,16 @@ from typing import Callable, List
 
 import httpx
 import pytest
-from pydantic import EmailStr
+from pydantic import EmailStr, SecretStr
 
+from server.application.auth.passwords import PasswordEncoder
 from server.application.auth.queries import GetAccountByEmail
 from server.application.organizations.views import OrganizationView
 from server.config.di import resolve
-from server.domain.auth.exceptions import AccountDoesNotExist
+from server.domain.auth.exceptions import AccountDoesNotExist, PasswordEncoderBusy
 from server.domain.common.types import id_factory
 from server.domain.organizations.types import Siret
+from server.infrastructure.auth.caching import RejectedApiTokenCache
 from server.seedwork.application.messages import MessageBus
 
 from ..factories import CreateOrganizationFactory, fake
@@ -193,6 +195,23 @@ async def test_login_failed(
     assert data["detail"] == "Invalid credentials"
 
 
+@pytest.mark.asyncio
+async def test_login_password_encoder_busy(
+    client: httpx.AsyncClient,
+    temp_user: TestPasswordUser,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    async def verify(password: SecretStr, hash: str) -> bool:
+        raise PasswordEncoderBusy()
+
+    monkeypatch.setattr(resolve(PasswordEncoder), "verify", verify)
+
+    payload = {"email": temp_user.account.email, "password": temp_user.password}
+    response = await client.post("/auth/login/", json=payload)
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+
+
 @pytest.mark.asyncio
 async def test_get_connected_user(
     client: httpx.AsyncClient, temp_user: TestPasswordUser
@@ -232,6 +251,20 @@ async def test_get_connected_user_failed(
     assert data["detail"] == "Invalid credentials"
 
 
+@pytest.mark.asyncio
+async def test_repeated_bad_token_skips_database(client: httpx.AsyncClient) -> None:
+    rejected_api_tokens = resolve(RejectedApiTokenCache)
+    hits = rejected_api_tokens.hits
+
+    headers = {"Authorization": "Bearer badtoken"}
+
+    for _ in range(3):
+        response = await client.get("/auth/users/me/", headers=headers)
+        assert response.status_code == 401
+
+    assert rejected_api_tokens.hits == hits + 2
+
+
 @pytest.mark.asyncio
 async def test_delete_user(
     client: httpx.AsyncClient, temp_user: TestPasswordUser, admin_user: TestPasswordUser
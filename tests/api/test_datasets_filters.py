@@ -281,3 +281,55 @@ async def test_dataset_filters_license_any(
         str(dataset2_id),
         str(dataset1_id),
     ]
+
+
+@pytest.mark.asyncio
+async def test_dataset_filters_caching(
+    client: httpx.AsyncClient, temp_org: OrganizationView, temp_user: TestPasswordUser
+) -> None:
+    bus = resolve(MessageBus)
+
+    response = await client.get("/datasets/filters/", auth=temp_user.auth)
+    assert response.status_code == 200
+    assert response.headers["Cache-Control"] == "private, no-cache"
+    etag = response.headers["ETag"]
+    assert "Same example service" not in response.json()["service"]
+
+    # Clients can revalidate their copy.
+    response = await client.get(
+        "/datasets/filters/", headers={"If-None-Match": etag}, auth=temp_user.auth
+    )
+    assert response.status_code == 304
+    assert response.headers["ETag"] == etag
+    assert not response.content
+
+    response = await client.get(
+        "/datasets/filters/",
+        headers={"If-None-Match": f"W/{etag}"},
+        auth=temp_user.auth,
+    )
+    assert response.status_code == 304
+
+    # Only a single weak indicator is stripped.
+    response = await client.get(
+        "/datasets/filters/",
+        headers={"If-None-Match": f"W/W/{etag}"},
+        auth=temp_user.auth,
+    )
+    assert response.status_code == 200
+
+    # Writes invalidate the cache.
+    await bus.execute(
+        CreateDatasetFactory.build(
+            account=temp_user.account,
+            organization_siret=temp_org.siret,
+            service="Same example service",
+        )
+    )
+
+    response = await client.get(
+        "/datasets/filters/", headers={"If-None-Match": etag}, auth=temp_user.auth
+    )
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert "Same example service" in response.json()["service"]
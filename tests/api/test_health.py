@@ -0,0 +1,141 @@
+import asyncio
+import csv
+import io
+
+import httpx
+import pytest
+import uvicorn
+from fastapi import FastAPI
+
+from server.api.health.routes import router as health_router
+from server.api.lifecycle import warm_up
+from server.application.catalogs.commands import CreateCatalog
+from server.application.datasets.caching import DatasetFiltersCache
+from server.config.di import resolve
+from server.config.settings import Settings
+from server.domain.common.types import Skip
+from server.infrastructure.catalogs.caching import ExportCache
+from server.infrastructure.lifecycle import Lifecycle, LifecycleState
+from server.infrastructure.server import Server
+from server.seedwork.application.messages import MessageBus
+
+from ..factories import CreateDatasetFactory, CreateOrganizationFactory
+
+
+@pytest.mark.asyncio
+async def test_readiness(client: httpx.AsyncClient) -> None:
+    lifecycle = resolve(Lifecycle)
+    # The app has warmed up on startup.
+    assert lifecycle.state == LifecycleState.READY
+
+    response = await client.get("/health/ready")
+    assert response.status_code == 200
+    assert response.json() == {"status": "ready"}
+
+    for state in (LifecycleState.STARTING, LifecycleState.DRAINING):
+        lifecycle.state = state
+        try:
+            response = await client.get("/health/ready")
+        finally:
+            lifecycle.state = LifecycleState.READY
+        assert response.status_code == 503
+        assert response.json() == {"status": state.value}
+
+
+@pytest.mark.asyncio
+async def test_warm_up_fills_caches(monkeypatch: pytest.MonkeyPatch) -> None:
+    # Other tests may have created catalogs.
+    monkeypatch.setattr(resolve(Settings), "warmup_exports", 1000)
+
+    bus = resolve(MessageBus)
+    siret = await bus.execute(CreateOrganizationFactory.build())
+    await bus.execute(CreateCatalog(organization_siret=siret))
+    await bus.execute(
+        CreateDatasetFactory.build(account=Skip(), organization_siret=siret)
+    )
+
+    await warm_up()
+
+    assert resolve(DatasetFiltersCache).get() is not None
+    export = resolve(ExportCache).get(siret)
+    assert export is not None
+    assert len(list(csv.reader(io.StringIO(export)))) == 2  # Header, dataset
+
+
+@pytest.mark.asyncio
+async def test_lifecycle_warm_up_continues_in_background() -> None:
+    lifecycle = Lifecycle()
+    done = asyncio.Event()
+
+    async def slow_warm_up() -> None:
+        await done.wait()
+
+    await lifecycle.warm_up(slow_warm_up, timeout=0.01)
+    assert lifecycle.state == LifecycleState.STARTING
+
+    done.set()
+    await asyncio.sleep(0.01)
+    assert lifecycle.state == LifecycleState.READY
+
+
+@pytest.mark.asyncio
+async def test_lifecycle_warm_up_failure() -> None:
+    lifecycle = Lifecycle()
+
+    async def failing_warm_up() -> None:
+        raise RuntimeError("Database is down")
+
+    await lifecycle.warm_up(failing_warm_up, timeout=1)
+    # Requests may still be served.
+    assert lifecycle.state == LifecycleState.READY
+
+
+def test_lifecycle_drain() -> None:
+    lifecycle = Lifecycle()
+    lifecycle.state = LifecycleState.READY
+
+    lifecycle.drain()
+    assert lifecycle.state == LifecycleState.DRAINING
+    assert not lifecycle.is_ready
+
+
+@pytest.mark.asyncio
+async def test_server_drains_before_closing_listener(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(resolve(Settings), "shutdown_delay", 0.5)
+    lifecycle = resolve(Lifecycle)
+
+    app = FastAPI()
+    app.include_router(health_router)
+
+    config = uvicorn.Config(app, port=0, lifespan="off", log_config=None)
+    server = Server(config)
+    monkeypatch.setattr(server, "install_signal_handlers", lambda: None)
+
+    task = asyncio.ensure_future(server.serve())
+
+    try:
+        while not server.started:
+            await asyncio.sleep(0.01)
+
+        (port,) = {sock.getsockname()[1] for s in server.servers for sock in s.sockets}
+        url = f"http://127.0.0.1:{port}/health/ready"
+
+        async with httpx.AsyncClient() as client:
+            response = await client.get(url)
+            assert response.status_code == 200
+
+            # Stop, as on SIGTERM.
+            server.should_exit = True
+            await asyncio.sleep(0.2)
+
+            # Still listening, but no longer ready.
+            response = await client.get(url)
+            assert response.status_code == 503
+            assert response.json() == {"status": "draining"}
+
+        await asyncio.wait_for(task, 5)
+    finally:
+        lifecycle.state = LifecycleState.READY
+        task.cancel()
@@ -0,0 +1,85 @@
+import logging
+import os
+
+import httpx
+import pytest
+
+from server.config.di import resolve
+from server.config.settings import Settings
+
+from ..helpers import TestPasswordUser
+
+
+@pytest.mark.asyncio
+async def test_metrics(client: httpx.AsyncClient, temp_user: TestPasswordUser) -> None:
+    response = await client.get("/datasets/", auth=temp_user.auth)
+    assert response.status_code == 200
+
+    response = await client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["Content-Type"].startswith("text/plain; version=0.0.4")
+
+    lines = response.text.splitlines()
+
+    # Samples of each worker process are told apart.
+    pid = f'pid="{os.getpid()}"'
+
+    assert any(
+        line.startswith(
+            f'http_request_duration_seconds_count{{{pid},method="GET",'
+            'route="/datasets/",status="200"}'
+        )
+        for line in lines
+    )
+    assert f"http_requests_in_flight{{{pid}}} 1" in lines  # This request.
+    assert any(
+        line.startswith(f"db_query_duration_seconds_count{{{pid}}} ") for line in lines
+    )
+    assert any(line.startswith(f"db_pool_size{{{pid}}} ") for line in lines)
+    assert any(
+        line.startswith(
+            f'bus_message_duration_seconds_count{{{pid},message="GetAllDatasets"}}'
+        )
+        for line in lines
+    )
+    assert any(line.startswith(f"export_cache_hits_total{{{pid}}} ") for line in lines)
+    assert any(
+        line.startswith(f"event_loop_lag_seconds_count{{{pid}}} ") for line in lines
+    )
+    assert f"process_info{{{pid}}} 1" in lines
+
+
+@pytest.mark.asyncio
+async def test_metrics_unmatched_route(client: httpx.AsyncClient) -> None:
+    response = await client.get("/does-not-exist/")
+    assert response.status_code == 404
+
+    response = await client.get("/metrics")
+    assert any(
+        line.startswith(
+            f'http_request_duration_seconds_count{{pid="{os.getpid()}",method="GET",'
+            'route="<unmatched>",status="404"}'
+        )
+        for line in response.text.splitlines()
+    )
+
+
+@pytest.mark.asyncio
+async def test_query_budget_warning(
+    client: httpx.AsyncClient,
+    temp_user: TestPasswordUser,
+    monkeypatch: pytest.MonkeyPatch,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    monkeypatch.setattr(resolve(Settings), "db_query_budget", 0)
+
+    with caplog.at_level(logging.WARNING, logger="server.api.metrics.middleware"):
+        response = await client.get("/datasets/", auth=temp_user.auth)
+        assert response.status_code == 200
+
+    assert any(
+        record.getMessage().startswith(
+            "Request exceeded SQL query budget: GET /datasets/ issued"
+        )
+        for record in caplog.records
+    )
@@ -0,0 +1,106 @@
+import pstats
+from pathlib import Path
+
+import httpx
+import pytest
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+
+from server.api.auth.permissions import HasSignedToken
+from server.api.debugging.profiling import ProfilingMiddleware, make_profiling_token
+from server.config.di import resolve
+from server.config.settings import Settings
+from server.infrastructure.auth.passwords import ItsDangerousProfilingSigner
+
+from ..factories import CreateDataPassUserFactory, CreateOrganizationFactory
+from ..helpers import to_payload
+
+
+async def _hello(request: Request) -> PlainTextResponse:
+    return PlainTextResponse("Hello")
+
+
+def _make_client(directory: Path, sample_rate: float = 0) -> httpx.AsyncClient:
+    app = Starlette(routes=[Route("/hello/", _hello)])
+    app.add_middleware(
+        ProfilingMiddleware, directory=str(directory), sample_rate=sample_rate
+    )
+    return httpx.AsyncClient(app=app, base_url="http://testserver")
+
+
+@pytest.mark.asyncio
+async def test_profiling_signed_token(tmp_path: Path) -> None:
+    token = make_profiling_token()
+
+    async with _make_client(tmp_path) as client:
+        response = await client.get("/hello/")
+        assert response.status_code == 200
+        assert "X-Profile-Id" not in response.headers
+        assert not list(tmp_path.iterdir())
+
+        response = await client.get("/hello/", headers={"X-Profile": "invalid"})
+        assert "X-Profile-Id" not in response.headers
+        assert not list(tmp_path.iterdir())
+
+        response = await client.get("/hello/", headers={"X-Profile": token})
+        assert response.status_code == 200
+        assert response.text == "Hello"
+        profile_id = response.headers["X-Profile-Id"]
+
+        response = await client.get("/hello/", params={"profile": token})
+        assert "X-Profile-Id" in response.headers
+
+    assert len(list(tmp_path.iterdir())) == 2
+    (path,) = tmp_path.glob(f"{profile_id}_*")
+    assert path.name == f"{profile_id}_GET_hello.prof"
+
+    stats = pstats.Stats(str(path))
+    assert any(func[2] == "_hello" for func in stats.stats)  # type: ignore
+
+
+@pytest.mark.asyncio
+async def test_profiling_sampling(tmp_path: Path) -> None:
+    async with _make_client(tmp_path, sample_rate=1) as client:
+        response = await client.get("/hello/")
+        assert "X-Profile-Id" in response.headers
+
+    assert len(list(tmp_path.iterdir())) == 1
+
+
+@pytest.mark.asyncio
+async def test_profiling_token_is_not_a_signed_token(
+    tmp_path: Path, client: httpx.AsyncClient
+) -> None:
+    async with _make_client(tmp_path) as profiled_client:
+        response = await profiled_client.get(
+            "/hello/", headers={"X-Profile": HasSignedToken.make_signed_token()}
+        )
+        assert "X-Profile-Id" not in response.headers
+
+    assert not list(tmp_path.iterdir())
+
+    payload = to_payload(
+        CreateDataPassUserFactory.build(
+            organization_siret=CreateOrganizationFactory.build().siret
+        )
+    )
+    response = await client.post(
+        "/auth/datapass/users/",
+        json=payload,
+        headers={"X-Signed-Token": make_profiling_token()},
+    )
+    assert response.status_code == 403
+
+
+def test_profiling_token_expires() -> None:
+    settings = resolve(Settings)
+    token = make_profiling_token().encode()
+
+    signer = ItsDangerousProfilingSigner(settings)
+    assert signer.verify(token)
+
+    expired = settings.copy(update={"profiling_token_max_age": -1})
+    signer = ItsDangerousProfilingSigner(expired)
+    assert not signer.verify(token)
@@ -1,6 +1,25 @@
+import os
+
+import pytest
+
+from server.application.datasets.caching import DatasetFiltersCache
+from server.application.licenses.queries import GetLicenseSet
 from server.config import Settings
-from server.config.di import resolve
-from server.infrastructure.server import get_server_config
+from server.config.di import configure, resolve
+from server.domain.auth.entities import Account, UserRole
+from server.domain.common.types import id_factory
+from server.domain.organizations.types import Siret
+from server.infrastructure.adapters.middleware import QueryCachingMiddleware
+from server.infrastructure.auth.caching import ApiTokenCache
+from server.infrastructure.database import Database
+from server.infrastructure.datasets.caching import NoDatasetFiltersCache
+from server.infrastructure.server import (
+    get_gunicorn_options,
+    get_server_config,
+    get_worker_config_kwargs,
+)
+from server.seedwork.application.di import Container
+from server.seedwork.application.messages import MessageBus
 
 
 def test_server_config_local() -> None:
@@ -23,3 +42,74 @@ def test_server_config_live() -> None:
     assert config.port == 3579
     assert config.proxy_headers
     assert config.root_path == "/api"
+
+
+def test_gunicorn_options() -> None:
+    settings = resolve(Settings).copy(
+        update={
+            "server_mode": "live",
+            "workers": 4,
+            "loop": "uvloop",
+            "http": "httptools",
+            "max_requests": 1000,
+            "preload": True,
+        }
+    )
+
+    options = get_gunicorn_options(settings)
+
+    assert options["bind"] == "localhost:3579"
+    assert options["workers"] == 4
+    assert options["max_requests"] == 1000
+    assert options["preload_app"]
+
+    assert options["worker_class"] == "server.infrastructure.server.UvicornWorker"
+
+    config_kwargs = get_worker_config_kwargs(settings)
+    assert config_kwargs["loop"] == "uvloop"
+    assert config_kwargs["http"] == "httptools"
+    assert config_kwargs["proxy_headers"]
+    assert config_kwargs["root_path"] == "/api"
+
+
+def test_gunicorn_options_workers_per_cpu() -> None:
+    settings = resolve(Settings).copy(update={"server_mode": "live", "workers": 0})
+
+    options = get_gunicorn_options(settings)
+
+    assert options["workers"] == (os.cpu_count() or 1)
+
+
+@pytest.mark.asyncio
+async def test_write_invalidated_caches_disabled_with_several_workers(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setenv("APP_SERVER_MODE", "live")
+    monkeypatch.setenv("APP_WORKERS", "2")
+
+    container = Container(configure)
+    container.bootstrap()
+    assert container.resolve(Settings).processes == 2
+
+    assert isinstance(container.resolve(DatasetFiltersCache), NoDatasetFiltersCache)
+
+    api_token_cache = container.resolve(ApiTokenCache)
+    account = Account(
+        id=id_factory(),
+        organization_siret=Siret("11122233344441"),
+        email="john@mydomain.org",
+        role=UserRole.USER,
+        api_token="token",
+    )
+    api_token_cache.set("hash", account, version=api_token_cache.version)
+    assert api_token_cache.get("hash") is None
+
+    bus = container.resolve(MessageBus)
+    query_caching = container.resolve(QueryCachingMiddleware)
+
+    try:
+        await bus.execute(GetLicenseSet())
+        await bus.execute(GetLicenseSet())
+        assert query_caching.hits == 0
+    finally:
+        await container.resolve(Database).dispose()
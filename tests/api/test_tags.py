@@ -1,11 +1,21 @@
+from typing import List
+
 import httpx
 import pytest
 
+from server.application.catalogs.commands import CreateCatalog
+from server.application.datasets.commands import DeleteDataset
 from server.application.tags.commands import CreateTag
 from server.config.di import resolve
+from server.domain.common.types import ID, Skip
 from server.seedwork.application.messages import MessageBus
 
-from ..helpers import TestPasswordUser
+from ..factories import (
+    CreateDatasetFactory,
+    CreateOrganizationFactory,
+    UpdateDatasetPayloadFactory,
+)
+from ..helpers import TestPasswordUser, to_payload
 
 
 @pytest.mark.asyncio
@@ -16,23 +26,168 @@ async def test_tags_list(
 
     response = await client.get("/tags/", auth=temp_user.auth)
     assert response.status_code == 200
-    assert response.json() == []
+    assert response.json() == {
+        "items": [],
+        "total_items": 0,
+        "page_size": 10,
+        "total_pages": 0,
+    }
 
     id_services = await bus.execute(CreateTag(name="services"))
     id_architecture = await bus.execute(CreateTag(name="architecture"))
 
     response = await client.get("/tags/", auth=temp_user.auth)
     assert response.status_code == 200
-    assert response.json() == [
-        {
-            "id": str(id_architecture),
-            "name": "architecture",
-        },
-        {
-            "id": str(id_services),
-            "name": "services",
-        },
-    ]
+    assert response.json() == {
+        "items": [
+            {
+                "id": str(id_architecture),
+                "name": "architecture",
+                "usage_count": 0,
+            },
+            {
+                "id": str(id_services),
+                "name": "services",
+                "usage_count": 0,
+            },
+        ],
+        "total_items": 2,
+        "page_size": 10,
+        "total_pages": 1,
+    }
+
+
+@pytest.mark.asyncio
+async def test_tags_list_pagination(
+    client: httpx.AsyncClient, temp_user: TestPasswordUser
+) -> None:
+    bus = resolve(MessageBus)
+
+    for k in range(5):
+        await bus.execute(CreateTag(name=f"Tag {k}"))
+
+    params = {"page_number": 2, "page_size": 2}
+    response = await client.get("/tags/", params=params, auth=temp_user.auth)
+    assert response.status_code == 200
+    data = response.json()
+    assert [item["name"] for item in data["items"]] == ["Tag 2", "Tag 3"]
+    assert data["total_items"] == 5
+    assert data["total_pages"] == 3
+
+    params = {"page_size": 1001}
+    response = await client.get("/tags/", params=params, auth=temp_user.auth)
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "q, expected_names",
+    [
+        pytest.param("chemin", ["Chemin de fer", "Cheminée"], id="prefix"),
+        pytest.param("CHEM", ["Chemin de fer", "Cheminée"], id="case-insensitive"),
+        pytest.param("fer", ["Chemin de fer"], id="word"),
+        pytest.param("enviromnement", ["Environnement"], id="typo"),
+        pytest.param("%", [], id="like-wildcards-escaped"),
+    ],
+)
+async def test_tags_search(
+    client: httpx.AsyncClient,
+    temp_user: TestPasswordUser,
+    q: str,
+    expected_names: List[str],
+) -> None:
+    bus = resolve(MessageBus)
+
+    for name in ("Environnement", "Cheminée", "Chemin de fer", "Population"):
+        await bus.execute(CreateTag(name=name))
+
+    response = await client.get("/tags/", params={"q": q}, auth=temp_user.auth)
+    assert response.status_code == 200
+    data = response.json()
+    assert [item["name"] for item in data["items"]] == expected_names
+    assert data["total_items"] == len(expected_names)
+
+
+@pytest.mark.asyncio
+async def test_tags_search_prefix_matches_first(
+    client: httpx.AsyncClient, temp_user: TestPasswordUser
+) -> None:
+    bus = resolve(MessageBus)
+
+    await bus.execute(CreateTag(name="Eau potable"))
+    await bus.execute(CreateTag(name="Service des eaux"))
+
+    response = await client.get("/tags/", params={"q": "eau"}, auth=temp_user.auth)
+    assert response.status_code == 200
+    names = [item["name"] for item in response.json()["items"]]
+    assert names == ["Eau potable", "Service des eaux"]
+
+
+@pytest.mark.asyncio
+async def test_tags_usage_count(
+    client: httpx.AsyncClient, temp_user: TestPasswordUser
+) -> None:
+    bus = resolve(MessageBus)
+
+    siret = temp_user.account.organization_siret
+    id_a = await bus.execute(CreateTag(name="a"))
+    id_b = await bus.execute(CreateTag(name="b"))
+    id_c = await bus.execute(CreateTag(name="c"))
+
+    async def get_usage_counts() -> List[tuple]:
+        response = await client.get(
+            "/tags/", params={"sort": "usage"}, auth=temp_user.auth
+        )
+        assert response.status_code == 200
+        return [
+            (item["name"], item["usage_count"]) for item in response.json()["items"]
+        ]
+
+    dataset_ids: List[ID] = []
+    for tag_ids in ([id_b], [id_b, id_c], [id_b, id_c]):
+        command = CreateDatasetFactory.build(
+            account=Skip(), organization_siret=siret, tag_ids=tag_ids
+        )
+        dataset_ids.append(await bus.execute(command))
+
+    assert await get_usage_counts() == [("b", 3), ("c", 2), ("a", 0)]
+
+    # Changing tags of a dataset updates counts.
+    payload = to_payload(
+        UpdateDatasetPayloadFactory.build_from_create_command(
+            command.copy(update={"tag_ids": [id_a]})
+        )
+    )
+    response = await client.put(
+        f"/datasets/{dataset_ids[-1]}/", json=payload, auth=temp_user.auth
+    )
+    assert response.status_code == 200
+    assert await get_usage_counts() == [("b", 2), ("a", 1), ("c", 1)]
+
+    # So does deleting it.
+    await bus.execute(DeleteDataset(id=dataset_ids[0]))
+    assert await get_usage_counts() == [("a", 1), ("b", 1), ("c", 1)]
+
+
+@pytest.mark.asyncio
+async def test_tags_usage_count_other_organizations(
+    client: httpx.AsyncClient, temp_user: TestPasswordUser
+) -> None:
+    bus = resolve(MessageBus)
+
+    siret = await bus.execute(CreateOrganizationFactory.build())
+    await bus.execute(CreateCatalog(organization_siret=siret))
+
+    tag_id = await bus.execute(CreateTag(name="a"))
+    await bus.execute(
+        CreateDatasetFactory.build(
+            account=Skip(), organization_siret=siret, tag_ids=[tag_id]
+        )
+    )
+
+    response = await client.get("/tags/", auth=temp_user.auth)
+    assert response.status_code == 200
+    assert response.json()["items"][0]["usage_count"] == 1
 
 
 @pytest.mark.asyncio
@@ -0,0 +1,71 @@
+import json
+from pathlib import Path
+
+import pytest
+
+import server.config.di
+from server.api.app import create_app
+from server.config.di import configure
+from server.config.settings import Settings
+from server.infrastructure.database import Database
+from server.seedwork.application.di import Container
+
+from ..helpers import TestPasswordUser, create_client
+
+
+@pytest.mark.asyncio
+async def test_tracing(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path, temp_user: TestPasswordUser
+) -> None:
+    path = tmp_path / "traces.jsonl"
+    monkeypatch.setenv("APP_TRACING_EXPORT", str(path))
+
+    container = Container(configure)
+    container.bootstrap()
+    monkeypatch.setattr(server.config.di, "_CONTAINER", container)
+
+    app = create_app(container.resolve(Settings))
+    trace_id = "4bf92f3577b34da6a3ce929d0e0e4736"
+
+    try:
+        async with create_client(app) as client:
+            response = await client.get(
+                "/datasets/",
+                auth=temp_user.auth,
+                headers={"traceparent": f"00-{trace_id}-00f067aa0ba902b7-01"},
+            )
+            assert response.status_code == 200
+    finally:
+        await container.resolve(Database).engine.dispose()
+
+    (line,) = path.read_text().splitlines()
+    (resource_spans,) = json.loads(line)["resourceSpans"]
+    (scope_spans,) = resource_spans["scopeSpans"]
+    spans = {span["spanId"]: span for span in scope_spans["spans"]}
+
+    assert all(span["traceId"] == trace_id for span in spans.values())
+
+    def path_of(span: dict) -> list:
+        names = [span["name"]]
+        while span.get("parentSpanId") in spans:
+            span = spans[span["parentSpanId"]]
+            names.insert(0, span["name"])
+        return names
+
+    paths = [path_of(span) for span in spans.values()]
+
+    layers = [
+        "GET /datasets/",
+        "list_datasets",
+        "MessageBus.execute GetAllDatasets",
+        "get_all_datasets",
+        "SqlDatasetRepository.get_all",
+    ]
+    assert layers + ["get_count_from", "SELECT"] in paths
+    assert layers + ["SELECT"] in paths
+
+    (root,) = [span for span in spans.values() if span["name"] == "GET /datasets/"]
+    assert root["parentSpanId"] == "00f067aa0ba902b7"
+    assert {"key": "http.status_code", "value": {"intValue": "200"}} in root[
+        "attributes"
+    ]
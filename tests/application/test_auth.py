@@ -27,6 +27,13 @@ async def test_changepassword(temp_org: OrganizationView) -> None:
             password=SecretStr("initialpwd"),
         )
     )
+    initial_account = await bus.execute(
+        LoginPasswordUser(email=email, password=SecretStr("initialpwd"))
+    )
+
+    account_repository = resolve(AccountRepository)
+    # Authenticate once so that the API token gets cached.
+    assert await account_repository.get_by_api_token(initial_account.api_token)
 
     await bus.execute(ChangePassword(email=email, password=SecretStr("newpwd")))
 
@@ -35,7 +42,16 @@ async def test_changepassword(temp_org: OrganizationView) -> None:
             LoginPasswordUser(email=email, password=SecretStr("initialpwd"))
         )
 
-    await bus.execute(LoginPasswordUser(email=email, password=SecretStr("newpwd")))
+    account = await bus.execute(
+        LoginPasswordUser(email=email, password=SecretStr("newpwd"))
+    )
+
+    # API token was rotated.
+    assert account.api_token != initial_account.api_token
+    assert await account_repository.get_by_api_token(initial_account.api_token) is None
+    new_account = await account_repository.get_by_api_token(account.api_token)
+    assert new_account is not None
+    assert new_account.id == account.id
 
 
 @pytest.mark.asyncio
@@ -12,6 +12,7 @@ from asgi_lifespan import LifespanManager
 from sqlalchemy_utils import create_database, database_exists, drop_database
 
 from server.application.catalogs.commands import CreateCatalog
+from server.application.datasets.caching import DatasetFiltersCache
 from server.application.datasets.queries import GetAllDatasets
 from server.application.organizations.queries import GetOrganizationBySiret
 from server.application.organizations.views import OrganizationView
@@ -20,6 +21,9 @@ from server.application.tags.views import TagView
 from server.config import Settings
 from server.config.di import bootstrap, resolve
 from server.domain.auth.entities import UserRole
+from server.infrastructure.adapters.middleware import QueryCachingMiddleware
+from server.infrastructure.auth.caching import ApiTokenCache, RejectedApiTokenCache
+from server.infrastructure.catalogs.caching import ExportCache
 from server.infrastructure.database import Database
 from server.seedwork.application.messages import MessageBus
 from tests.factories import CreateTagFactory
@@ -65,6 +69,18 @@ async def autorollback_db() -> AsyncIterator[None]:
         yield
 
 
+@pytest.fixture(autouse=True)
+def clear_caches() -> Iterator[None]:
+    # Database changes are rolled back after each test, so in-process caches
+    # must be reset too.
+    yield
+    resolve(DatasetFiltersCache).invalidate()
+    resolve(ApiTokenCache).clear()
+    resolve(RejectedApiTokenCache).clear()
+    resolve(QueryCachingMiddleware).clear()
+    resolve(ExportCache).clear()
+
+
 @pytest_asyncio.fixture(scope="session", autouse=True)
 async def warmup_db() -> None:
     # Run a database query to warmup tables. Otherwise this warmup would
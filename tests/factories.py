@@ -52,7 +52,7 @@ class CreateTagFactory(Factory[CreateTag]):
     __model__ = CreateTag
 
 
-_FAKE_GEOGRAPHICAL_COVERAGES = [
+FAKE_GEOGRAPHICAL_COVERAGES = [
     "Ville d'Angers",
     "Métropole Européenne de Lille",
     "Région Île-de-France",
@@ -67,7 +67,7 @@ class _BaseCreateDatasetFactory:
     title = Use(fake.sentence)
     description = Use(fake.text)
     service = Use(fake.company)
-    geographical_coverage = Use(lambda: random.choice(_FAKE_GEOGRAPHICAL_COVERAGES))
+    geographical_coverage = Use(lambda: random.choice(FAKE_GEOGRAPHICAL_COVERAGES))
     formats = Use(lambda: random.choices(list(DataFormat), k=random.randint(1, 3)))
     technical_source = Use(
         lambda: fake.sentence(nb_words=3) if random.random() < 0.5 else None
@@ -0,0 +1,104 @@
+import datetime as dt
+import uuid
+
+from server.domain.auth.entities import Account, UserRole
+from server.domain.common.types import ID
+from server.domain.organizations.types import Siret
+from server.infrastructure.auth.caching import ApiTokenCache, RejectedApiTokenCache
+
+
+def _make_account(api_token: str) -> Account:
+    return Account(
+        id=ID(uuid.uuid4()),
+        organization_siret=Siret("11122233344441"),
+        email=f"{api_token}@mydomain.org",
+        role=UserRole.USER,
+        api_token=api_token,
+    )
+
+
+def test_api_token_cache_expiry() -> None:
+    now = dt.datetime(2022, 10, 11, 13, 0, 0)
+
+    cache = ApiTokenCache(max_age=dt.timedelta(seconds=10), nowfunc=lambda: now)
+    account = _make_account("token")
+
+    assert cache.get("hash") is None
+
+    cache.set("hash", account, version=cache.version)
+    assert cache.get("hash") == account
+
+    # Simulate waiting for some time...
+    now += dt.timedelta(seconds=9)
+    assert cache.get("hash") == account
+
+    now += dt.timedelta(seconds=2)
+    assert cache.get("hash") is None
+
+
+def test_api_token_cache_evicts_least_recently_used() -> None:
+    cache = ApiTokenCache(max_age=dt.timedelta(seconds=10), max_size=2)
+    accounts = {name: _make_account(name) for name in ("a", "b", "c")}
+
+    cache.set("a", accounts["a"], version=cache.version)
+    cache.set("b", accounts["b"], version=cache.version)
+    assert cache.get("a") == accounts["a"]  # 'b' is now the least recently used.
+
+    cache.set("c", accounts["c"], version=cache.version)
+    assert cache.get("a") == accounts["a"]
+    assert cache.get("b") is None
+    assert cache.get("c") == accounts["c"]
+
+
+def test_api_token_cache_invalidate() -> None:
+    cache = ApiTokenCache(max_age=dt.timedelta(seconds=10))
+    account = _make_account("token")
+    other_account = _make_account("other")
+
+    cache.set("hash", account, version=cache.version)
+    cache.set("other", other_account, version=cache.version)
+    cache.invalidate(account.id)
+    assert cache.get("hash") is None
+    assert cache.get("other") == other_account
+
+    # Accounts read before an invalidation are not stored, as they may be stale.
+    version = cache.version
+    cache.invalidate(account.id)
+    cache.set("hash", account, version=version)
+    assert cache.get("hash") is None
+
+
+def test_rejected_api_token_cache() -> None:
+    now = dt.datetime(2022, 10, 11, 13, 0, 0)
+
+    cache = RejectedApiTokenCache(period=dt.timedelta(seconds=10), nowfunc=lambda: now)
+
+    assert not cache.contains("hash")
+    cache.add("hash")
+    assert cache.contains("hash")
+
+    # Entries survive the first rotation...
+    now += dt.timedelta(seconds=10)
+    assert cache.contains("hash")
+
+    # ...but not the second one.
+    now += dt.timedelta(seconds=10)
+    assert not cache.contains("hash")
+
+    assert cache.hits == 2
+    assert cache.misses == 2
+
+
+def test_rejected_api_token_cache_is_bounded() -> None:
+    cache = RejectedApiTokenCache(period=dt.timedelta(seconds=10), max_size=2)
+
+    for api_token_hash in ("a", "b", "c", "d", "e"):
+        cache.add(api_token_hash)
+
+    assert [cache.contains(h) for h in ("a", "b", "c", "d", "e")] == [
+        False,
+        False,
+        True,
+        True,
+        True,
+    ]
@@ -75,3 +75,13 @@ async def test_export_cache(max_age_delta: int, expected_value: Optional[str]) -
     now += dt.timedelta(seconds=10 + max_age_delta)
 
     assert export_cache.get(siret) == expected_value
+
+
+def test_export_cache_size_bytes() -> None:
+    export_cache = ExportCache(max_age=dt.timedelta(seconds=10))
+    assert export_cache.size_bytes == 0
+
+    export_cache.set(Siret(fake.siret()), "Données")
+    export_cache.set(Siret(fake.siret()), "abc")
+
+    assert export_cache.size_bytes == len("Données".encode()) + 3 == 11
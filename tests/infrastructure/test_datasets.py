@@ -1,15 +1,37 @@
+import asyncio
+import datetime as dt
+import json
+import uuid
+from typing import AsyncIterator, List
+
 import pytest
-from sqlalchemy import select
+import pytest_asyncio
+from sqlalchemy import select, text
 from sqlalchemy.orm import contains_eager
 
-from server.application.datasets.commands import DeleteDataset
+import server.config.di
+from server.application.datasets.commands import (
+    CreateDataset,
+    DeleteDataset,
+    UpdateDataset,
+)
 from server.application.datasets.queries import GetDatasetByID
+from server.application.datasets.views import DatasetFiltersView
 from server.application.organizations.views import OrganizationView
-from server.config.di import resolve
+from server.config.di import configure, resolve
+from server.domain.common.types import ID, Skip
 from server.domain.catalog_records.repositories import CatalogRecordRepository
+from server.domain.datasets.repositories import DatasetRepository
+from server.domain.tags.repositories import TagRepository
 from server.infrastructure.database import Database
-from server.infrastructure.datasets.models import DatasetModel
+from server.infrastructure.datasets.caching import InMemoryDatasetFiltersCache
+from server.infrastructure.datasets.models import (
+    DATASET_FACETS,
+    DatasetFacetValueModel,
+    DatasetModel,
+)
 from server.infrastructure.tags.models import TagModel, dataset_tag
+from server.seedwork.application.di import Container
 from server.seedwork.application.messages import MessageBus
 from tests.helpers import TestPasswordUser
 
@@ -54,3 +76,259 @@ async def test_dataset_cascades(
         tag = result.unique().scalar_one()
         assert tag.name == "Architecture"
         assert not tag.datasets
+
+
+@pytest.mark.parametrize(
+    "max_age_delta, expect_hit",
+    [
+        pytest.param(-1, True, id="fresh"),
+        pytest.param(0, True, id="fresh-limit"),
+        pytest.param(1, False, id="stale"),
+    ],
+)
+def test_dataset_filters_cache(max_age_delta: int, expect_hit: bool) -> None:
+    now = dt.datetime(2022, 10, 11, 13, 0, 0)
+
+    cache = InMemoryDatasetFiltersCache(
+        max_age=dt.timedelta(seconds=10), nowfunc=lambda: now
+    )
+    filters = DatasetFiltersView(
+        organization_siret=[],
+        geographical_coverage=["France métropolitaine"],
+        service=[],
+        format=[],
+        technical_source=[],
+        tag_id=[],
+        license=["*"],
+    )
+
+    assert cache.get() is None
+
+    entry = cache.set(filters, version=cache.version)
+    assert entry.filters == filters
+    assert json.loads(entry.content)["geographical_coverage"] == [
+        "France métropolitaine"
+    ]
+    assert cache.get() == entry
+
+    # Simulate waiting for some time...
+    now += dt.timedelta(seconds=10 + max_age_delta)
+
+    assert (cache.get() == entry) is expect_hit
+
+
+def test_dataset_filters_cache_invalidate() -> None:
+    cache = InMemoryDatasetFiltersCache(max_age=dt.timedelta(seconds=10))
+    filters = DatasetFiltersView(
+        organization_siret=[],
+        geographical_coverage=[],
+        service=[],
+        format=[],
+        technical_source=[],
+        tag_id=[],
+        license=["*"],
+    )
+
+    cache.set(filters, version=cache.version)
+    cache.invalidate()
+    assert cache.get() is None
+
+    # Filters computed before an invalidation are not stored, as they may be stale.
+    version = cache.version
+    cache.invalidate()
+    entry = cache.set(filters, version=version)
+    assert entry.filters == filters
+    assert cache.get() is None
+
+
+@pytest.mark.asyncio
+async def test_dataset_facet_values_follow_datasets(
+    temp_org: OrganizationView, temp_user: TestPasswordUser
+) -> None:
+    bus = resolve(MessageBus)
+    repository = resolve(DatasetRepository)
+
+    command = CreateDatasetFactory.build(
+        account=temp_user.account,
+        organization_siret=temp_org.siret,
+        service="Service A",
+        technical_source=None,
+    )
+    dataset_id = await bus.execute(command)
+    other_dataset_id = await bus.execute(
+        CreateDatasetFactory.build(
+            account=temp_user.account,
+            organization_siret=temp_org.siret,
+            service="Service A",
+        )
+    )
+    assert await repository.get_service_set() == {"Service A"}
+
+    await bus.execute(
+        UpdateDataset(
+            account=temp_user.account,
+            id=dataset_id,
+            **command.dict(exclude={"account", "organization_siret", "service"}),
+            service="Service B",
+        )
+    )
+    assert await repository.get_service_set() == {"Service A", "Service B"}
+
+    # Values used by no dataset disappear.
+    await bus.execute(DeleteDataset(id=other_dataset_id))
+    assert await repository.get_service_set() == {"Service B"}
+
+    async with resolve(Database).session() as session:
+        result = await session.execute(
+            select(DatasetFacetValueModel.usage_count).where(
+                DatasetFacetValueModel.facet == "service",
+                DatasetFacetValueModel.value == "Service B",
+            )
+        )
+        assert result.scalar_one() == 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("event", ["insert", "update", "delete"])
+async def test_dataset_facets_match_trigger(event: str) -> None:
+    db = resolve(Database)
+
+    async with db.session() as session:
+        result = await session.execute(
+            text("SELECT prosrc FROM pg_proc WHERE proname = :name"),
+            {"name": f"dataset_facet_value_{event}"},
+        )
+        source = result.scalar_one()
+
+    # Facet names appear as string literals in the trigger function.
+    columns = [
+        column.name
+        for column in DatasetModel.__table__.columns
+        if f"'{column.name}'" in source
+    ]
+    assert sorted(columns) == sorted(DATASET_FACETS)
+
+
+@pytest_asyncio.fixture
+async def committed_bus(monkeypatch: pytest.MonkeyPatch) -> AsyncIterator[MessageBus]:
+    # Concurrent transactions only see committed data, so use a database which is
+    # not rolled back after each test. Tests must delete what they create.
+    container = Container(configure)
+    container.bootstrap()
+    monkeypatch.setattr(server.config.di, "_CONTAINER", container)
+
+    try:
+        yield container.resolve(MessageBus)
+    finally:
+        await container.resolve(Database).dispose()
+
+
+async def _alternate_concurrently(
+    bus: MessageBus, sequences: List[List[UpdateDataset]], times: int = 20
+) -> None:
+    async def run(commands: List[UpdateDataset]) -> None:
+        for i in range(times):
+            await bus.execute(commands[i % len(commands)])
+
+    # Would raise DeadlockDetectedError if locks were taken in different orders.
+    await asyncio.wait_for(asyncio.gather(*map(run, sequences)), timeout=30)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_dataset_tag_swaps_do_not_deadlock(
+    committed_bus: MessageBus, temp_org: OrganizationView
+) -> None:
+    bus = committed_bus
+    tag_a, tag_b = [await bus.execute(CreateTagFactory.build()) for _ in range(2)]
+    dataset_ids: List[ID] = []
+
+    def move(dataset_id: ID, command: CreateDataset, tag_id: ID) -> UpdateDataset:
+        return UpdateDataset(
+            id=dataset_id,
+            account=Skip(),
+            **command.dict(exclude={"account", "organization_siret", "tag_ids"}),
+            tag_ids=[tag_id],
+        )
+
+    try:
+        x_command, y_command = [
+            CreateDatasetFactory.build(
+                account=Skip(), organization_siret=temp_org.siret, tag_ids=[tag_id]
+            )
+            for tag_id in (tag_a, tag_b)
+        ]
+        x = await bus.execute(x_command)
+        dataset_ids.append(x)
+        y = await bus.execute(y_command)
+        dataset_ids.append(y)
+
+        # At the same time, move X from tag A to tag B while Y moves from tag B to
+        # tag A, and back.
+        await _alternate_concurrently(
+            bus,
+            [
+                [move(x, x_command, tag_b), move(x, x_command, tag_a)],
+                [move(y, y_command, tag_a), move(y, y_command, tag_b)],
+            ],
+        )
+
+        async with resolve(Database).session() as session:
+            result = await session.execute(
+                select(TagModel.usage_count).where(TagModel.id.in_([tag_a, tag_b]))
+            )
+            assert result.scalars().all() == [1, 1]
+    finally:
+        for dataset_id in dataset_ids:
+            await bus.execute(DeleteDataset(id=dataset_id))
+        await resolve(TagRepository).delete_many_by_id([tag_a, tag_b])
+
+
+@pytest.mark.asyncio
+async def test_concurrent_dataset_facet_swaps_do_not_deadlock(
+    committed_bus: MessageBus, temp_org: OrganizationView
+) -> None:
+    bus = committed_bus
+    service_a, service_b = [f"Service {uuid.uuid4()}" for _ in range(2)]
+    dataset_ids: List[ID] = []
+
+    def move(dataset_id: ID, command: CreateDataset, service: str) -> UpdateDataset:
+        return UpdateDataset(
+            id=dataset_id,
+            account=Skip(),
+            **command.dict(exclude={"account", "organization_siret", "service"}),
+            service=service,
+        )
+
+    try:
+        x_command, y_command = [
+            CreateDatasetFactory.build(
+                account=Skip(), organization_siret=temp_org.siret, service=service
+            )
+            for service in (service_a, service_b)
+        ]
+        x = await bus.execute(x_command)
+        dataset_ids.append(x)
+        y = await bus.execute(y_command)
+        dataset_ids.append(y)
+
+        # At the same time, move X from service A to service B while Y moves from
+        # service B to service A, and back.
+        await _alternate_concurrently(
+            bus,
+            [
+                [move(x, x_command, service_b), move(x, x_command, service_a)],
+                [move(y, y_command, service_a), move(y, y_command, service_b)],
+            ],
+        )
+
+        async with resolve(Database).session() as session:
+            result = await session.execute(
+                select(DatasetFacetValueModel.usage_count).where(
+                    DatasetFacetValueModel.facet == "service",
+                    DatasetFacetValueModel.value.in_([service_a, service_b]),
+                )
+            )
+            assert result.scalars().all() == [1, 1]
+    finally:
+        for dataset_id in dataset_ids:
+            await bus.execute(DeleteDataset(id=dataset_id))
@@ -1,10 +1,21 @@
+import io
 import json
 import logging
+import threading
 
 import pytest
 
 from server.config.di import configure
 from server.config.settings import Settings
+from server.infrastructure.logging.filters import AccessLogSamplingFilter
+from server.infrastructure.logging.formatters import AccessJsonFormatter
+from server.infrastructure.logging.handlers import QueueStreamHandler
+from server.infrastructure.metrics.request_stats import (
+    RequestStatsLogFilter,
+    end_request_stats,
+    get_request_stats,
+    start_request_stats,
+)
 from server.infrastructure.server import get_server_config
 from server.seedwork.application.di import Container
 
@@ -77,3 +88,149 @@ def test_logging_live_renders_json(
         "name": "server.example",
         "message": "Info test",
     }
+
+
+def test_access_log_includes_request_stats() -> None:
+    formatter = AccessJsonFormatter("%(asctime)s %(levelname)s %(name)s %(message)s")
+    record = logging.LogRecord(
+        "uvicorn.access",
+        logging.INFO,
+        __file__,
+        0,
+        '%s - "%s %s HTTP/%s" %d',
+        ("127.0.0.1:1234", "GET", "/datasets/", "1.1", 200),
+        None,
+    )
+
+    token = start_request_stats()
+    try:
+        stats = get_request_stats()
+        assert stats is not None
+        stats.db_queries = 3
+        stats.db_time = 0.0125
+        assert RequestStatsLogFilter().filter(record)
+    finally:
+        end_request_stats(token)
+
+    data = json.loads(formatter.format(record))
+    assert data["status"] == "200 OK"
+    assert data["request_line"] == "GET /datasets/ HTTP/1.1"
+    assert data["db_queries"] == 3
+    assert data["db_time_ms"] == 12.5
+    assert data["total_time_ms"] >= 0
+
+
+def test_queue_stream_handler_does_not_block() -> None:
+    writing = threading.Event()
+    unblocked = threading.Event()
+
+    class StalledStream(io.StringIO):
+        def write(self, s: str) -> int:
+            writing.set()
+            unblocked.wait(timeout=5)
+            return super().write(s)
+
+    stream = StalledStream()
+    handler = QueueStreamHandler(stream, max_size=2)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+
+    def make_record(i: int) -> logging.LogRecord:
+        return logging.makeLogRecord({"msg": "Record %d", "args": (i,)})
+
+    try:
+        handler.handle(make_record(0))
+        assert writing.wait(timeout=5)
+
+        for i in range(1, 5):
+            handler.handle(make_record(i))
+
+        # The first record is being written, 2 are pending, the others were dropped.
+        assert handler.dropped == 2
+
+        unblocked.set()
+        handler.flush()
+
+        assert stream.getvalue().splitlines() == ["Record 0", "Record 1", "Record 2"]
+    finally:
+        unblocked.set()
+        handler.close()
+
+
+def test_queue_stream_handler_starts_a_single_listener() -> None:
+    stream = io.StringIO()
+    handler = QueueStreamHandler(stream)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    record = logging.makeLogRecord({"msg": "Record"})
+
+    threads = [threading.Thread(target=handler.emit, args=(record,)) for _ in range(10)]
+
+    try:
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        handler.flush()
+        assert stream.getvalue().splitlines() == ["Record"] * 10
+    finally:
+        handler.close()
+
+
+def test_access_log_sampling() -> None:
+    now = 0.0
+    sampling = AccessLogSamplingFilter(max_rate=2, clock=lambda: now)
+
+    def make_record(status_code: int) -> logging.LogRecord:
+        return logging.makeLogRecord(
+            {"args": ("127.0.0.1:1234", "GET", "/", "1.1", status_code)}
+        )
+
+    assert sampling.filter(make_record(200))
+    assert sampling.filter(make_record(200))
+    assert not sampling.filter(make_record(200))
+    assert sampling.filter(make_record(500))  # Errors are always logged.
+    assert sampling.sampled_out == 1
+
+    now = 1.5
+    assert sampling.filter(make_record(200))
+
+
+def test_logging_queue(
+    monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture
+) -> None:
+    monkeypatch.setenv("APP_SERVER_MODE", "live")
+    monkeypatch.setenv("APP_LOG_QUEUE_SIZE", "100")
+
+    container = Container(configure)
+    container.bootstrap()
+
+    settings = container.resolve(Settings)
+    config = get_server_config("server.main:app", settings)
+    config.load()
+
+    access_logger = logging.getLogger("uvicorn.access")
+    (handler,) = access_logger.handlers
+    assert isinstance(handler, QueueStreamHandler)
+
+    token = start_request_stats()
+    try:
+        stats = get_request_stats()
+        assert stats is not None
+        stats.db_queries = 3
+        access_logger.info(
+            '%s - "%s %s HTTP/%s" %d',
+            "127.0.0.1:1234",
+            "GET",
+            "/datasets/",
+            "1.1",
+            200,
+        )
+    finally:
+        end_request_stats(token)
+
+    # Request stats were attached when logging, before the request ended.
+    handler.flush()
+    captured = capsys.readouterr()
+    line = json.loads(captured.out.splitlines()[-1])
+    assert line["request_line"] == "GET /datasets/ HTTP/1.1"
+    assert line["db_queries"] == 3
@@ -0,0 +1,201 @@
+import asyncio
+import datetime as dt
+from typing import List, Tuple
+
+import pytest
+
+from server.application.tags.commands import CreateTag
+from server.application.tags.queries import GetAllTags
+from server.config.di import resolve
+from server.infrastructure.adapters.messages import MessageBusAdapter
+from server.infrastructure.adapters.middleware import (
+    MessageTimingMiddleware,
+    QueryCachingMiddleware,
+    QueryCoalescingMiddleware,
+)
+from server.seedwork.application.caching import QueryCachePolicy
+from server.seedwork.application.commands import Command
+from server.seedwork.application.messages import MessageBus
+from server.seedwork.application.queries import Query
+
+
+class GetItems(Query[List[str]]):
+    prefix: str = ""
+
+
+class AddItem(Command[None]):
+    name: str
+
+
+def _make_bus(
+    items: List[str], now: List[dt.datetime]
+) -> Tuple[MessageBusAdapter, QueryCachingMiddleware, List[GetItems]]:
+    calls: List[GetItems] = []
+
+    async def get_items(query: GetItems) -> List[str]:
+        calls.append(query)
+        return [item for item in items if item.startswith(query.prefix)]
+
+    async def add_item(command: AddItem) -> None:
+        items.append(command.name)
+
+    caching = QueryCachingMiddleware(
+        {
+            GetItems: QueryCachePolicy(
+                max_age=dt.timedelta(seconds=10), invalidated_by=[AddItem]
+            )
+        },
+        nowfunc=lambda: now[0],
+    )
+    bus = MessageBusAdapter(
+        {AddItem: add_item}, {GetItems: get_items}, middleware=[caching]
+    )
+    return bus, caching, calls
+
+
+@pytest.mark.asyncio
+async def test_query_caching() -> None:
+    now = [dt.datetime(2022, 10, 11, 13, 0, 0)]
+    bus, caching, calls = _make_bus(["a", "b"], now)
+
+    assert await bus.execute(GetItems()) == ["a", "b"]
+    assert await bus.execute(GetItems()) == ["a", "b"]
+    assert len(calls) == 1
+
+    # Queries with different parameters are cached separately.
+    assert await bus.execute(GetItems(prefix="a")) == ["a"]
+    assert len(calls) == 2
+
+    # Related commands invalidate cached results.
+    await bus.execute(AddItem(name="c"))
+    assert await bus.execute(GetItems()) == ["a", "b", "c"]
+    assert len(calls) == 3
+
+    # Cached results expire.
+    now[0] += dt.timedelta(seconds=11)
+    assert await bus.execute(GetItems()) == ["a", "b", "c"]
+    assert len(calls) == 4
+
+    assert caching.hits == 1
+    assert caching.misses == 4
+
+
+@pytest.mark.asyncio
+async def test_query_caching_concurrent_command() -> None:
+    items = ["a"]
+    started = asyncio.Event()
+    proceed = asyncio.Event()
+
+    async def get_items(query: GetItems) -> List[str]:
+        result = list(items)
+        started.set()
+        await proceed.wait()
+        return result
+
+    async def add_item(command: AddItem) -> None:
+        items.append(command.name)
+
+    caching = QueryCachingMiddleware(
+        {
+            GetItems: QueryCachePolicy(
+                max_age=dt.timedelta(seconds=10), invalidated_by=[AddItem]
+            )
+        }
+    )
+    bus = MessageBusAdapter(
+        {AddItem: add_item}, {GetItems: get_items}, middleware=[caching]
+    )
+
+    query = asyncio.ensure_future(bus.execute(GetItems()))
+    await started.wait()
+    await bus.execute(AddItem(name="b"))
+    proceed.set()
+
+    # The query started before the command, so its result may be stale...
+    assert await query == ["a"]
+
+    # ...and must not have been stored.
+    assert await bus.execute(GetItems()) == ["a", "b"]
+
+
+@pytest.mark.asyncio
+async def test_message_timing() -> None:
+    async def get_items(query: GetItems) -> List[str]:
+        return []
+
+    timing = MessageTimingMiddleware()
+    bus = MessageBusAdapter({}, {GetItems: get_items}, middleware=[timing])
+
+    await bus.execute(GetItems())
+    await bus.execute(GetItems())
+
+    histogram = timing.histograms["GetItems"]
+    assert histogram.count == 2
+    assert histogram.cumulative_counts()[0] == (0.005, 2)
+
+
+@pytest.mark.asyncio
+async def test_get_all_tags_is_cached() -> None:
+    bus = resolve(MessageBus)
+    caching = resolve(QueryCachingMiddleware)
+    hits = caching.hits
+
+    tags = await bus.execute(GetAllTags())
+    assert await bus.execute(GetAllTags()) == tags
+    assert caching.hits == hits + 1
+
+    await bus.execute(CreateTag(name="Cached?"))
+    assert "Cached?" in [tag.name for tag in await bus.execute(GetAllTags())]
+
+
+@pytest.mark.asyncio
+async def test_query_coalescing() -> None:
+    calls: List[GetItems] = []
+    proceed = asyncio.Event()
+
+    async def get_items(query: GetItems) -> List[str]:
+        calls.append(query)
+        await proceed.wait()
+        return [query.prefix]
+
+    coalescing = QueryCoalescingMiddleware({GetItems})
+    bus = MessageBusAdapter({}, {GetItems: get_items}, middleware=[coalescing])
+
+    first = asyncio.ensure_future(bus.execute(GetItems(prefix="a")))
+    others = [
+        asyncio.ensure_future(bus.execute(GetItems(prefix="a"))) for _ in range(3)
+    ]
+    distinct = asyncio.ensure_future(bus.execute(GetItems(prefix="b")))
+    await asyncio.sleep(0)
+
+    # Cancelling a caller does not affect the others.
+    first.cancel()
+    proceed.set()
+
+    assert await asyncio.gather(*others) == [["a"]] * 3
+    assert await distinct == ["b"]
+    assert [query.prefix for query in calls] == ["a", "b"]
+    assert coalescing.coalesced == 3
+
+    # Once done, the next execution runs again.
+    assert await bus.execute(GetItems(prefix="a")) == ["a"]
+    assert len(calls) == 3
+
+
+@pytest.mark.asyncio
+async def test_query_coalescing_error() -> None:
+    proceed = asyncio.Event()
+
+    async def get_items(query: GetItems) -> List[str]:
+        await proceed.wait()
+        raise ValueError("Oops")
+
+    coalescing = QueryCoalescingMiddleware({GetItems})
+    bus = MessageBusAdapter({}, {GetItems: get_items}, middleware=[coalescing])
+
+    executions = [asyncio.ensure_future(bus.execute(GetItems())) for _ in range(2)]
+    await asyncio.sleep(0)
+    proceed.set()
+
+    results = await asyncio.gather(*executions, return_exceptions=True)
+    assert all(isinstance(result, ValueError) for result in results)
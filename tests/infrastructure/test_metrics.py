@@ -0,0 +1,125 @@
+import json
+import logging
+from pathlib import Path
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from server.config.di import resolve
+from server.config.settings import Settings
+from server.domain.datasets.specifications import DatasetSpec
+from server.infrastructure.metrics.registry import (
+    LatencyHistogram,
+    MetricFamily,
+    MetricsRegistry,
+)
+from server.infrastructure.metrics.request_stats import (
+    add_request_context,
+    end_request_stats,
+    start_request_stats,
+)
+from server.infrastructure.metrics.slow_queries import SlowQueryLog
+from server.infrastructure.tags.models import TagModel
+
+
+def test_latency_histogram() -> None:
+    histogram = LatencyHistogram(buckets=[0.1, 1])
+
+    for seconds in (0.05, 0.5, 0.7, 3):
+        histogram.observe(seconds)
+
+    assert histogram.cumulative_counts() == [(0.1, 1), (1, 3), (float("inf"), 4)]
+    assert histogram.sum == pytest.approx(4.25)
+
+
+def test_metrics_registry_render() -> None:
+    histogram = LatencyHistogram(buckets=[0.1])
+    histogram.observe(0.05)
+    histogram.observe(0.25)
+
+    registry = MetricsRegistry()
+    registry.register(
+        lambda: [
+            MetricFamily("things_total", "counter", "Number of things.").add(3),
+            MetricFamily(
+                "thing_duration_seconds", "histogram", "Duration."
+            ).add_histogram(histogram, {"path": '/a"b'}),
+        ]
+    )
+
+    assert registry.render().splitlines() == [
+        "# HELP things_total Number of things.",
+        "# TYPE things_total counter",
+        "things_total 3",
+        "# HELP thing_duration_seconds Duration.",
+        "# TYPE thing_duration_seconds histogram",
+        'thing_duration_seconds_bucket{path="/a\\"b",le="0.1"} 1',
+        'thing_duration_seconds_bucket{path="/a\\"b",le="+Inf"} 2',
+        'thing_duration_seconds_sum{path="/a\\"b"} 0.3',
+        'thing_duration_seconds_count{path="/a\\"b"} 2',
+    ]
+
+
+def test_metrics_registry_labels() -> None:
+    registry = MetricsRegistry(labels={"pid": "42"})
+    registry.register(
+        lambda: [
+            MetricFamily("things_total", "counter", "Number of things.")
+            .add(3)
+            .add(1, {"kind": "other"}),
+        ]
+    )
+
+    assert registry.render().splitlines() == [
+        "# HELP things_total Number of things.",
+        "# TYPE things_total counter",
+        'things_total{pid="42"} 3',
+        'things_total{pid="42",kind="other"} 1',
+    ]
+
+
+@pytest.mark.asyncio
+async def test_slow_query_log(tmp_path: Path, caplog: pytest.LogCaptureFixture) -> None:
+    settings = resolve(Settings)
+    engine = create_async_engine(settings.env_database_url)
+    explain_file = tmp_path / "plans.jsonl"
+
+    slow_query_log = SlowQueryLog(
+        threshold=1e-9, explain_file=str(explain_file), explain_interval=60
+    )
+    slow_query_log.instrument(engine)
+
+    token = start_request_stats({"path": "/datasets/"})
+    add_request_context(dataset_spec=DatasetSpec(search_term="example"))
+
+    try:
+        with caplog.at_level(logging.WARNING):
+            async with engine.connect() as conn:
+                stmt = select(TagModel.id).where(TagModel.name == "example")
+                await conn.execute(stmt)
+                await conn.execute(stmt)  # Not explained again (rate limit).
+
+        await slow_query_log.wait()
+    finally:
+        end_request_stats(token)
+        await engine.dispose()
+
+    messages = [
+        record.getMessage()
+        for record in caplog.records
+        if record.name == "server.infrastructure.metrics.slow_queries"
+        and "FROM tag" in record.getMessage()
+    ]
+    assert len(messages) == 2
+    assert messages[0].startswith("Slow query (")
+    assert "route: /datasets/" in messages[0]
+    assert "'example'" in messages[0]
+
+    lines = explain_file.read_text().splitlines()
+    assert len(lines) == 1
+    entry = json.loads(lines[0])
+    assert entry["route"] == "/datasets/"
+    assert entry["dataset_spec"]["search_term"] == "example"
+    assert entry["parameters"] == ["example"]
+    assert "Plan" in entry["plan"][0]
@@ -0,0 +1,92 @@
+import pytest
+from sqlalchemy import text
+
+from server.application.tags.commands import CreateTag
+from server.config.di import resolve
+from server.domain.tags.exceptions import TagAlreadyExists
+from server.domain.tags.repositories import TagRepository
+from server.seedwork.application.messages import MessageBus
+
+
+@pytest.mark.asyncio
+async def test_tag_names_are_unique() -> None:
+    bus = resolve(MessageBus)
+
+    await bus.execute(CreateTag(name="Chemin de fer"))
+
+    with pytest.raises(TagAlreadyExists):
+        await bus.execute(CreateTag(name=" chemin  de FER"))
+
+
+@pytest.mark.asyncio
+async def test_tag_get_or_create_by_names() -> None:
+    bus = resolve(MessageBus)
+    repository = resolve(TagRepository)
+
+    id_existing = await bus.execute(CreateTag(name="Chemin de fer"))
+
+    ids = await repository.get_or_create_by_names(
+        ["chemin  de fer", "Population", " population ", "Chemin de fer"]
+    )
+
+    assert ids["chemin  de fer"] == id_existing
+    assert ids["Chemin de fer"] == id_existing
+    assert ids["Population"] == ids[" population "]
+
+    tags = await repository.get_all()
+    assert [(tag.id, tag.name) for tag in tags] == [
+        (id_existing, "Chemin de fer"),
+        (ids["Population"], "Population"),
+    ]
+
+    # Existing tags are returned as is.
+    assert await repository.get_or_create_by_names(["POPULATION"]) == {
+        "POPULATION": ids["Population"]
+    }
+    assert len(await repository.get_all()) == 2
+
+
+@pytest.mark.asyncio
+async def test_tag_get_or_create_by_names_non_ascii(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    bus = resolve(MessageBus)
+    repository = resolve(TagRepository)
+
+    id_existing = await bus.execute(CreateTag(name="Énergie solaire"))
+
+    ids = await repository.get_or_create_by_names(
+        ["ÉNERGIE SOLAIRE", "énergie  solaire", "Énergie  SOLAIRE"]
+    )
+    assert ids["Énergie  SOLAIRE"] == id_existing
+    assert ids["énergie  solaire"] == ids["ÉNERGIE SOLAIRE"]
+
+    # Names are matched by the database, even where Python normalization disagrees
+    # (e.g. Unicode case folding, depending on the database locale).
+    monkeypatch.setattr(
+        "server.infrastructure.tags.repositories.normalize_tag_name",
+        lambda name: " ".join(name.split()),
+    )
+    ids = await repository.get_or_create_by_names(["Énergie SOLAIRE"])
+    assert ids == {"Énergie SOLAIRE": id_existing}
+
+
+@pytest.mark.asyncio
+async def test_tag_get_or_create_by_names_gives_up(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    repository = resolve(TagRepository)
+
+    # Simulate a tag which is never found, e.g. as it keeps being created by
+    # concurrent transactions.
+    monkeypatch.setattr(
+        "server.infrastructure.tags.repositories._GET_OR_CREATE_BY_NAMES",
+        text(
+            "SELECT id, name FROM unnest("
+            "CAST(:ids AS uuid[]), CAST(:names AS varchar[])) AS input (id, name) "
+            "WHERE false"
+        ),
+    )
+
+    with pytest.raises(RuntimeError):
+        await repository.get_or_create_by_names(["Énergie solaire"])
@@ -0,0 +1,123 @@
+import json
+from pathlib import Path
+from typing import List, Sequence
+
+import pytest
+
+from server.infrastructure.tracing.exporters import OtlpJsonExporter, SpanExporter
+from server.infrastructure.tracing.spans import (
+    Span,
+    Tracer,
+    get_current_span,
+    parse_traceparent,
+    start_span,
+    traced,
+)
+
+
+class MemoryExporter(SpanExporter):
+    def __init__(self) -> None:
+        self.traces: List[Sequence[Span]] = []
+
+    def export(self, spans: Sequence[Span]) -> None:
+        self.traces.append(spans)
+
+
+def test_parse_traceparent() -> None:
+    trace_id = "4bf92f3577b34da6a3ce929d0e0e4736"
+
+    assert parse_traceparent(f"00-{trace_id}-00f067aa0ba902b7-01") == (
+        trace_id,
+        "00f067aa0ba902b7",
+        True,
+    )
+    assert parse_traceparent(f"00-{trace_id}-00f067aa0ba902b7-00") == (
+        trace_id,
+        "00f067aa0ba902b7",
+        False,
+    )
+    assert parse_traceparent(f"00-{'0' * 32}-00f067aa0ba902b7-01") is None
+    assert parse_traceparent("invalid") is None
+
+
+@pytest.mark.asyncio
+async def test_tracer() -> None:
+    exporter = MemoryExporter()
+    tracer = Tracer(exporter)
+
+    @traced()
+    async def work() -> None:
+        with start_span("inner", key="value"):
+            pass
+
+    await work()  # Outside of a trace: no-op.
+    assert not exporter.traces
+
+    traceparent = "00-4bf92f3577b34da6a3ce929d0e0e4736-00f067aa0ba902b7-01"
+
+    with tracer.start_trace("root", traceparent=traceparent) as root:
+        assert root is not None
+        assert get_current_span() is root
+        await work()
+
+    assert get_current_span() is None
+
+    (spans,) = exporter.traces
+    inner, outer, exported_root = spans
+
+    assert exported_root is root
+    assert root.trace.trace_id == "4bf92f3577b34da6a3ce929d0e0e4736"
+    assert root.parent_span_id == "00f067aa0ba902b7"
+    assert outer.name == "test_tracer.<locals>.work"
+    assert outer.parent_span_id == root.span_id
+    assert inner.parent_span_id == outer.span_id
+    assert inner.attributes == {"key": "value"}
+
+
+def test_tracer_sampling() -> None:
+    exporter = MemoryExporter()
+
+    with Tracer(exporter, sample_rate=0).start_trace("root") as span:
+        assert span is None
+
+    traceparent = "00-4bf92f3577b34da6a3ce929d0e0e4736-00f067aa0ba902b7-00"
+
+    with Tracer(exporter).start_trace("root", traceparent=traceparent) as span:
+        assert span is None
+
+    with Tracer(None).start_trace("root") as span:
+        assert span is None
+
+    assert not exporter.traces
+
+
+def test_otlp_json_exporter(tmp_path: Path) -> None:
+    path = tmp_path / "traces.jsonl"
+    tracer = Tracer(OtlpJsonExporter(str(path)))
+
+    with pytest.raises(ValueError):
+        with tracer.start_trace("root", attributes={"http.status_code": 500}):
+            with start_span("child"):
+                raise ValueError("Oops")
+
+    (line,) = path.read_text().splitlines()
+    data = json.loads(line)
+
+    (resource_spans,) = data["resourceSpans"]
+    assert resource_spans["resource"]["attributes"] == [
+        {"key": "service.name", "value": {"stringValue": "catalogage-server"}}
+    ]
+    (scope_spans,) = resource_spans["scopeSpans"]
+    child, root = scope_spans["spans"]
+
+    assert root["name"] == "root"
+    assert root["kind"] == 2
+    assert "parentSpanId" not in root
+    assert root["attributes"] == [
+        {"key": "http.status_code", "value": {"intValue": "500"}}
+    ]
+    assert root["status"] == {"code": 2, "message": "ValueError: Oops"}
+    assert int(root["endTimeUnixNano"]) >= int(root["startTimeUnixNano"])
+
+    assert child["traceId"] == root["traceId"]
+    assert child["parentSpanId"] == root["spanId"]
@@ -1,3 +1,7 @@
+import os
+import subprocess
+import sys
+
 import httpx
 import pytest
 
@@ -57,3 +61,18 @@ async def test_cors_disallowed_origin(client: httpx.AsyncClient) -> None:
     }
     response = await client.options("/", headers=headers)
     assert response.status_code == 400
+
+
+def test_heavy_dependencies_are_imported_lazily() -> None:
+    # Keep startup of worker processes and CLI tools fast.
+    # (Run in a fresh interpreter, as tests import everything.)
+    code = (
+        "import sys; import server.main; "
+        "print(sorted({'authlib', 'debug_toolbar', 'asyncpg'} & set(sys.modules)))"
+    )
+    env = {**os.environ, "APP_DEBUG": "0"}
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, env=env
+    )
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == "[]"
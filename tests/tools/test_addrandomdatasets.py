@@ -1,9 +1,11 @@
 import pytest
+from sqlalchemy import text
 
 from server.application.datasets.queries import GetAllDatasets
 from server.application.organizations.views import OrganizationView
 from server.config.di import resolve
 from server.domain.common.types import Skip
+from server.infrastructure.database import Database
 from server.seedwork.application.messages import MessageBus
 from tools import addrandomdatasets
 
@@ -20,3 +22,36 @@ async def test_addrandomdatasets(temp_org: OrganizationView) -> None:
 
     pagination = await bus.execute(GetAllDatasets(account=Skip()))
     assert pagination.total_items == 20
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("tags")
+async def test_addrandomdatasets_bulk(temp_org: OrganizationView) -> None:
+    db = resolve(Database)
+
+    await addrandomdatasets.bulk_main(
+        n=50, siret=temp_org.siret, organizations=3, batch_size=20
+    )
+
+    async with db.session() as session:
+        result = await session.execute(text("SELECT count(*) FROM dataset"))
+        assert result.scalar() == 50
+
+        result = await session.execute(
+            text("SELECT count(DISTINCT dataset_id) FROM dataset_dataformat")
+        )
+        assert result.scalar() == 50
+
+        result = await session.execute(
+            text("SELECT count(DISTINCT organization_siret) FROM catalog_record")
+        )
+        assert result.scalar() == 3
+
+        # Facet values were rebuilt to match datasets.
+        result = await session.execute(
+            text(
+                "SELECT usage_count FROM dataset_facet_value "
+                "WHERE facet = 'geographical_coverage'"
+            )
+        )
+        assert sum(result.scalars()) == 50
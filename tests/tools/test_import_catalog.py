@@ -1,23 +1,28 @@
 from pathlib import Path
-from textwrap import dedent
+from typing import List, Tuple
 
 import pytest
 import yaml
 
 from server.application.catalogs.commands import CreateCatalog
+from server.application.datasets.queries import GetAllDatasets
+from server.application.tags.queries import GetAllTags
 from server.config.di import resolve
 from server.domain.catalogs.entities import BoolExtraField
+from server.domain.common.types import Skip
+from server.domain.datasets.entities import DataFormat, UpdateFrequency
+from server.domain.organizations.types import Siret
 from server.seedwork.application.messages import MessageBus
 from tools import import_catalog
 
 from ..factories import CreateOrganizationFactory, CreateTagFactory
 
+_CSV_HEADER = "titre;description;mots_cles;nom_orga;siret_orga;id_alt_orga;service;si;contact_service;contact_personne;date_pub;date_maj;freq_maj;couv_geo;url;format;licence;donnees_geoloc"  # noqa
 
-@pytest.mark.asyncio
-async def test_import_catalog_example(tmp_path: Path) -> None:
+
+async def _setup_example(tmp_path: Path, csv_rows: List[str]) -> Tuple[Path, Siret]:
     csv_path = tmp_path / "catalog.csv"
     example_config_path = Path() / "tools" / "import.config.example.yml"
-    out_path = tmp_path / "initdata.yml"
 
     bus = resolve(MessageBus)
 
@@ -43,21 +48,28 @@ async def test_import_catalog_example(tmp_path: Path) -> None:
     # Simulate a pre-existing tag.
     await bus.execute(CreateTagFactory.build(name="Tag 1"))
 
-    csv_path.write_text(
-        dedent(
-            """\
-            titre;description;mots_cles;nom_orga;siret_orga;id_alt_orga;service;si;contact_service;contact_personne;date_pub;date_maj;freq_maj;couv_geo;url;format;licence;donnees_geoloc
-            Titre1;Description1;"Tag 1,Tag 2";Ministère 1;11004601800013;;Direction1;SI1;service@mydomain.org;contact@mydomain.org;;2022-10-06;annuelle;aquitaine;;geojson, xls, oracle et shp;etalab-2.0;oui
-            Titre2;Description2;"Tag 1,Tag 3";Ministère 1;11004601800013;;Direction1;SI2;service@mydomain.org;contact@mydomain.org;;;Invalid;NSP;;Information manquante;etalab-2.0;oui
-            """  # noqa
-        )
-    )
+    csv_path.write_text("\n".join([_CSV_HEADER, *csv_rows, ""]))
 
     config_path = tmp_path / "catalogue.csv"
     config_path.write_text(
         example_config_path.read_text().replace("REPLACE_ME", str(csv_path))
     )
 
+    return config_path, siret
+
+
+@pytest.mark.asyncio
+async def test_import_catalog_example(tmp_path: Path) -> None:
+    out_path = tmp_path / "initdata.yml"
+
+    config_path, siret = await _setup_example(
+        tmp_path,
+        [
+            'Titre1;Description1;"Tag 1,Tag 2";Ministère 1;11004601800013;;Direction1;SI1;service@mydomain.org;contact@mydomain.org;;2022-10-06;annuelle;aquitaine;;geojson, xls, oracle et shp;etalab-2.0;oui',  # noqa
+            'Titre2;Description2;"Tag 1,Tag 3";Ministère 1;11004601800013;;Direction1;SI2;service@mydomain.org;contact@mydomain.org;;;Invalid;NSP;;Information manquante;etalab-2.0;oui',  # noqa
+        ],
+    )
+
     code = await import_catalog.main(config_path, out_path)
     assert code == 0
 
@@ -91,3 +103,69 @@ async def test_import_catalog_example(tmp_path: Path) -> None:
     assert "[[ Notes d'import automatique ]]" in d1["description"]
     assert "Format : (Information manquante)" in d1["description"]
     assert "Fréquence de mise à jour (valeur originale) : Invalid" in d1["description"]
+
+
+@pytest.mark.asyncio
+async def test_import_catalog_tags_are_created_once(tmp_path: Path) -> None:
+    out_path = tmp_path / "initdata.yml"
+
+    config_path, _ = await _setup_example(tmp_path, [_make_row(k) for k in range(3)])
+
+    code = await import_catalog.main(config_path, out_path)
+    assert code == 0
+
+    with out_path.open() as f:
+        initdata = yaml.safe_load(f)
+
+    assert [t["params"] for t in initdata["tags"]] == [{"name": "Tag 2"}]
+    (tag_2_id,) = [t["id"] for t in initdata["tags"]]
+    assert all(tag_2_id in d["params"]["tag_ids"] for d in initdata["datasets"])
+
+
+def _make_row(k: int, siret: str = "11004601800013") -> str:
+    return f'Titre{k};Description{k};"Tag 1, Tag 2";Ministère 1;{siret};;Direction1;SI1;service@mydomain.org;contact@mydomain.org;;2022-10-06;annuelle;aquitaine;;xls;etalab-2.0;oui'  # noqa
+
+
+@pytest.mark.asyncio
+async def test_import_catalog_stream_resume(tmp_path: Path) -> None:
+    bus = resolve(MessageBus)
+    checkpoint_path = tmp_path / "checkpoint.json"
+
+    # Row 3 is invalid: the import stops after the first batch.
+    rows = [_make_row(k) for k in range(5)]
+    rows[3] = _make_row(3, siret="00000000000000")
+    config_path, siret = await _setup_example(tmp_path, rows)
+
+    with pytest.raises(ValueError, match="at row 3"):
+        await import_catalog.stream_main(
+            config_path, checkpoint_path, batch_size=2, workers=2
+        )
+
+    checkpoint = import_catalog.Checkpoint.parse_file(checkpoint_path)
+    assert checkpoint.rows == 2
+
+    pagination = await bus.execute(GetAllDatasets(account=Skip()))
+    assert sorted(d.title for d in pagination.items) == ["Titre0", "Titre1"]
+
+    # Fix the file, then resume.
+    csv_path = tmp_path / "catalog.csv"
+    csv_path.write_text(csv_path.read_text().replace("00000000000000", siret))
+
+    code = await import_catalog.stream_main(
+        config_path, checkpoint_path, batch_size=2, workers=2
+    )
+    assert code == 0
+    assert not checkpoint_path.exists()
+
+    pagination = await bus.execute(GetAllDatasets(account=Skip()))
+    assert sorted(d.title for d in pagination.items) == [f"Titre{k}" for k in range(5)]
+
+    dataset = pagination.items[0]
+    assert dataset.formats == [DataFormat.FILE_TABULAR]
+    assert dataset.update_frequency == UpdateFrequency.YEARLY
+    assert [v.value for v in dataset.extra_field_values] == ["oui"]
+
+    # 'Tag 2' was created once, and reused across batches and runs.
+    tags = await bus.execute(GetAllTags())
+    assert sorted(tag.name for tag in tags) == ["Tag 1", "Tag 2"]
+    assert all(len(d.tags) == 2 for d in pagination.items)
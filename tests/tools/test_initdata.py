@@ -11,6 +11,7 @@ from server.application.auth.queries import LoginPasswordUser
 from server.application.datasets.commands import UpdateDataset
 from server.application.datasets.queries import GetAllDatasets, GetDatasetByID
 from server.application.organizations.views import OrganizationView
+from server.application.tags.commands import CreateTag
 from server.config.di import resolve
 from server.domain.common.types import ID, Skip
 from server.seedwork.application.messages import MessageBus
@@ -124,6 +125,62 @@ async def test_initdata_env_password(
     assert "TOOLS_PASSWORDS" in str(ctx.value)
 
 
+@pytest.mark.asyncio
+async def test_initdata_tag_exists_with_another_id(
+    tmp_path: Path, temp_org: OrganizationView
+) -> None:
+    bus = resolve(MessageBus)
+
+    # E.g. created by a user, or kept when merging duplicates.
+    tag_id = await bus.execute(CreateTag(name="environnement "))
+
+    path = tmp_path / "initdata.yml"
+    path.write_text(
+        """
+        organizations: []
+        catalogs: []
+        users: []
+        tags:
+          - id: "b1c1b2c0-5a0b-4c59-9a34-1f4c64bb0d8e"
+            params:
+              name: Environnement
+        datasets:
+          - id: "6a0b4e0c-2f35-4f5f-a1d4-8d0e3b9b0e51"
+            params:
+              organization_siret: "{siret}"
+              title: Example
+              description: Example
+              service: Example
+              geographical_coverage: France
+              formats: [website]
+              technical_source: null
+              producer_email: null
+              contact_emails: [example@mydomain.org]
+              update_frequency: null
+              last_updated_at: null
+              url: null
+              license: null
+              tag_ids:
+                - "b1c1b2c0-5a0b-4c59-9a34-1f4c64bb0d8e"
+              extra_field_values: []
+              publication_restriction: "no_restriction"
+        """.format(
+            siret=temp_org.siret
+        )
+    )
+
+    code = await initdata.main(path)
+    assert code == 0
+
+    pk = ID(uuid.UUID("6a0b4e0c-2f35-4f5f-a1d4-8d0e3b9b0e51"))
+    dataset = await bus.execute(GetDatasetByID(id=pk, account=Skip()))
+    assert [tag.id for tag in dataset.tags] == [tag_id]
+
+    # Nothing changes on the next run.
+    code = await initdata.main(path, reset=True)
+    assert code == 0
+
+
 @pytest.mark.asyncio
 async def test_repo_initdata(
     monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture
@@ -136,7 +193,7 @@ async def test_repo_initdata(
     monkeypatch.setenv("TOOLS_PASSWORDS", m.group(1))
 
     num_users = 4
-    num_tags = 9
+    num_tags = 7
     num_datasets = 5
     num_organizations = 2
     num_catalogs = 1
@@ -196,6 +253,22 @@ async def test_repo_initdata(
     assert dataset.title == "Données brutes de l'inventaire forestier"
 
 
+@pytest.mark.asyncio
+async def test_initdata_dry_run(capsys: pytest.CaptureFixture) -> None:
+    bus = resolve(MessageBus)
+    path = Path("tools", "initdata.yml")
+
+    # Passwords are not needed to plan changes.
+    code = await initdata.main(path, dry_run=True, no_input=True)
+    assert code == 0
+    captured = capsys.readouterr()
+    assert captured.out.count("would be created") == 19
+    assert "Tags: 7 new, 0 updated, 0 unchanged" in captured.out
+
+    pagination = await bus.execute(GetAllDatasets(account=Skip()))
+    assert pagination.items == []
+
+
 @pytest.mark.asyncio
 async def test_environment_initdata_files_are_valid(ops_environments_dir: Path) -> None:
     initdata_paths = [
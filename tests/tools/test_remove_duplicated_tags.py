@@ -1,6 +1,8 @@
-from typing import List, Union
+from typing import AsyncIterator, List, Union
 
 import pytest
+import pytest_asyncio
+from sqlalchemy import text
 
 from server.application.catalogs.commands import CreateCatalog
 from server.application.datasets.queries import GetDatasetByID
@@ -11,11 +13,13 @@ from server.domain.common.types import ID, Skip
 from server.domain.datasets.repositories import DatasetGetAllExtras, DatasetRepository
 from server.domain.tags.entities import Tag
 from server.domain.tags.repositories import TagRepository
+from server.infrastructure.database import Database
 from server.seedwork.application.messages import MessageBus
 from tools.remove_duplicated_tags import (
     build_tag_table_of_truth,
     get_tags_to_delete_list,
     main,
+    set_based_main,
     update_dataset_tags,
 )
 
@@ -26,6 +30,18 @@ from ..factories import (
 )
 
 
+@pytest_asyncio.fixture(autouse=True)
+async def allow_duplicated_tags(autorollback_db: None) -> AsyncIterator[None]:
+    # Tag names are now unique, but these tools must still clean up databases
+    # created before that. (Rolled back after each test.)
+    db = resolve(Database)
+
+    async with db.session() as session:
+        await session.execute(text("DROP INDEX ix_tag_name_normalized"))
+
+    yield
+
+
 def get_tag_names(tags: List[TagView]) -> List[str]:
     return list(map(lambda x: x.name, tags))
 
@@ -361,3 +377,58 @@ async def test_get_tag_to_delete_list() -> None:
 
     result = get_tags_to_delete_list(tags, table_of_truth)
     assert expected_result == result
+
+
+@pytest.mark.asyncio
+async def test_set_based_main(capsys: pytest.CaptureFixture) -> None:
+    bus = resolve(MessageBus)
+
+    siret = await bus.execute(
+        CreateOrganizationFactory.build(name="Ministère 1", siret="11004601800013")
+    )
+    await bus.execute(CreateCatalog(organization_siret=siret))
+
+    tag_name = "duplicated_tag"
+
+    tag_id_1 = await bus.execute(CreateTagFactory.build(name=tag_name))
+    tag_id_2 = await bus.execute(CreateTagFactory.build(name=tag_name))
+    # Names are compared regardless of case and whitespace.
+    tag_id_3 = await bus.execute(CreateTagFactory.build(name=" Duplicated_TAG "))
+    tag_id_4 = await bus.execute(CreateTagFactory.build(name="not_dulicated_tag"))
+
+    dataset_id_1 = await bus.execute(
+        CreateDatasetFactory.build(
+            account=Skip(),
+            tag_ids=[tag_id_1, tag_id_2, tag_id_4],
+            organization_siret=siret,
+        )
+    )
+    dataset_id_2 = await bus.execute(
+        CreateDatasetFactory.build(
+            account=Skip(), tag_ids=[tag_id_2], organization_siret=siret
+        )
+    )
+    dataset_id_3 = await bus.execute(
+        CreateDatasetFactory.build(
+            account=Skip(), tag_ids=[tag_id_3], organization_siret=siret
+        )
+    )
+
+    await set_based_main()
+
+    captured = capsys.readouterr()
+    assert (
+        "2 duplicated tags deleted - Previoulsy 4 were stored, 2 remains"
+        in captured.out
+    )
+
+    tags = await bus.execute(GetAllTags())
+    assert sorted(get_tag_names(tags)) == ["duplicated_tag", "not_dulicated_tag"]
+
+    # The most used tag is kept.
+    dataset_1 = await bus.execute(GetDatasetByID(id=dataset_id_1, account=Skip()))
+    assert sorted(get_tag_ids(dataset_1.tags)) == sorted([tag_id_2, tag_id_4])
+
+    for dataset_id in (dataset_id_2, dataset_id_3):
+        dataset = await bus.execute(GetDatasetByID(id=dataset_id, account=Skip()))
+        assert get_tag_ids(dataset.tags) == [tag_id_2]
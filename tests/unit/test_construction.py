@@ -0,0 +1,56 @@
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+from server.seedwork.domain.construction import construct_from
+
+
+def test_construct_from() -> None:
+    class Point(BaseModel):
+        x: int
+        y: int
+
+    class Shape(BaseModel):
+        name: str
+        origin: Point
+        points: List[Point]
+        center: Optional[Point] = None
+        labels: List[str] = []
+
+    class PointRow:
+        def __init__(self, x: int, y: int) -> None:
+            self.x = x
+            self.y = y
+
+    class ShapeRow:
+        name = "triangle"
+        origin = PointRow(0, 0)
+        points = [PointRow(0, 0), PointRow(1, 0), PointRow(0, 1)]
+        center = None
+        labels = ("a", "b")
+
+    shape = construct_from(Shape, ShapeRow())
+    assert shape == Shape(
+        name="triangle",
+        origin=Point(x=0, y=0),
+        points=[Point(x=0, y=0), Point(x=1, y=0), Point(x=0, y=1)],
+        labels=["a", "b"],
+    )
+    assert isinstance(shape.origin, Point)
+
+    # Values can be given, and models are reused as is.
+    origin = Point(x=1, y=1)
+    shape = construct_from(Shape, ShapeRow(), name="square", origin=origin)
+    assert shape.name == "square"
+    assert shape.origin is origin
+
+
+def test_construct_from_skips_validation() -> None:
+    class Model(BaseModel):
+        x: int
+
+    class Row:
+        x = "not an int"
+
+    # Only use on trusted data!
+    assert construct_from(Model, Row()).x == "not an int"
@@ -34,3 +34,19 @@ def test_container_configured() -> None:
     container.bootstrap()
     person = container.resolve(Person)
     assert person.name == "Tiffany"
+
+
+def test_container_register_after_bootstrap() -> None:
+    def configure(container: Container) -> None:
+        container.register_instance(Person, Person("Tiffany"))
+
+    container = Container(configure)
+    container.bootstrap()
+    assert container.resolve(Person).name == "Tiffany"
+
+    container.register_instance(Person, Person("Bob"))
+    assert container.resolve(Person).name == "Bob"
+
+    # Bootstrapping again resets overrides.
+    container.bootstrap()
+    assert container.resolve(Person).name == "Tiffany"
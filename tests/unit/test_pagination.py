@@ -87,3 +87,12 @@ def test_pagination_total_pages() -> None:
 
     pagination = Pagination(items=items, total_items=7, page_size=3)
     assert pagination.total_pages == 3
+
+
+@pytest.mark.parametrize("total_items", [0, 2, 3, 4, 7])
+def test_pagination_build(total_items: int) -> None:
+    items = [1, 2, 3]
+
+    pagination = Pagination.build(items, total_items=total_items, page_size=3)
+
+    assert pagination == Pagination(items=items, total_items=total_items, page_size=3)
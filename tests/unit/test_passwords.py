@@ -1,6 +1,12 @@
+import asyncio
+import threading
+import time
+
+import pytest
 from pydantic import SecretStr
 
 from server.application.auth.passwords import generate_api_token
+from server.domain.auth.exceptions import PasswordEncoderBusy
 from server.infrastructure.auth.passwords import Argon2PasswordEncoder
 
 
@@ -10,10 +16,54 @@ def test_generate_api_token() -> None:
     assert api_token.isalnum()
 
 
-def test_argon2_password_encoder() -> None:
+@pytest.mark.asyncio
+async def test_argon2_password_encoder() -> None:
     password = SecretStr("s3kr3t")
     encoder = Argon2PasswordEncoder()
-    hash_ = encoder.hash(password)
-    assert encoder.verify(password, hash_)
-    assert not encoder.verify(SecretStr("other"), hash_)
-    assert not encoder.verify(password, "invalidhash")
+    hash_ = await encoder.hash(password)
+    assert await encoder.verify(password, hash_)
+    assert not await encoder.verify(SecretStr("other"), hash_)
+    assert not await encoder.verify(password, "invalidhash")
+
+
+@pytest.mark.asyncio
+async def test_argon2_password_encoder_max_pending() -> None:
+    password = SecretStr("s3kr3t")
+    encoder = Argon2PasswordEncoder(workers=1, max_pending=1)
+
+    results = await asyncio.gather(
+        encoder.hash(password), encoder.hash(password), return_exceptions=True
+    )
+
+    assert isinstance(results[0], str)
+    assert isinstance(results[1], PasswordEncoderBusy)
+
+
+@pytest.mark.asyncio
+async def test_argon2_password_encoder_queue_timeout(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    password = SecretStr("s3kr3t")
+    # A single worker, so that the second hash waits in the queue.
+    encoder = Argon2PasswordEncoder(workers=1, queue_timeout=0.05)
+    released = threading.Event()
+
+    def slow_hash(password: str) -> str:
+        released.wait(timeout=5)
+        return "hash"
+
+    monkeypatch.setattr(encoder._hasher, "hash", slow_hash)
+
+    first = asyncio.create_task(encoder.hash(password))
+    await asyncio.sleep(0)  # Let the first hash be submitted.
+    start = time.monotonic()
+
+    with pytest.raises(PasswordEncoderBusy):
+        await encoder.hash(password)
+
+    # The caller did not wait for the first hash to complete.
+    assert time.monotonic() - start < 1
+    assert not first.done()
+
+    released.set()
+    assert await first == "hash"
@@ -1,17 +1,34 @@
 import argparse
 import asyncio
+import datetime as dt
 import functools
+import itertools
 import random
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, List, Sequence
 
 import click
+from faker import Faker
+from sqlalchemy import select
 from tqdm import tqdm
 
+from server.application.catalogs.commands import CreateCatalog
 from server.application.tags.queries import GetAllTags
 from server.config.di import bootstrap, resolve
-from server.domain.common.types import Skip
+from server.domain.common.types import ID, Skip
+from server.domain.datasets.entities import PublicationRestriction, UpdateFrequency
+from server.domain.licenses.entities import BUILTIN_LICENSE_SUGGESTIONS
 from server.domain.organizations.types import Siret
+from server.infrastructure.database import Database
+from server.infrastructure.datasets.models import DATASET_FACETS, DataFormatModel
 from server.seedwork.application.messages import MessageBus
-from tests.factories import CreateDatasetFactory
+from tests.factories import (
+    FAKE_GEOGRAPHICAL_COVERAGES,
+    CreateDatasetFactory,
+    CreateOrganizationFactory,
+)
 
 success = functools.partial(click.style, fg="bright_green")
 
@@ -35,11 +52,285 @@ async def main(n: int, siret: Siret) -> None:
     print(f"{success('created')}: {n} datasets")
 
 
+# Bulk mode
+# Rows are generated in memory and loaded with COPY, bypassing the application.
+
+_PUBLICATION_RESTRICTIONS = [
+    (PublicationRestriction.NO_RESTRICTION, 80),
+    (PublicationRestriction.LEGAL_RESTRICTION, 10),
+    (PublicationRestriction.DRAFT, 10),
+]
+
+_CATALOG_RECORD_COLUMNS = ["id", "created_at", "organization_siret"]
+_DATASET_COLUMNS = [
+    "id",
+    "catalog_record_id",
+    "title",
+    "description",
+    "service",
+    "geographical_coverage",
+    "technical_source",
+    "producer_email",
+    "contact_emails",
+    "update_frequency",
+    "publication_restriction",
+    "last_updated_at",
+    "url",
+    "license",
+]
+
+
+def _zipf_cum_weights(n: int, s: float = 1.1) -> List[float]:
+    # The k-th most popular item is used about 1/k^s as often as the first one.
+    return list(itertools.accumulate(1 / (rank**s) for rank in range(1, n + 1)))
+
+
+@dataclass
+class _Batch:
+    catalog_records: List[tuple] = field(default_factory=list)
+    datasets: List[tuple] = field(default_factory=list)
+    dataset_formats: List[tuple] = field(default_factory=list)
+    dataset_tags: List[tuple] = field(default_factory=list)
+
+
+class _DatasetGenerator:
+    """
+    Generate realistic-looking rows quickly: text is made of words drawn from a
+    pool, rather than generated with Faker for each row.
+    """
+
+    def __init__(
+        self, sirets: Sequence[Siret], tag_ids: Sequence[ID], format_ids: Sequence[int]
+    ) -> None:
+        fake = Faker("fr_FR")
+        self._words = fake.words(2000)
+        self._services = [fake.company() for _ in range(200)]
+        self._sources = [fake.sentence(nb_words=3) for _ in range(300)]
+        self._emails = [fake.ascii_free_email() for _ in range(1000)]
+        self._urls = [fake.url() for _ in range(500)]
+        self._licenses = sorted(BUILTIN_LICENSE_SUGGESTIONS) + [
+            f"Licence {word}" for word in fake.words(20)
+        ]
+
+        # Few organizations, services and tags are used by most datasets.
+        self._sirets = list(sirets)
+        self._siret_weights = _zipf_cum_weights(len(sirets))
+        self._service_weights = _zipf_cum_weights(len(self._services))
+        self._tag_ids = list(tag_ids)
+        self._tag_weights = _zipf_cum_weights(len(tag_ids))
+        self._format_ids = list(format_ids)
+
+        self._restrictions = [r.name for r, _ in _PUBLICATION_RESTRICTIONS]
+        self._restriction_weights = [w for _, w in _PUBLICATION_RESTRICTIONS]
+        self._frequencies = [None, *(f.name for f in UpdateFrequency)]
+        self._now = dt.datetime.now(dt.timezone.utc)
+
+    def _text(self, n_words: int) -> str:
+        return " ".join(random.choices(self._words, k=n_words))
+
+    def _description(self) -> str:
+        # Most descriptions are a few sentences long, some are much longer.
+        n_words = min(3000, max(5, int(random.lognormvariate(4, 1))))
+        return self._text(n_words).capitalize() + "."
+
+    def _maybe(self, values: Sequence[Any], p: float = 0.5) -> Any:
+        return random.choice(values) if random.random() < p else None
+
+    def generate(self, n: int) -> _Batch:
+        batch = _Batch()
+
+        sirets = random.choices(self._sirets, cum_weights=self._siret_weights, k=n)
+
+        for siret in sirets:
+            catalog_record_id = uuid.uuid4()
+            dataset_id = uuid.uuid4()
+            created_at = self._now - dt.timedelta(
+                seconds=random.randint(0, 3 * 365 * 86400)
+            )
+
+            batch.catalog_records.append((catalog_record_id, created_at, siret))
+
+            batch.datasets.append(
+                (
+                    dataset_id,
+                    catalog_record_id,
+                    self._text(random.randint(3, 12)).capitalize(),
+                    self._description(),
+                    random.choices(self._services, cum_weights=self._service_weights)[
+                        0
+                    ],
+                    random.choice(FAKE_GEOGRAPHICAL_COVERAGES),
+                    self._maybe(self._sources),
+                    random.choice(self._emails),
+                    random.sample(self._emails, k=random.randint(1, 3)),
+                    random.choice(self._frequencies),
+                    random.choices(
+                        self._restrictions, weights=self._restriction_weights
+                    )[0],
+                    self._maybe([created_at + dt.timedelta(days=30)]),
+                    self._maybe(self._urls),
+                    self._maybe(self._licenses, p=0.7),
+                )
+            )
+
+            for format_id in random.sample(self._format_ids, k=random.randint(1, 3)):
+                batch.dataset_formats.append((dataset_id, format_id))
+
+            if self._tag_ids:
+                tag_ids = random.choices(
+                    self._tag_ids, cum_weights=self._tag_weights, k=random.randint(0, 5)
+                )
+                for tag_id in set(tag_ids):
+                    batch.dataset_tags.append((dataset_id, tag_id))
+
+        return batch
+
+
+async def _create_organizations(n: int) -> List[Siret]:
+    bus = resolve(MessageBus)
+    sirets = []
+
+    for _ in range(n):
+        siret = await bus.execute(CreateOrganizationFactory.build())
+        await bus.execute(CreateCatalog(organization_siret=siret))
+        sirets.append(siret)
+
+    return sirets
+
+
+async def bulk_main(
+    n: int, siret: Siret, organizations: int = 1, batch_size: int = 10000
+) -> None:
+    assert n >= 1, f"Expected a positive number of datasets, got {n}"
+
+    bus = resolve(MessageBus)
+    db = resolve(Database)
+
+    tag_ids = [tag.id for tag in await bus.execute(GetAllTags())]
+    assert len(tag_ids) >= 1, "Need at least 1 tag in DB, 0 found"
+
+    sirets = [siret, *await _create_organizations(organizations - 1)]
+
+    start = time.perf_counter()
+
+    async with db.session() as session:
+        conn = await session.connection()
+        format_ids = (await conn.execute(select(DataFormatModel.id))).scalars().all()
+        generator = _DatasetGenerator(sirets, tag_ids, format_ids)
+
+        raw_conn = await conn.get_raw_connection()
+        copy = raw_conn.driver_connection.copy_records_to_table
+
+        # Facet values are recomputed at the end, rather than once per row.
+        # Everything is done in a single transaction, so it can't be left stale.
+        await conn.exec_driver_sql(
+            "ALTER TABLE dataset DISABLE TRIGGER dataset_facet_value_sync"
+        )
+
+        # Likewise, building the full-text search index at once is much faster
+        # than updating it for each row.
+        result = await conn.exec_driver_sql(
+            "SELECT indexdef FROM pg_indexes "
+            "WHERE tablename = 'dataset' AND indexname = 'ix_dataset_search_tsv'"
+        )
+        search_index_def = result.scalar_one()
+        await conn.exec_driver_sql("DROP INDEX ix_dataset_search_tsv")
+
+        loop = asyncio.get_running_loop()
+        sizes = [min(batch_size, n - offset) for offset in range(0, n, batch_size)]
+
+        # Generate the next batch in a thread while the current one is copied.
+        pending = loop.run_in_executor(None, generator.generate, sizes[0])
+
+        with tqdm(total=n, unit="dataset") as progress:
+            for i, size in enumerate(sizes):
+                batch = await pending
+                if i + 1 < len(sizes):
+                    pending = loop.run_in_executor(
+                        None, generator.generate, sizes[i + 1]
+                    )
+
+                await copy(
+                    "catalog_record",
+                    records=batch.catalog_records,
+                    columns=_CATALOG_RECORD_COLUMNS,
+                )
+                await copy("dataset", records=batch.datasets, columns=_DATASET_COLUMNS)
+                await copy(
+                    "dataset_dataformat",
+                    records=batch.dataset_formats,
+                    columns=["dataset_id", "dataformat_id"],
+                )
+                await copy(
+                    "dataset_tag",
+                    records=batch.dataset_tags,
+                    columns=["dataset_id", "tag_id"],
+                )
+
+                progress.update(size)
+
+        await conn.exec_driver_sql("SET LOCAL maintenance_work_mem = '512MB'")
+        await conn.exec_driver_sql(search_index_def)
+
+        await conn.exec_driver_sql(
+            "ALTER TABLE dataset ENABLE TRIGGER dataset_facet_value_sync"
+        )
+
+        await conn.exec_driver_sql("DELETE FROM dataset_facet_value")
+
+        for facet in DATASET_FACETS:
+            await conn.exec_driver_sql(
+                f"""
+                INSERT INTO dataset_facet_value (facet, value, usage_count)
+                SELECT '{facet}', {facet}, count(*)
+                FROM dataset
+                WHERE {facet} IS NOT NULL
+                GROUP BY {facet}
+                """
+            )
+
+        # Help the planner: autovacuum may not have run yet on such new data.
+        for table in ("catalog_record", "dataset", "dataset_dataformat", "dataset_tag"):
+            await conn.exec_driver_sql(f"ANALYZE {table}")
+
+        await session.commit()
+
+    elapsed = time.perf_counter() - start
+
+    print(
+        f"{success('created')}: {n} datasets in {len(sirets)} organizations "
+        f"({elapsed:.1f}s)"
+    )
+
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
     parser.add_argument("n", type=int)
     parser.add_argument("siret", type=Siret)
+    parser.add_argument(
+        "--bulk",
+        action="store_true",
+        help="Load generated rows with COPY. Much faster, for large volumes.",
+    )
+    parser.add_argument(
+        "--organizations",
+        type=int,
+        default=1,
+        help="Bulk mode: spread datasets over this many organizations (created).",
+    )
+    parser.add_argument("--batch-size", type=int, default=10000)
     args = parser.parse_args()
 
     bootstrap()
-    asyncio.run(main(n=args.n, siret=args.siret))
+
+    if args.bulk:
+        asyncio.run(
+            bulk_main(
+                n=args.n,
+                siret=args.siret,
+                organizations=args.organizations,
+                batch_size=args.batch_size,
+            )
+        )
+    else:
+        asyncio.run(main(n=args.n, siret=args.siret))
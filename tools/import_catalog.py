@@ -1,26 +1,53 @@
 import argparse
 import asyncio
+import collections
 import csv
 import datetime as dt
+import functools
 import io
+import itertools
+import os
 import sys
+import uuid
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Mapping, Optional, Set, TextIO
+from typing import Deque, Dict, List, MutableMapping, Optional, Set, TextIO, Tuple
 
+import click
 import yaml
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, ValidationError
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from tqdm import tqdm
 
 from server.application.catalogs.queries import GetCatalogBySiret
 from server.application.catalogs.views import ExtraFieldView
+from server.application.datasets.caching import DatasetFiltersCache
+from server.application.datasets.commands import CreateDataset
 from server.application.organizations.queries import GetOrganizationBySiret
+from server.application.organizations.views import OrganizationView
 from server.application.tags.queries import GetAllTags
 from server.config.di import bootstrap, resolve
-from server.domain.common.types import ID, id_factory
+from server.domain.common.types import ID, Skip, id_factory
 from server.domain.datasets.entities import DataFormat, UpdateFrequency
 from server.domain.organizations.types import Siret
+from server.domain.tags.entities import normalize_tag_name
+from server.domain.tags.repositories import TagRepository
+from server.infrastructure.adapters.middleware import QueryCachingMiddleware
+from server.infrastructure.catalog_records.models import CatalogRecordModel
+from server.infrastructure.catalogs.models import ExtraFieldValueModel
+from server.infrastructure.database import Database
+from server.infrastructure.datasets.models import (
+    DataFormatModel,
+    DatasetModel,
+    dataset_dataformat,
+)
+from server.infrastructure.tags.models import dataset_tag
 from server.seedwork.application.messages import MessageBus
 from tools.initdata import InitData
 
+success = functools.partial(click.style, fg="bright_green")
+
 
 class InputCsv(BaseModel):
     path: Path
@@ -125,28 +152,35 @@ def _map_last_updated_at(value: Optional[str], config: Config) -> Optional[dt.da
     return dt.datetime.strptime(value, config.last_updated_at.format)
 
 
+def _split_tag_names(value: Optional[str]) -> Set[str]:
+    if not value:
+        return set()
+
+    # Split and clean tag names. For example:
+    # "périmètre délimité des abords (PDA), urbanisme; géolocalisation"
+    #   -> {"périmètre délimité des abords (PDA)", "urbanisme", "géolocalisation"}
+    return set(name.strip() for name in value.replace(";", ",").split(","))
+
+
 def _map_tag_ids(
     value: Optional[str],
-    existing_tag_ids_by_name: Mapping[str, ID],
+    existing_tag_ids_by_name: MutableMapping[str, ID],
     tags_to_create: List[dict],
 ) -> List[str]:
-    if not value:
-        return []
-
+    """
+    `existing_tag_ids_by_name` is keyed by normalized tag names.
+    """
     tag_ids = []
 
-    # Split and normalize tag names. For example:
-    # "périmètre délimité des abords (PDA), urbanisme; géolocalisation"
-    #   -> {"périmètre délimité des abords (PDA)", "urbanisme", "géolocalisation"}
-    cleaned_names = set(name.strip() for name in value.replace(";", ",").split(","))
-
-    for name in cleaned_names:
+    for name in _split_tag_names(value):
         try:
-            tag_id = existing_tag_ids_by_name[name]
+            tag_id = existing_tag_ids_by_name[normalize_tag_name(name)]
         except KeyError:
             tag_id = id_factory()
             tag = {"id": str(tag_id), "params": {"name": name}}
             tags_to_create.append(tag)
+            # Later rows with this tag must reuse the same ID.
+            existing_tag_ids_by_name[normalize_tag_name(name)] = tag_id
 
         tag_ids.append(str(tag_id))
 
@@ -176,6 +210,89 @@ def _maybe_append_import_notes(description: str, import_notes: str) -> str:
     return s.getvalue()
 
 
+_COMMON_FIELDS = {
+    "titre",
+    "description",
+    "siret_orga",
+    "nom_orga",
+    "service",
+    "couv_geo",
+    "format",
+    "si",
+    "contact_service",
+    "contact_personne",
+    "freq_maj",
+    "date_maj",
+    "url",
+    "licence",
+    "mots_cles",
+}
+
+
+def _check_fieldnames(
+    fieldnames: List[str], config: Config, extra_fields: List[ExtraFieldView]
+) -> None:
+    expected_extra_fields = {field.name for field in extra_fields}
+    actual_extra_fields = set(fieldnames) - _COMMON_FIELDS - config.ignore_fields
+
+    if actual_extra_fields != expected_extra_fields:
+        raise ValueError(
+            f"Extra fields don't match: "
+            f"{expected_extra_fields=}, {actual_extra_fields=}"
+        )
+
+
+def _map_row(
+    k: int,
+    row: dict,
+    config: Config,
+    organization: OrganizationView,
+    extra_fields: List[ExtraFieldView],
+) -> dict:
+    """
+    Map a CSV row to dataset params, except tag IDs (see `_map_tag_ids()`).
+    """
+    if (siret_orga := row["siret_orga"]) != organization.siret:
+        raise ValueError(
+            f"at row {k}: {siret_orga=!r} does not match {organization.siret=!r}"
+        )
+
+    if "nom_orga" in row and (nom_orga := row["nom_orga"]) != organization.name:
+        raise ValueError(
+            f"at row {k}: {nom_orga=!r} does not match {organization.name=!r}"
+        )
+
+    import_notes = io.StringIO()
+
+    params: dict = {}
+
+    params["organization_siret"] = organization.siret
+    params["title"] = row["titre"]
+    params["description"] = row["description"]
+    params["service"] = row["service"] or None
+    params["geographical_coverage"] = _map_geographical_coverage(
+        row["couv_geo"] or None, config
+    )
+    params["formats"] = _map_formats(row["format"] or None, import_notes, config)
+    params["technical_source"] = row["si"] or None
+    params["producer_email"] = row["contact_service"] or None
+    params["contact_emails"] = _map_contact_emails(row["contact_personne"] or None)
+    params["update_frequency"] = _map_update_frequency(
+        row["freq_maj"] or None, import_notes, config
+    )
+    params["last_updated_at"] = _map_last_updated_at(row["date_maj"] or None, config)
+    params["url"] = row["url"] or None
+    params["license"] = row["licence"] or None
+
+    params["extra_field_values"] = _map_extra_field_values(row, extra_fields)
+
+    params["description"] = _maybe_append_import_notes(
+        params["description"], import_notes.getvalue()
+    )
+
+    return params
+
+
 async def main(config_path: Path, out_path: Path) -> int:
     bus = resolve(MessageBus)
 
@@ -186,91 +303,26 @@ async def main(config_path: Path, out_path: Path) -> int:
         GetOrganizationBySiret(siret=config.organization_siret)
     )
     catalog = await bus.execute(GetCatalogBySiret(siret=organization.siret))
-    expected_extra_fields = {field.name for field in catalog.extra_fields}
 
     tags = await bus.execute(GetAllTags())
-    existing_tag_ids_by_name = {tag.name: tag.id for tag in tags}
+    existing_tag_ids_by_name = {normalize_tag_name(tag.name): tag.id for tag in tags}
 
     with config.input_csv.path.open(encoding=config.input_csv.encoding) as f:
         reader = csv.DictReader(f, delimiter=config.input_csv.delimiter)
         fieldnames = list(reader.fieldnames or [])
         rows = list(reader)
 
-    common_fields = {
-        "titre",
-        "description",
-        "siret_orga",
-        "nom_orga",
-        "service",
-        "couv_geo",
-        "format",
-        "si",
-        "contact_service",
-        "contact_personne",
-        "freq_maj",
-        "date_maj",
-        "url",
-        "licence",
-        "mots_cles",
-    }
-
-    actual_extra_fields = set(fieldnames) - common_fields - config.ignore_fields
-
-    if actual_extra_fields != expected_extra_fields:
-        raise ValueError(
-            f"Extra fields don't match: "
-            f"{expected_extra_fields=}, {actual_extra_fields=}"
-        )
+    _check_fieldnames(fieldnames, config, catalog.extra_fields)
 
     tags_to_create: List[dict] = []
     datasets = []
 
     for k, row in enumerate(rows):
-        if (siret_orga := row["siret_orga"]) != organization.siret:
-            raise ValueError(
-                f"at row {k}: {siret_orga=!r} does not match {organization.siret=!r}"
-            )
-
-        if "nom_orga" in row and (nom_orga := row["nom_orga"]) != organization.name:
-            raise ValueError(
-                f"at row {k}: {nom_orga=!r} does not match {organization.name=!r}"
-            )
-
-        import_notes = io.StringIO()
-
-        params: dict = {}
-
-        params["organization_siret"] = organization.siret
-        params["title"] = row["titre"]
-        params["description"] = row["description"]
-        params["service"] = row["service"] or None
-        params["geographical_coverage"] = _map_geographical_coverage(
-            row["couv_geo"] or None, config
-        )
-        params["formats"] = _map_formats(row["format"] or None, import_notes, config)
-        params["technical_source"] = row["si"] or None
-        params["producer_email"] = row["contact_service"] or None
-        params["contact_emails"] = _map_contact_emails(row["contact_personne"] or None)
-        params["update_frequency"] = _map_update_frequency(
-            row["freq_maj"] or None, import_notes, config
-        )
-        params["last_updated_at"] = _map_last_updated_at(
-            row["date_maj"] or None, config
-        )
-        params["url"] = row["url"] or None
-        params["license"] = row["licence"] or None
+        params = _map_row(k, row, config, organization, catalog.extra_fields)
         params["tag_ids"] = _map_tag_ids(
             row["mots_cles"] or None, existing_tag_ids_by_name, tags_to_create
         )
 
-        params["extra_field_values"] = _map_extra_field_values(
-            row, catalog.extra_fields
-        )
-
-        params["description"] = _maybe_append_import_notes(
-            params["description"], import_notes.getvalue()
-        )
-
         pk = id_factory()
         datasets.append({"id": str(pk), "params": params})
 
@@ -287,15 +339,259 @@ async def main(config_path: Path, out_path: Path) -> int:
     return 0
 
 
+# Streaming mode
+# Rows are read incrementally, mapped and validated in worker processes, and
+# written to the database in batches, bypassing initdata.
+
+
+class Checkpoint(BaseModel):
+    import_id: uuid.UUID = Field(default_factory=uuid.uuid4)
+    csv_path: Path
+    rows: int = 0
+
+    @classmethod
+    def load_or_create(cls, path: Path, csv_path: Path) -> "Checkpoint":
+        if not path.exists():
+            return cls(csv_path=csv_path)
+
+        checkpoint = cls.parse_file(path)
+
+        if checkpoint.csv_path != csv_path:
+            raise ValueError(
+                f"Checkpoint {path} is for {checkpoint.csv_path}, not {csv_path}: "
+                "remove it to start a new import"
+            )
+
+        return checkpoint
+
+    def save(self, path: Path) -> None:
+        # Replace atomically, so that a crash can't leave a truncated file.
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_text(self.json())
+        os.replace(tmp, path)
+
+    def make_id(self, kind: str, k: int) -> uuid.UUID:
+        # Stable across resumed runs, so that rewriting a batch is a no-op.
+        return uuid.uuid5(self.import_id, f"{kind}:{k}")
+
+
+def _map_batch(
+    start: int,
+    rows: List[dict],
+    config: Config,
+    organization: OrganizationView,
+    extra_fields: List[ExtraFieldView],
+) -> List[Tuple[dict, Set[str]]]:
+    # Runs in a worker process.
+    results = []
+
+    for k, row in enumerate(rows, start):
+        params = _map_row(k, row, config, organization, extra_fields)
+
+        try:
+            command = CreateDataset(account=Skip(), **params)
+        except ValidationError as exc:
+            # (Pydantic errors can't be pickled back to the main process.)
+            raise ValueError(f"at row {k}: {exc}") from None
+
+        tag_names = _split_tag_names(row["mots_cles"] or None)
+        results.append((command.dict(exclude={"account"}), tag_names))
+
+    return results
+
+
+# Stored in other tables than 'dataset'.
+_DATASET_RELATED_FIELDS = {
+    "organization_siret",
+    "formats",
+    "tag_ids",
+    "extra_field_values",
+}
+
+
+async def _write_batch(
+    start: int,
+    results: List[Tuple[dict, Set[str]]],
+    checkpoint: Checkpoint,
+    format_ids_by_name: Dict[DataFormat, int],
+) -> None:
+    db = resolve(Database)
+
+    # Missing tags are created at once. This is safe if a tag is also being
+    # created concurrently, and a no-op when resuming.
+    tag_ids_by_name = await resolve(TagRepository).get_or_create_by_names(
+        [name for _, tag_names in results for name in tag_names]
+    )
+
+    rows: Dict[str, List[dict]] = {
+        "catalog_record": [],
+        "dataset": [],
+        "dataset_dataformat": [],
+        "dataset_tag": [],
+        "extra_field_value": [],
+    }
+
+    for k, (params, tag_names) in enumerate(results, start):
+        dataset_id = checkpoint.make_id("dataset", k)
+        catalog_record_id = checkpoint.make_id("catalog_record", k)
+
+        rows["catalog_record"].append(
+            {
+                "id": catalog_record_id,
+                "organization_siret": params["organization_siret"],
+            }
+        )
+        rows["dataset"].append(
+            {
+                "id": dataset_id,
+                "catalog_record_id": catalog_record_id,
+                **{
+                    key: value
+                    for key, value in params.items()
+                    if key not in _DATASET_RELATED_FIELDS
+                },
+            }
+        )
+        rows["dataset_dataformat"].extend(
+            {"dataset_id": dataset_id, "dataformat_id": format_ids_by_name[fmt]}
+            for fmt in set(params["formats"])
+        )
+        rows["dataset_tag"].extend(
+            {"dataset_id": dataset_id, "tag_id": tag_id}
+            for tag_id in {tag_ids_by_name[name] for name in tag_names}
+        )
+        rows["extra_field_value"].extend(
+            {"dataset_id": dataset_id, **value}
+            for value in params["extra_field_values"]
+        )
+
+    async with db.session() as session:
+        async with session.begin():
+            for table in (
+                CatalogRecordModel.__table__,
+                DatasetModel.__table__,
+                dataset_dataformat,
+                dataset_tag,
+                ExtraFieldValueModel.__table__,
+            ):
+                if rows[table.name]:
+                    await session.execute(
+                        insert(table).on_conflict_do_nothing(), rows[table.name]
+                    )
+
+    # Data was written without commands, so caches must be invalidated explicitly.
+    resolve(DatasetFiltersCache).invalidate()
+    resolve(QueryCachingMiddleware).clear()
+
+
+async def stream_main(
+    config_path: Path,
+    checkpoint_path: Optional[Path] = None,
+    batch_size: int = 1000,
+    workers: Optional[int] = None,
+) -> int:
+    bus = resolve(MessageBus)
+    db = resolve(Database)
+
+    with config_path.open() as f:
+        config = Config(**yaml.safe_load(f))
+
+    path = checkpoint_path or config_path.with_name(config_path.name + ".checkpoint")
+    checkpoint = Checkpoint.load_or_create(path, config.input_csv.path)
+
+    organization = await bus.execute(
+        GetOrganizationBySiret(siret=config.organization_siret)
+    )
+    catalog = await bus.execute(GetCatalogBySiret(siret=organization.siret))
+
+    async with db.session() as session:
+        result = await session.execute(select(DataFormatModel.name, DataFormatModel.id))
+        format_ids_by_name = {name: id_ for name, id_ in result}
+
+    if checkpoint.rows:
+        print(f"Resuming from row {checkpoint.rows} ({path})")
+
+    loop = asyncio.get_running_loop()
+    max_pending = 2 * (workers or os.cpu_count() or 1)
+    pending: Deque[Tuple[int, int, "asyncio.Future[list]"]] = collections.deque()
+
+    with config.input_csv.path.open(encoding=config.input_csv.encoding) as f:
+        reader = csv.DictReader(f, delimiter=config.input_csv.delimiter)
+        _check_fieldnames(list(reader.fieldnames or []), config, catalog.extra_fields)
+
+        rows = itertools.islice(reader, checkpoint.rows, None)
+        start = checkpoint.rows
+
+        with ProcessPoolExecutor(workers) as pool, tqdm(unit="row") as progress:
+
+            async def write_next() -> None:
+                start, end, future = pending.popleft()
+                results = await future
+                await _write_batch(start, results, checkpoint, format_ids_by_name)
+                # Only once the batch is committed.
+                checkpoint.rows = end
+                checkpoint.save(path)
+                progress.update(end - start)
+
+            while batch := list(itertools.islice(rows, batch_size)):
+                future = loop.run_in_executor(
+                    pool,
+                    _map_batch,
+                    start,
+                    batch,
+                    config,
+                    organization,
+                    catalog.extra_fields,
+                )
+                pending.append((start, start + len(batch), future))
+                start += len(batch)
+
+                # Keep workers busy, but don't read the whole file in advance.
+                if len(pending) >= max_pending:
+                    await write_next()
+
+            while pending:
+                await write_next()
+
+    path.unlink()
+    print(f"{success('imported')}: {start} datasets")
+
+    return 0
+
+
 if __name__ == "__main__":
     bootstrap()
 
     parser = argparse.ArgumentParser()
     parser.add_argument("config_path", type=Path)
-    parser.add_argument("out_path", type=Path)
+    parser.add_argument("out_path", type=Path, nargs="?")
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Write datasets to the database directly, rather than to OUT_PATH.",
+    )
+    parser.add_argument(
+        "--checkpoint",
+        type=Path,
+        help="Stream mode: progress file (default: <config_path>.checkpoint).",
+    )
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--workers", type=int, help="Default: number of CPUs.")
 
     args = parser.parse_args()
 
-    code = asyncio.run(main(config_path=args.config_path, out_path=args.out_path))
+    if args.stream:
+        coro = stream_main(
+            config_path=args.config_path,
+            checkpoint_path=args.checkpoint,
+            batch_size=args.batch_size,
+            workers=args.workers,
+        )
+    elif args.out_path is None:
+        parser.error("out_path is required, unless --stream is given")
+    else:
+        coro = main(config_path=args.config_path, out_path=args.out_path)
+
+    code = asyncio.run(coro)
 
     sys.exit(code)
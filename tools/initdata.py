@@ -6,7 +6,9 @@ import os
 import pathlib
 import sys
 import traceback
-from typing import Any, Dict
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional
 
 import click
 import yaml
@@ -22,11 +24,14 @@ from server.config.di import bootstrap, resolve
 from server.domain.auth.entities import UserRole
 from server.domain.auth.repositories import PasswordUserRepository
 from server.domain.catalogs.repositories import CatalogRepository
-from server.domain.common.types import Skip
+from server.domain.common.types import ID, Skip
 from server.domain.datasets.entities import Dataset
 from server.domain.datasets.repositories import DatasetRepository
+from server.domain.datasets.specifications import DatasetSpec
 from server.domain.organizations.repositories import OrganizationRepository
+from server.domain.tags.entities import normalize_tag_name
 from server.domain.tags.repositories import TagRepository
+from server.seedwork.application.commands import Command
 from server.seedwork.application.messages import MessageBus
 
 load_dotenv()
@@ -63,138 +68,251 @@ def _parse_env_passwords(passwords_env: str) -> Dict[str, str]:
         raise ValueError(f"Malformed TOOLS_PASSWORDS: {exc}")
 
 
-async def handle_organizations(item: dict) -> None:
-    bus = resolve(MessageBus)
-    repository = resolve(OrganizationRepository)
+@dataclass
+class Action:
+    # 'created', 'reset' or 'ok'.
+    kind: str
+    description: str
+    command: Optional[Command[Any]] = None
+    kwargs: Dict[str, Any] = field(default_factory=dict)
 
-    siret = item["params"]["siret"]
 
-    existing_organization = await repository.get_by_siret(siret)
+@dataclass
+class Stage:
+    name: str
+    actions: List[Action] = field(default_factory=list)
 
-    if existing_organization is not None:
+    def count(self, kind: str) -> int:
+        return sum(action.kind == kind for action in self.actions)
 
-        organization_repr = (
-            f"Organization(siret={siret!r}, name={item['params']['name']!r}, ...)"
-        )
-        print(f"{info('ok')}: {organization_repr}")
-        return
 
-    create_command = CreateOrganization(**item["params"])
+async def plan_organizations(items: List[dict]) -> Stage:
+    repository = resolve(OrganizationRepository)
+    existing_sirets = await repository.get_siret_set()
+    stage = Stage("Organizations")
 
-    await bus.execute(create_command)
-    print(f"{success('created')}: {create_command!r}")
+    for item in items:
+        siret = item["params"]["siret"]
 
+        if siret in existing_sirets:
+            description = (
+                f"Organization(siret={siret!r}, name={item['params']['name']!r}, ...)"
+            )
+            stage.actions.append(Action("ok", description))
+            continue
 
-async def handle_catalogs(item: dict) -> None:
-    bus = resolve(MessageBus)
-    repository = resolve(CatalogRepository)
+        command = CreateOrganization(**item["params"])
+        stage.actions.append(Action("created", repr(command), command))
 
-    siret = item["params"]["organization_siret"]
+    return stage
 
-    existing_organization = await repository.get_by_siret(siret)
 
-    if existing_organization is not None:
+async def plan_catalogs(items: List[dict]) -> Stage:
+    repository = resolve(CatalogRepository)
+    existing_sirets = {
+        catalog.organization.siret for catalog in await repository.get_all()
+    }
+    stage = Stage("Catalogs")
 
-        organization_repr = f"Catalog(siret={siret!r}, ...)"
-        print(f"{info('ok')}: {organization_repr}")
-        return
+    for item in items:
+        siret = item["params"]["organization_siret"]
 
-    create_command = CreateCatalog(**item["params"])
+        if siret in existing_sirets:
+            stage.actions.append(Action("ok", f"Catalog(siret={siret!r}, ...)"))
+            continue
 
-    extra_field_ids_by_name = {
-        field["name"]: field["id"] for field in item["params"]["extra_fields"]
-    }
+        command = CreateCatalog(**item["params"])
 
-    await bus.execute(create_command, extra_field_ids_by_name=extra_field_ids_by_name)
-    print(f"{success('created')}: {create_command!r}")
+        extra_field_ids_by_name = {
+            field["name"]: field["id"] for field in item["params"]["extra_fields"]
+        }
 
+        stage.actions.append(
+            Action(
+                "created",
+                repr(command),
+                command,
+                {"extra_field_ids_by_name": extra_field_ids_by_name},
+            )
+        )
 
-async def handle_user(
-    item: dict, *, no_input: bool, env_passwords: Dict[str, str]
-) -> None:
-    bus = resolve(MessageBus)
+    return stage
+
+
+async def plan_users(
+    items: List[dict],
+    *,
+    no_input: bool,
+    env_passwords: Dict[str, str],
+    dry_run: bool = False,
+) -> Stage:
     repository = resolve(PasswordUserRepository)
+    existing_emails = await repository.get_email_set()
+    stage = Stage("Users")
+
+    for item in items:
+        email = item["params"]["email"]
+
+        if email in existing_emails:
+            stage.actions.append(Action("ok", f"PasswordUser(email={email!r}, ...)"))
+            continue
+
+        extras = UserExtras(**item.get("extras", {}))
+
+        # Passwords are resolved upfront: users are then created concurrently.
+        if item["params"]["password"] == "__env__" and not dry_run:
+            password = env_passwords.get(email)
+            if password is None:
+                if no_input:
+                    raise RuntimeError(
+                        f"would prompt password for {email!r}, "
+                        "please include '<email>=<password>' in TOOLS_PASSWORDS "
+                        "environment variable"
+                    )
+                password = click.prompt(f"Password for {email}", hide_input=True)
+            item["params"]["password"] = password
+
+        command = CreatePasswordUser(**item["params"])
+        stage.actions.append(
+            Action(
+                "created", repr(command), command, {"id_": item["id"], **extras.dict()}
+            )
+        )
 
-    email = item["params"]["email"]
-    existing_user = await repository.get_by_email(email)
+    return stage
 
-    if existing_user is not None:
-        print(f"{info('ok')}: PasswordUser(email={email!r}, ...)")
-        return
 
-    extras = UserExtras(**item.get("extras", {}))
+async def plan_tags(items: List[dict], tag_ids_map: Dict[ID, ID]) -> Stage:
+    # Tag names are unique once normalized: a tag may exist with another ID, e.g. if
+    # it was merged into a duplicate, or created by a user. It is then used instead,
+    # and `tag_ids_map` is filled so that datasets refer to it.
+    repository = resolve(TagRepository)
+    existing_tags = {
+        tag.id: tag
+        for tag in await repository.get_all(ids=[item["id"] for item in items])
+    }
+    missing_names = [
+        item["params"]["name"]
+        for item in items
+        if ID(uuid.UUID(str(item["id"]))) not in existing_tags
+    ]
+    existing_tags_by_name = {
+        normalize_tag_name(tag.name): tag
+        for tag in (
+            await repository.get_all(names=missing_names) if missing_names else []
+        )
+    }
+    stage = Stage("Tags")
 
-    if item["params"]["password"] == "__env__":
-        password = env_passwords.get(email)
-        if password is None:
-            if no_input:
-                raise RuntimeError(
-                    f"would prompt password for {email!r}, "
-                    "please include '<email>=<password>' in TOOLS_PASSWORDS "
-                    "environment variable"
-                )
-            password = click.prompt(f"Password for {email}", hide_input=True)
-        item["params"]["password"] = password
+    for item in items:
+        id_ = ID(uuid.UUID(str(item["id"])))
+        existing_tag = existing_tags.get(id_) or existing_tags_by_name.get(
+            normalize_tag_name(item["params"]["name"])
+        )
 
-    command = CreatePasswordUser(**item["params"])
-    await bus.execute(command, id_=item["id"], **extras.dict())
-    print(f"{success('created')}: {command!r}")
+        if existing_tag is not None:
+            tag_ids_map[id_] = existing_tag.id
+            stage.actions.append(Action("ok", repr(existing_tag)))
+            continue
 
+        command = CreateTag(**item["params"])
+        stage.actions.append(Action("created", repr(command), command, {"id_": id_}))
 
-async def handle_tag(item: dict) -> None:
-    bus = resolve(MessageBus)
-    repository = resolve(TagRepository)
+    return stage
 
-    id_ = item["id"]
-    existing_tag = await repository.get_by_id(id_)
 
-    if existing_tag is not None:
-        print(f"{info('ok')}: {existing_tag!r}")
-        return
+def _get_dataset_attr(dataset: Dataset, attr: str) -> Any:
+    if attr == "tag_ids":
+        return [tag.id for tag in dataset.tags]
+    return getattr(dataset, attr)
 
-    command = CreateTag(**item["params"])
-    await bus.execute(command, id_=item["id"])
-    print(f"{success('created')}: {command!r}")
 
+async def plan_datasets(
+    items: List[dict], tag_ids_map: Dict[ID, ID], reset: bool = False
+) -> Stage:
+    repository = resolve(DatasetRepository)
+    spec = DatasetSpec(id__in=[item["id"] for item in items], include_all_datasets=True)
+    results, _ = await repository.get_all(page=None, spec=spec)
+    existing_datasets = {dataset.id: dataset for dataset, _ in results}
+    stage = Stage("Datasets")
+
+    for item in items:
+        id_ = ID(uuid.UUID(str(item["id"])))
+        existing_dataset = existing_datasets.get(id_)
+
+        if "tag_ids" in item["params"]:
+            tag_ids = [ID(uuid.UUID(str(t))) for t in item["params"]["tag_ids"]]
+            item["params"]["tag_ids"] = [tag_ids_map.get(t, t) for t in tag_ids]
+
+        if existing_dataset is not None:
+            update_command = UpdateDataset(account=Skip(), id=id_, **item["params"])
+
+            changed = any(
+                getattr(update_command, k) != _get_dataset_attr(existing_dataset, k)
+                for k in item["params"]
+                if k in UpdateDataset.__fields__
+            )
+
+            if changed and reset:
+                stage.actions.append(
+                    Action("reset", repr(update_command), update_command)
+                )
+                continue
+
+            description = f"Dataset(id={id_!r}, title={item['params']['title']!r}, ...)"
+            stage.actions.append(Action("ok", description))
+            continue
+
+        command = CreateDataset(account=Skip(), **item["params"])
+        stage.actions.append(Action("created", repr(command), command, {"id_": id_}))
+
+    return stage
+
+
+_STYLES = {"created": success, "reset": warn, "ok": info}
 
-async def handle_dataset(item: dict, reset: bool = False) -> None:
-    def _get_dataset_attr(dataset: Dataset, attr: str) -> Any:
-        if attr == "tag_ids":
-            return [tag.id for tag in dataset.tags]
-        return getattr(dataset, attr)
 
+async def apply(stage: Stage, concurrency: int) -> None:
+    # Items of a stage are independent from each other, but may depend on items
+    # of previous stages (e.g. datasets on tags), so stages are applied in order.
     bus = resolve(MessageBus)
-    repository = resolve(DatasetRepository)
+    semaphore = asyncio.Semaphore(concurrency)
 
-    id_ = item["id"]
-    existing_dataset = await repository.get_by_id(id_)
+    async def run(action: Action) -> None:
+        if action.command is not None:
+            async with semaphore:
+                await bus.execute(action.command, **action.kwargs)
 
-    if existing_dataset is not None:
-        update_command = UpdateDataset(account=Skip(), id=id_, **item["params"])
+        print(f"{_STYLES[action.kind](action.kind)}: {action.description}")
 
-        changed = any(
-            getattr(update_command, k) != _get_dataset_attr(existing_dataset, k)
-            for k in item["params"]
-            if k in UpdateDataset.__fields__
-        )
+    await asyncio.gather(*(run(action) for action in stage.actions))
 
-        if changed and reset:
-            await bus.execute(update_command)
-            print(f"{warn('reset')}: {update_command!r}")
-            return
 
-        dataset_repr = f"Dataset(id={id_!r}, title={item['params']['title']!r}, ...)"
-        print(f"{info('ok')}: {dataset_repr}")
-        return
+def print_plan(stage: Stage) -> None:
+    for action in stage.actions:
+        label = action.kind if action.command is None else f"would be {action.kind}"
+        print(f"{_STYLES[action.kind](label)}: {action.description}")
 
-    create_command = CreateDataset(account=Skip(), **item["params"])
 
-    await bus.execute(create_command, id_=id_)
-    print(f"{success('created')}: {create_command!r}")
+def print_summary(stages: List[Stage], dry_run: bool) -> None:
+    print(
+        "\n", ruler("Summary" + (" (dry run, nothing was applied)" if dry_run else ""))
+    )
+
+    for stage in stages:
+        print(
+            f"{stage.name}: {stage.count('created')} new, "
+            f"{stage.count('reset')} updated, {stage.count('ok')} unchanged"
+        )
 
 
 async def main(
-    path: pathlib.Path, reset: bool = False, no_input: bool = False, check: bool = False
+    path: pathlib.Path,
+    reset: bool = False,
+    no_input: bool = False,
+    check: bool = False,
+    dry_run: bool = False,
+    concurrency: int = 4,
 ) -> int:
     with path.open() as f:
         content = yaml.safe_load(f)
@@ -209,32 +327,38 @@ async def main(
     if check:
         return 0
 
-    print("\n", ruler("Organizations"))
-
-    for item in spec.organizations:
-        await handle_organizations(item)
-
-    print("\n", ruler("Catalogs"))
-
-    for item in spec.catalogs:
-        await handle_catalogs(item)
-
-    print("\n", ruler("Users"))
-
     env_passwords = _parse_env_passwords(os.getenv("TOOLS_PASSWORDS", ""))
 
-    for item in spec.users:
-        await handle_user(item, no_input=no_input, env_passwords=env_passwords)
-
-    print("\n", ruler("Tags"))
-
-    for item in spec.tags:
-        await handle_tag(item)
-
-    print("\n", ruler("Datasets"))
-
-    for item in spec.datasets:
-        await handle_dataset(item, reset=reset)
+    # Existing entities are fetched with one query per entity type, rather than
+    # one per item. Later stages are planned once earlier ones are applied, as
+    # e.g. datasets reference organizations and tags.
+    tag_ids_map: Dict[ID, ID] = {}
+    planners: List[Callable[[], Awaitable[Stage]]] = [
+        lambda: plan_organizations(spec.organizations),
+        lambda: plan_catalogs(spec.catalogs),
+        lambda: plan_users(
+            spec.users,
+            no_input=no_input,
+            env_passwords=env_passwords,
+            dry_run=dry_run,
+        ),
+        lambda: plan_tags(spec.tags, tag_ids_map),
+        lambda: plan_datasets(spec.datasets, tag_ids_map, reset=reset),
+    ]
+    stages = []
+
+    for planner in planners:
+        stage = await planner()
+        stages.append(stage)
+
+        print("\n", ruler(stage.name))
+
+        if dry_run:
+            print_plan(stage)
+        else:
+            await apply(stage, concurrency)
+
+    print_summary(stages, dry_run=dry_run)
 
     return 0
 
@@ -245,11 +369,24 @@ if __name__ == "__main__":
     parser.add_argument("--reset", action="store_true")
     parser.add_argument("--no-input", action="store_true")
     parser.add_argument("--check", action="store_true")
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Show what would be created or reset, without applying anything.",
+    )
+    parser.add_argument("--concurrency", type=int, default=4)
     args = parser.parse_args()
 
     bootstrap()
 
     code = asyncio.run(
-        main(path=args.path, reset=args.reset, no_input=args.no_input, check=args.check)
+        main(
+            path=args.path,
+            reset=args.reset,
+            no_input=args.no_input,
+            check=args.check,
+            dry_run=args.dry_run,
+            concurrency=args.concurrency,
+        )
     )
     sys.exit(code)
@@ -0,0 +1,6 @@
+from server.api.debugging.profiling import make_profiling_token
+from server.config.di import bootstrap
+
+if __name__ == "__main__":
+    bootstrap()
+    print(make_profiling_token())
@@ -1,3 +1,4 @@
+import argparse
 import asyncio
 import functools
 import logging.config
@@ -145,10 +146,36 @@ async def main() -> None:
     )
 
 
+async def set_based_main() -> None:
+    # Unlike main(), tags whose names only differ by case or whitespace are
+    # duplicates too, and the most used tag is kept rather than the first one.
+    # Everything is computed in the database, in a single transaction, rather than
+    # loading and updating datasets one by one.
+    tag_repository = resolve(TagRepository)
+
+    num_tags, num_deleted = await tag_repository.merge_duplicates()
+
+    print(
+        f"{success('ok')}: {num_deleted} duplicated tags deleted - Previoulsy {num_tags} were stored, {num_tags - num_deleted} remains"  # noqa E501
+    )
+
+
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--set-based",
+        action="store_true",
+        help=(
+            "Merge duplicates with SQL queries. Much faster on large catalogs. "
+            "Names are compared regardless of case and whitespace, and the most "
+            "used tag is kept."
+        ),
+    )
+    args = parser.parse_args()
+
     bootstrap()
 
     settings = resolve(Settings)
     logging.config.dictConfig(get_log_config(settings))
 
-    asyncio.run(main())
+    asyncio.run(set_based_main() if args.set_based else main())